@@ -1,8 +1,7 @@
 # analysis/analysis.py
 
-import json
 import os
-from collections import defaultdict
+import sys
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -20,70 +19,104 @@ FIGURE_DIR = os.path.join(PROJECT_ROOT, "experiment_results", "figures")
 
 os.makedirs(FIGURE_DIR, exist_ok=True)
 
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.curve_stats import QUANTILES, CurveAggregator
+from utils.result_store import iter_history_blocks, load_result_arrays
+from utils.run_catalog import catalog_path, open_catalog, rebuild_catalog
 
 
 # --------------------------------------------------
 # Data Loading
 # --------------------------------------------------
 
-def load_all_results():
+def load_all_results(history_keys=("best_length",), final_keys=(), workers=None):
     """
-    Load all GA experiment experiment_results.
+    Load all GA experiment experiment_results, keeping only the fields
+    the plots need.
+    Reads the columnar runs.npz store of each strategy when present,
+    plus any per-run JSON not yet converted (parsed on a process pool).
     Returns:
-        data[strategy] = list of run_logs
+        data[strategy] = {"run_id", <final keys>,
+                          "history": {key: (runs, generations) array}}
+        history matrices are NaN-padded.
     """
-    data = defaultdict(list)
+    return load_result_arrays(
+        RESULT_ROOT,
+        history_keys=history_keys,
+        final_keys=final_keys,
+        workers=workers,
+    )
+
 
-    for strategy_name in os.listdir(RESULT_ROOT):
-        strategy_dir = os.path.join(RESULT_ROOT, strategy_name)
+def aggregate_all_results(history_keys=("best_length",), quantiles=QUANTILES):
+    """
+    Per-generation statistics of every history series, streamed run
+    block by run block (no strategy is held in memory as a whole).
+    Returns:
+        stats[strategy][key] = CurveAggregator
+        (mean / std / count / quantile(p) per generation)
+    """
+    stats = {}
+    for strategy in sorted(os.listdir(RESULT_ROOT)):
+        strategy_dir = os.path.join(RESULT_ROOT, strategy)
         if not os.path.isdir(strategy_dir):
             continue
 
-        for fname in os.listdir(strategy_dir):
-            if not fname.endswith(".json"):
-                continue
+        aggregators = {key: CurveAggregator(quantiles) for key in history_keys}
+        for block in iter_history_blocks(strategy_dir, history_keys):
+            for key, curves in block.items():
+                aggregators[key].update_block(curves)
+        stats[strategy] = aggregators
+    return stats
+
 
-            with open(os.path.join(strategy_dir, fname), "r", encoding="utf-8") as f:
-                log = json.load(f)
-                data[strategy_name].append(log)
+def load_catalog():
+    """
+    Final metrics and per-strategy aggregates from the SQLite run
+    catalog (no per-run file is opened). The catalog is built once from
+    the result files if the runner has not created it yet.
+    Returns:
+        finals[strategy] = np.ndarray of best_length
+        summary[strategy] = aggregate dict (see RunCatalog.summary)
+    """
+    if not os.path.exists(catalog_path(RESULT_ROOT)):
+        rebuild_catalog(RESULT_ROOT)
 
-    return data
+    with open_catalog(RESULT_ROOT) as catalog:
+        return catalog.final_metric("best_length"), catalog.summary()
 
 
 # --------------------------------------------------
 # Plot 1: Convergence curves
 # --------------------------------------------------
 
-def plot_convergence(data):
+def plot_convergence(stats):
+    """
+    Median best length per generation with the interquartile band.
+    Generations reached by fewer than half of the runs are not drawn.
+    """
     plt.figure(figsize=(8, 6))
 
-    for strategy, runs in data.items():
-        curves = []
-
-        for log in runs:
-            # ★ 关键：用 history.best_length
-            history = log.get("history", {})
-            best_len = history.get("best_length", [])
-
-            if len(best_len) == 0:
-                continue
-
-            curves.append(best_len)
+    for strategy, aggregators in stats.items():
+        # ★ 关键：用 history.best_length
+        curves = aggregators.get("best_length")
+        covered = curves.covered() if curves is not None else np.zeros(0, bool)
 
-        if not curves:
+        if not covered.any():
             print(f"[Skip] {strategy} has no valid history")
             continue
 
-        # 对齐长度
-        min_len = min(len(c) for c in curves)
-        curves = np.array([c[:min_len] for c in curves])
-
-        mean_curve = curves.mean(axis=0)
+        x = np.flatnonzero(covered)
+        median = curves.quantile(0.5)[covered]
+        lower = curves.quantile(0.25)[covered]
+        upper = curves.quantile(0.75)[covered]
 
-        plt.plot(mean_curve, label=strategy)
+        line, = plt.plot(x, median, label=strategy)
+        plt.fill_between(x, lower, upper, color=line.get_color(), alpha=0.2)
 
     plt.xlabel("Generation")
-    plt.ylabel("Best Tour Length")
+    plt.ylabel("Best Tour Length (median, IQR)")
     plt.title("GA Convergence Comparison (ch130)")
     plt.legend()
     plt.grid(True)
@@ -100,12 +133,11 @@ def plot_convergence(data):
 # Plot 2: Stability (boxplot)
 # --------------------------------------------------
 
-def plot_stability(data):
+def plot_stability(finals):
     labels = []
     values = []
 
-    for strategy, runs in data.items():
-        final_lengths = [log["best_length"] for log in runs]
+    for strategy, final_lengths in finals.items():
         labels.append(strategy)
         values.append(final_lengths)
 
@@ -126,14 +158,13 @@ def plot_stability(data):
 # Plot 3: Runtime comparison
 # --------------------------------------------------
 
-def plot_runtime(data):
+def plot_runtime(summary):
     strategies = []
     runtimes = []
 
-    for strategy, runs in data.items():
-        times = [log["runtime"] for log in runs]
+    for strategy, stats in summary.items():
         strategies.append(strategy)
-        runtimes.append(np.mean(times))
+        runtimes.append(stats["runtime_mean"])
 
     plt.figure(figsize=(8, 6))
     plt.bar(strategies, runtimes)
@@ -146,46 +177,43 @@ def plot_runtime(data):
     plt.show()
     print(f"[Saved] {path}")
 
-def plot_adaptive_dynamics(data):
+def plot_adaptive_dynamics(stats):
     """
     Plot Pc / Pm / Diversity evolution for adaptive GA strategies.
     """
     plt.figure(figsize=(10, 6))
 
-    for strategy, runs in data.items():
+    for strategy, aggregators in stats.items():
 
         # 只对自适应类策略画图
         if "Adaptive" not in strategy:
             continue
 
         # --- collect curves ---
-        pc_curves = []
-        pm_curves = []
-        div_curves = []
-
-        for log in runs:
-            history = log["history"]
-            pc_curves.append(history["pc"])
-            pm_curves.append(history["pm"])
-            div_curves.append(history["diversity"])
-
-        # --- align length ---
-        min_len = min(
-            min(len(pc) for pc in pc_curves),
-            min(len(pm) for pm in pm_curves),
-            min(len(dv) for dv in div_curves),
-        )
-
-        pc = np.mean([c[:min_len] for c in pc_curves], axis=0)
-        pm = np.mean([c[:min_len] for c in pm_curves], axis=0)
-        dv = np.mean([c[:min_len] for c in div_curves], axis=0)
-
-        x = np.arange(min_len)
-
-        # --- plotting ---
-        plt.plot(x, pc, label=f"{strategy} Pc", linestyle="-")
-        plt.plot(x, pm, label=f"{strategy} Pm", linestyle="--")
-        plt.plot(x, dv, label=f"{strategy} Diversity", linestyle=":")
+        series = {
+            "Pc": (aggregators["pc"], "-"),
+            "Pm": (aggregators["pm"], "--"),
+            "Diversity": (aggregators["diversity"], ":"),
+        }
+
+        # --- mean with IQR band, where most runs are still going ---
+        for name, (curves, linestyle) in series.items():
+            covered = curves.covered()
+            if not covered.any():
+                continue
+
+            x = np.flatnonzero(covered)
+            line, = plt.plot(
+                x, curves.mean[covered],
+                label=f"{strategy} {name}", linestyle=linestyle
+            )
+            plt.fill_between(
+                x,
+                curves.quantile(0.25)[covered],
+                curves.quantile(0.75)[covered],
+                color=line.get_color(),
+                alpha=0.15,
+            )
 
     plt.xlabel("Generation")
     plt.ylabel("Value")
@@ -204,15 +232,21 @@ def plot_adaptive_dynamics(data):
 # --------------------------------------------------
 
 def main():
-    data = load_all_results()
+    finals, summary = load_catalog()
 
-    if not data:
+    if not summary:
         raise RuntimeError("No experiment experiment_results found.")
 
-    plot_convergence(data)
-    plot_stability(data)
-    plot_runtime(data)
-    plot_adaptive_dynamics(data)   # ← 新增
+    # summary plots: catalog only
+    plot_stability(finals)
+    plot_runtime(summary)
+
+    # curve plots: streaming per-generation statistics (only these series)
+    stats = aggregate_all_results(
+        history_keys=("best_length", "pc", "pm", "diversity")
+    )
+    plot_convergence(stats)
+    plot_adaptive_dynamics(stats)   # ← 新增
 
 
 
@@ -1,10 +1,8 @@
 # analysis/compare_edge_frequency_multi_ga.py
 
 import argparse
-import json
 import os
 import sys
-from collections import defaultdict
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -17,46 +15,11 @@ PROJECT_ROOT = os.path.abspath(
 )
 sys.path.insert(0, PROJECT_ROOT)
 
+from utils.edge_frequency import load_edge_frequency
+from utils.render import add_cities, add_edge_heatmap, finish, use_headless
 from utils.tsp_loader import load_tsp
 
 
-# --------------------------------------------------
-# Utilities
-# --------------------------------------------------
-
-def extract_edges(tour):
-    """Return undirected edges from a TSP tour"""
-    edges = []
-    for i in range(len(tour)):
-        a = tour[i]
-        b = tour[(i + 1) % len(tour)]
-        edges.append(tuple(sorted((a, b))))
-    return edges
-
-
-def load_edge_frequency(result_dir, max_runs=None):
-    edge_count = defaultdict(int)
-
-    files = sorted(
-        f for f in os.listdir(result_dir)
-        if f.endswith(".json")
-    )
-
-    if max_runs:
-        files = files[:max_runs]
-
-    for fname in files:
-        with open(os.path.join(result_dir, fname), "r", encoding="utf-8") as f:
-            log = json.load(f)
-
-        tour = np.asarray(log["best_individual"], dtype=int)
-        for edge in extract_edges(tour):
-            edge_count[edge] += 1
-
-    strategy_name = os.path.basename(result_dir)
-    return edge_count, len(files), strategy_name
-
-
 # --------------------------------------------------
 # Plotting
 # --------------------------------------------------
@@ -64,34 +27,56 @@ def load_edge_frequency(result_dir, max_runs=None):
 def plot_edge_frequency_subplot(
     ax,
     coords,
-    edge_count,
+    edge_frequency,
     n_runs,
     title
 ):
-    max_count = max(edge_count.values())
+    edge_a, edge_b, edge_count = edge_frequency
 
     # Plot cities
-    ax.scatter(coords[:, 0], coords[:, 1], s=8, c="black")
-
-    # Plot edges
-    for (a, b), count in edge_count.items():
-        x = [coords[a, 0], coords[b, 0]]
-        y = [coords[a, 1], coords[b, 1]]
-
-        ratio = count / max_count
-        ax.plot(
-            x,
-            y,
-            color="tab:red",
-            alpha=ratio,
-            linewidth=0.5 + 3.0 * ratio
-        )
+    add_cities(ax, coords, s=8, c="black")
+
+    # Plot edges (one collection, alpha / width by frequency)
+    add_edge_heatmap(ax, coords, edge_a, edge_b, edge_count, color="tab:red")
 
     ax.set_title(f"{title}\n({n_runs} runs)")
     ax.axis("equal")
     ax.axis("off")
 
 
+def plot_edge_frequency_comparison(
+    coords,
+    panels,
+    save_path=None,
+    show=None,
+    dpi=300,
+    title="Edge Frequency Stability Comparison (cn130)"
+):
+    """
+    One heatmap per strategy.
+
+    panels : list of (edge_frequency, n_runs, label)
+    """
+    ncols = 2
+    nrows = (len(panels) + 1) // 2
+
+    fig, axes = plt.subplots(
+        nrows, ncols,
+        figsize=(6 * ncols, 6 * nrows)
+    )
+    axes = np.atleast_1d(axes).flatten()
+
+    for ax, (frequency, n_runs, label) in zip(axes, panels):
+        plot_edge_frequency_subplot(ax, coords, frequency, n_runs, label)
+
+    # Remove unused subplots
+    for ax in axes[len(panels):]:
+        ax.axis("off")
+
+    fig.suptitle(title, fontsize=14)
+    return finish(fig, save_path, dpi=dpi, show=show)
+
+
 # --------------------------------------------------
 # Main
 # --------------------------------------------------
@@ -123,23 +108,21 @@ def main():
         "--out",
         default="analysis/experiment_results/figures/edge_frequency_comparison.png"
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Render with the Agg backend and do not open a window"
+    )
     args = parser.parse_args()
+    if args.headless:
+        use_headless()
 
     tsp = load_tsp(args.tsp)
     coords = np.asarray(tsp.coords)
 
-    n_algo = len(args.experiment_results)
-    ncols = 2
-    nrows = (n_algo + 1) // 2
-
-    fig, axes = plt.subplots(
-        nrows, ncols,
-        figsize=(6 * ncols, 6 * nrows)
-    )
-    axes = axes.flatten()
-
+    panels = []
     for i, result_dir in enumerate(args.experiment_results):
-        edge_count, n_runs, strategy_name = load_edge_frequency(
+        frequency, n_runs, strategy_name = load_edge_frequency(
             result_dir, args.n_runs
         )
 
@@ -147,29 +130,9 @@ def main():
             args.labels[i]
             if args.labels else strategy_name
         )
+        panels.append((frequency, n_runs, title))
 
-        plot_edge_frequency_subplot(
-            axes[i],
-            coords,
-            edge_count,
-            n_runs,
-            title
-        )
-
-    # Remove unused subplots
-    for j in range(i + 1, len(axes)):
-        axes[j].axis("off")
-
-    fig.suptitle(
-        "Edge Frequency Stability Comparison (cn130)",
-        fontsize=14
-    )
-
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    plt.savefig(args.out, dpi=300, bbox_inches="tight")
-    plt.show()
-
-    print(f"[Saved] {args.out}")
+    plot_edge_frequency_comparison(coords, panels, save_path=args.out)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,6 @@
 # analysis/compare_routes_multi_ga.py
 
 import argparse
-import json
 import os
 import sys
 
@@ -16,6 +15,8 @@ PROJECT_ROOT = os.path.abspath(
 )
 sys.path.insert(0, PROJECT_ROOT)
 
+from utils.render import add_cities, add_route, finish, use_headless
+from utils.result_store import load_run
 from utils.tsp_loader import load_tsp
 
 
@@ -27,6 +28,39 @@ COLORS = [
 ]
 
 
+def plot_route_comparison(
+    coords,
+    logs,
+    save_path=None,
+    show=None,
+    dpi=300,
+    title="Best Routes Comparison on cn130"
+):
+    """
+    Overlay the best tours of several runs (one LineCollection each).
+    """
+    fig, ax = plt.subplots(figsize=(8, 8))
+    add_cities(ax, coords, s=12, c="black")
+
+    for idx, log in enumerate(logs):
+        add_route(
+            ax,
+            coords,
+            log["best_individual"],
+            color=COLORS[idx % len(COLORS)],
+            alpha=0.55,
+            linewidth=1.5,
+            label=f"{log['meta']['strategy']} ({log['best_length']:.1f})"
+        )
+
+    ax.set_title(title)
+    ax.axis("equal")
+    ax.axis("off")
+    ax.legend()
+
+    return finish(fig, save_path, dpi=dpi, show=show)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Compare best TSP routes from multiple GA strategies"
@@ -36,49 +70,26 @@ def main():
         "--experiment_results",
         nargs="+",
         required=True,
-        help="List of GA result json files"
+        help="List of GA result json files (or strategy dirs / runs.npz: best run)"
     )
     parser.add_argument(
         "--out",
         default="analysis/experiment_results/figures/route_comparison.png"
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Render with the Agg backend and do not open a window"
+    )
     args = parser.parse_args()
+    if args.headless:
+        use_headless()
 
     tsp = load_tsp(args.tsp)
     coords = np.asarray(tsp.coords)   # ✅ 必改
 
-
-    plt.figure(figsize=(8, 8))
-    plt.scatter(coords[:, 0], coords[:, 1], s=12, c="black")
-
-    for idx, path in enumerate(args.experiment_results):
-        with open(path, "r", encoding="utf-8") as f:
-            log = json.load(f)
-
-        tour = np.array(log["best_individual"])
-        length = log["best_length"]
-        strategy = log["meta"]["strategy"]
-
-        ordered = np.append(tour, tour[0])
-        plt.plot(
-            coords[ordered, 0],
-            coords[ordered, 1],
-            color=COLORS[idx % len(COLORS)],
-            alpha=0.55,
-            linewidth=1.5,
-            label=f"{strategy} ({length:.1f})"
-        )
-
-    plt.title("Best Routes Comparison on cn130")
-    plt.axis("equal")
-    plt.axis("off")
-    plt.legend()
-
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    plt.savefig(args.out, dpi=300, bbox_inches="tight")
-    plt.show()
-
-    print(f"[Saved] {args.out}")
+    logs = [load_run(path) for path in args.experiment_results]
+    plot_route_comparison(coords, logs, save_path=args.out)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,8 @@
 # analysis/path_edge_frequency.py
 
 import argparse
-import json
 import os
 import sys
-from collections import defaultdict
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -17,16 +15,26 @@ PROJECT_ROOT = os.path.abspath(
 )
 sys.path.insert(0, PROJECT_ROOT)
 
+from utils.edge_frequency import edge_frequency, load_tours
+from utils.render import add_cities, add_edge_heatmap, finish, use_headless
 from utils.tsp_loader import load_tsp
 
 
-def extract_edges(tour):
-    edges = []
-    for i in range(len(tour)):
-        a = tour[i]
-        b = tour[(i + 1) % len(tour)]
-        edges.append(tuple(sorted((a, b))))
-    return edges
+def plot_edge_stability(coords, frequency, n_runs, strategy_name,
+                        save_path=None, show=None, dpi=300):
+    edge_a, edge_b, edge_count = frequency
+
+    fig, ax = plt.subplots(figsize=(8, 8))
+    add_cities(ax, coords, s=12, c="black")
+    add_edge_heatmap(ax, coords, edge_a, edge_b, edge_count, color="tab:red")
+
+    ax.set_title(
+        f"Edge Frequency Stability\n{strategy_name} ({n_runs} runs)"
+    )
+    ax.axis("equal")
+    ax.axis("off")
+
+    return finish(fig, save_path, dpi=dpi, show=show)
 
 
 def main():
@@ -40,62 +48,24 @@ def main():
         "--out",
         default="analysis/experiment_results/figures/edge_frequency.png"
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Render with the Agg backend and do not open a window"
+    )
     args = parser.parse_args()
+    if args.headless:
+        use_headless()
 
     tsp = load_tsp(args.tsp)
     coords = np.asarray(tsp.coords)   # 🔧 fix
 
-    files = sorted(
-        f for f in os.listdir(args.experiment_results)
-        if f.endswith(".json")
-    )
-    if args.n_runs:
-        files = files[:args.n_runs]
-
-    edge_count = defaultdict(int)
-    strategy_name = None
-
-    for fname in files:
-        with open(os.path.join(args.experiment_results, fname), "r", encoding="utf-8") as f:
-            log = json.load(f)
+    tours, strategy_name = load_tours(args.experiment_results, args.n_runs)
+    frequency = edge_frequency(tours, tsp.num_cities)
 
-        if strategy_name is None:
-            strategy_name = log["meta"]["strategy"]
-
-        tour = np.array(log["best_individual"])
-        edges = extract_edges(tour)
-
-        for e in edges:
-            edge_count[e] += 1
-
-    max_count = max(edge_count.values())
-
-    plt.figure(figsize=(8, 8))
-    plt.scatter(coords[:, 0], coords[:, 1], s=12, c="black")
-
-    for (a, b), count in edge_count.items():
-        x = [coords[a, 0], coords[b, 0]]
-        y = [coords[a, 1], coords[b, 1]]
-
-        plt.plot(
-            x,
-            y,
-            color="tab:red",
-            alpha=count / max_count,
-            linewidth=0.5 + 3.0 * (count / max_count)
-        )
-
-    plt.title(
-        f"Edge Frequency Stability\n{strategy_name} ({len(files)} runs)"
+    plot_edge_stability(
+        coords, frequency, len(tours), strategy_name, save_path=args.out
     )
-    plt.axis("equal")
-    plt.axis("off")
-
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    plt.savefig(args.out, dpi=300, bbox_inches="tight")
-    plt.show()
-
-    print(f"[Saved] {args.out}")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,6 @@
 # analysis/plot_tsp_route.py
 
 import argparse
-import json
 import os
 import sys
 
@@ -16,6 +15,9 @@ PROJECT_ROOT = os.path.abspath(
 )
 sys.path.insert(0, PROJECT_ROOT)
 
+from utils.distance import as_distance_provider
+from utils.render import add_cities, add_route, finish, use_headless
+from utils.result_store import load_run
 from utils.tsp_loader import load_tsp
 
 
@@ -24,12 +26,7 @@ from utils.tsp_loader import load_tsp
 # --------------------------------------------------
 
 def compute_tour_length(tour, distance_matrix):
-    length = 0.0
-    for i in range(len(tour)):
-        a = tour[i]
-        b = tour[(i + 1) % len(tour)]
-        length += distance_matrix[a, b]
-    return length
+    return as_distance_provider(distance_matrix).tour_length(tour)
 
 
 # --------------------------------------------------
@@ -41,31 +38,21 @@ def plot_tsp_route(
     tour,
     distance_matrix,
     title,
-    save_path=None
+    save_path=None,
+    show=None,
+    dpi=300
 ):
-    x = coords[:, 0]
-    y = coords[:, 1]
-
-    ordered = np.append(tour, tour[0])
-    route_x = x[ordered]
-    route_y = y[ordered]
-
     length = compute_tour_length(tour, distance_matrix)
 
-    plt.figure(figsize=(8, 8))
-    plt.plot(route_x, route_y, "-o", markersize=3, linewidth=1)
-    plt.scatter(x, y, s=10)
+    fig, ax = plt.subplots(figsize=(8, 8))
+    add_route(ax, coords, tour, linewidth=1)
+    add_cities(ax, coords, s=10, c="tab:blue")
 
-    plt.title(f"{title}\nBest tour length = {length:.2f}")
-    plt.axis("equal")
-    plt.axis("off")
+    ax.set_title(f"{title}\nBest tour length = {length:.2f}")
+    ax.axis("equal")
+    ax.axis("off")
 
-    if save_path:
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        plt.savefig(save_path, dpi=300, bbox_inches="tight")
-        print(f"[Saved] {save_path}")
-
-    plt.show()
+    return finish(fig, save_path, dpi=dpi, show=show)
 
 
 # --------------------------------------------------
@@ -77,23 +64,33 @@ def main():
         description="Plot best TSP route from GA result"
     )
     parser.add_argument("--tsp", required=True, help="Path to .tsp file")
-    parser.add_argument("--result", required=True, help="GA run json file")
+    parser.add_argument(
+        "--result",
+        required=True,
+        help="GA run json file (or strategy dir / runs.npz: best run)"
+    )
     parser.add_argument(
         "--out",
         default="analysis/experiment_results/figures/best_route.png",
         help="Output image path"
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Render with the Agg backend and do not open a window"
+    )
 
     args = parser.parse_args()
+    if args.headless:
+        use_headless()
 
     # Load TSP
     tsp = load_tsp(args.tsp)
     coords = np.asarray(tsp.coords)          # 🔧 fix
-    distance_matrix = np.asarray(tsp.distance_matrix)
+    distance_matrix = tsp.distance
 
     # Load GA result
-    with open(args.result, "r", encoding="utf-8") as f:
-        log = json.load(f)
+    log = load_run(args.result)
 
     best_individual = log.get("best_individual")
     if best_individual is None:
@@ -0,0 +1,186 @@
+# analysis/render_all.py
+#
+# Batch rendering of every per-strategy and comparison figure, headless,
+# on a process pool (one figure per task).
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# --------------------------------------------------
+# Fix import path
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(1, BASE_DIR)
+
+from compare_edge_frequency_multi_ga import plot_edge_frequency_comparison
+from compare_routes_multi_ga import plot_route_comparison
+from path_stability_overlay import plot_edge_stability
+from plot_tsp_route import plot_tsp_route
+from show_route_and_convergence import plot_route_and_convergence
+from utils.edge_frequency import load_edge_frequency
+from utils.render import use_headless
+from utils.result_store import load_run
+from utils.tsp_loader import load_tsp
+
+TSP_PATH = os.path.join(PROJECT_ROOT, "data", "ch130.tsp")
+RESULT_ROOT = os.path.join(PROJECT_ROOT, "experiment_results", "experiments")
+FIGURE_DIR = os.path.join(PROJECT_ROOT, "experiment_results", "figures")
+
+
+# --------------------------------------------------
+# Jobs (run inside the workers)
+# --------------------------------------------------
+
+_TSP = {}
+
+
+def _coords(tsp_path):
+    # loaded once per worker; coordinates only, no matrix
+    if tsp_path not in _TSP:
+        tsp = load_tsp(tsp_path, matrix_free=True)
+        _TSP[tsp_path] = (tsp.name, np.asarray(tsp.coords), tsp.distance)
+    return _TSP[tsp_path]
+
+
+def render_job(job):
+    """
+    Render one figure.
+
+    job : (kind, tsp_path, strategy_dirs, save_path, dpi)
+    """
+    kind, tsp_path, strategy_dirs, save_path, dpi = job
+    name, coords, distance = _coords(tsp_path)
+
+    if kind == "route":
+        log = load_run(strategy_dirs[0])
+        return plot_tsp_route(
+            coords,
+            log["best_individual"],
+            distance,
+            title=f"{log['meta']['strategy']} best route on {name}",
+            save_path=save_path,
+            dpi=dpi,
+        )
+
+    if kind == "route_convergence":
+        log = load_run(strategy_dirs[0])
+        return plot_route_and_convergence(
+            coords, log, save_path=save_path, dpi=dpi
+        )
+
+    if kind == "edge_frequency":
+        frequency, n_runs, strategy_name = load_edge_frequency(strategy_dirs[0])
+        return plot_edge_stability(
+            coords, frequency, n_runs, strategy_name,
+            save_path=save_path, dpi=dpi,
+        )
+
+    if kind == "route_comparison":
+        logs = [load_run(path) for path in strategy_dirs]
+        return plot_route_comparison(
+            coords, logs, save_path=save_path, dpi=dpi,
+            title=f"Best Routes Comparison on {name}",
+        )
+
+    if kind == "edge_frequency_comparison":
+        panels = []
+        for path in strategy_dirs:
+            frequency, n_runs, strategy_name = load_edge_frequency(path)
+            panels.append((frequency, n_runs, strategy_name))
+        return plot_edge_frequency_comparison(
+            coords, panels, save_path=save_path, dpi=dpi,
+            title=f"Edge Frequency Stability Comparison ({name})",
+        )
+
+    raise ValueError(f"Unknown figure kind: {kind}")
+
+
+# --------------------------------------------------
+# Job list
+# --------------------------------------------------
+
+PER_STRATEGY = ("route", "route_convergence", "edge_frequency")
+COMPARISONS = ("route_comparison", "edge_frequency_comparison")
+
+
+def build_jobs(tsp_path, result_root, figure_dir, dpi, strategies=None):
+    strategy_dirs = [
+        os.path.join(result_root, name)
+        for name in sorted(os.listdir(result_root))
+        if os.path.isdir(os.path.join(result_root, name))
+        and (strategies is None or name in strategies)
+    ]
+
+    jobs = []
+    for strategy_dir in strategy_dirs:
+        strategy = os.path.basename(strategy_dir)
+        for kind in PER_STRATEGY:
+            save_path = os.path.join(figure_dir, strategy, f"{kind}.png")
+            jobs.append((kind, tsp_path, [strategy_dir], save_path, dpi))
+
+    if len(strategy_dirs) > 1:
+        for kind in COMPARISONS:
+            save_path = os.path.join(figure_dir, f"{kind}.png")
+            jobs.append((kind, tsp_path, strategy_dirs, save_path, dpi))
+
+    return jobs
+
+
+def render_all(jobs, workers=None):
+    """
+    Render the jobs on a process pool; every worker uses Agg.
+
+    Returns
+    -------
+    list of str
+        Saved figure paths, in job order
+    """
+    if workers == 1:
+        use_headless()
+        return [render_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_headless) as pool:
+        return list(pool.map(render_job, jobs))
+
+
+# --------------------------------------------------
+# Main
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render all analysis figures headlessly in parallel"
+    )
+    parser.add_argument("--tsp", default=TSP_PATH)
+    parser.add_argument("--experiment_results", default=RESULT_ROOT)
+    parser.add_argument("--out", default=FIGURE_DIR)
+    parser.add_argument(
+        "--strategies", nargs="+", default=None,
+        help="Only these strategy directories (default: all)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Render processes (default: CPU count, 1 = in process)"
+    )
+    parser.add_argument("--dpi", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    jobs = build_jobs(
+        args.tsp, args.experiment_results, args.out, args.dpi, args.strategies
+    )
+    if not jobs:
+        print(f"[Info] No strategy results under {args.experiment_results}")
+        return
+
+    saved = render_all(jobs, workers=args.workers)
+    print(f"[Done] {len(saved)} figures in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 # analysis/show_route_and_convergence.py
 
 import argparse
-import json
 import os
 import sys
 
@@ -17,34 +16,16 @@ PROJECT_ROOT = os.path.abspath(
 sys.path.insert(0, PROJECT_ROOT)
 
 import utils.tsp_loader
+from utils.distance import as_distance_provider
+from utils.render import add_cities, add_route, finish, use_headless
+from utils.result_store import load_run
 
 
 def compute_tour_length(tour, dist):
-    return sum(
-        dist[tour[i], tour[(i + 1) % len(tour)]]
-        for i in range(len(tour))
-    )
-
-
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--tsp", required=True)
-    parser.add_argument("--result", required=True)
-    parser.add_argument(
-        "--out",
-        default="analysis/experiment_results/figures/route_and_convergence.png"
-    )
-    args = parser.parse_args()
-
-    # ---------------- Load TSP ----------------
-    tsp = utils.tsp_loader.load_tsp(args.tsp)
-    coords = np.asarray(tsp.coords)  # ✅ 关键修复
-    dist = tsp.distance_matrix
+    return as_distance_provider(dist).tour_length(tour)
 
-    # ---------------- Load result ----------------
-    with open(args.result, "r", encoding="utf-8") as f:
-        log = json.load(f)
 
+def plot_route_and_convergence(coords, log, save_path=None, show=None, dpi=300):
     tour = np.array(log["best_individual"])
     best_length = log["best_length"]
     strategy = log["meta"]["strategy"]
@@ -52,19 +33,11 @@ def main():
     # ✅ 正确的收敛曲线接口
     convergence = log["history"]["best_length"]
 
-    # ---------------- Plot ----------------
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 
     # ---- Left: Route ----
-    ordered = np.append(tour, tour[0])
-    axes[0].plot(
-        coords[ordered, 0],
-        coords[ordered, 1],
-        "-o",
-        markersize=3,
-        linewidth=1
-    )
-    axes[0].scatter(coords[:, 0], coords[:, 1], s=10)
+    add_route(axes[0], coords, tour, linewidth=1)
+    add_cities(axes[0], coords, s=10, c="tab:blue")
     axes[0].set_title(
         f"{strategy}\nBest length = {best_length:.2f}"
     )
@@ -78,11 +51,35 @@ def main():
     axes[1].set_title("Convergence Curve")
     axes[1].grid(True)
 
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    plt.savefig(args.out, dpi=300, bbox_inches="tight")
-    plt.show()
+    return finish(fig, save_path, dpi=dpi, show=show)
+
 
-    print(f"[Saved] {args.out}")
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tsp", required=True)
+    parser.add_argument("--result", required=True)
+    parser.add_argument(
+        "--out",
+        default="analysis/experiment_results/figures/route_and_convergence.png"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Render with the Agg backend and do not open a window"
+    )
+    args = parser.parse_args()
+    if args.headless:
+        use_headless()
+
+    # ---------------- Load TSP ----------------
+    tsp = utils.tsp_loader.load_tsp(args.tsp)
+    coords = np.asarray(tsp.coords)  # ✅ 关键修复
+
+    # ---------------- Load result ----------------
+    log = load_run(args.result)
+
+    # ---------------- Plot ----------------
+    plot_route_and_convergence(coords, log, save_path=args.out)
 
 
 if __name__ == "__main__":
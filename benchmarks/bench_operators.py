@@ -0,0 +1,457 @@
+# benchmarks/bench_operators.py
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+# --------------------------------------------------
+# Fix import path
+# --------------------------------------------------
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks import reference
+from ga.operators.crossover import order_crossover, pmx_crossover
+from ga.operators.metrics import compute_population_diversity, evaluate_population
+from ga.operators.mutation import mutate
+from ga.operators.selection import select
+from utils.distance import build_distance_matrix
+
+BASELINE_PATH = os.path.join(PROJECT_ROOT, "benchmarks", "baseline.json")
+
+SIZES = [100, 1000, 10000]
+POP_SIZES = [50, 200]
+
+# a case is slower than baseline by more than this fraction -> regression
+THRESHOLD = 0.25
+
+# ... and by more than this many seconds per call (timer / cache noise
+# dominates cases of a few microseconds)
+MIN_DELTA = 50e-6
+
+# tolerance widened to NOISE_SIGMAS x the measured relative spread when
+# that is larger than THRESHOLD
+NOISE_SIGMAS = 3.0
+
+REPEAT = 11
+
+
+# --------------------------------------------------
+# Inputs
+# --------------------------------------------------
+
+_INPUTS = {}
+
+
+def make_inputs(n, pop_size, seed=0):
+    """
+    Random instance, population and fitness for one (n, pop_size) cell.
+    Shared between cases; the distance matrix is built once per n.
+    """
+    key = (n, pop_size)
+    if key not in _INPUTS:
+        rng = np.random.default_rng(seed)
+        matrix_key = ("matrix", n)
+        if matrix_key not in _INPUTS:
+            coords = rng.uniform(0, 10000, size=(n, 2))
+            _INPUTS[matrix_key] = build_distance_matrix(coords, "EUC_2D")
+
+        population = np.array([rng.permutation(n) for _ in range(pop_size)])
+        _INPUTS[key] = {
+            "matrix": _INPUTS[matrix_key],
+            "population": population,
+            "fitness": rng.uniform(1e-5, 2e-5, size=pop_size),
+        }
+    return _INPUTS[key]
+
+
+# --------------------------------------------------
+# Cases
+# --------------------------------------------------
+# name -> (operator, reference, args(inputs), depends on pop_size, compare)
+# compare: "exact" (identical arrays / values) or "close" (float sums,
+# summation order may differ)
+
+CASES = {
+    "evaluate_population": (
+        evaluate_population,
+        reference.evaluate_population,
+        lambda d: (d["population"], d["matrix"]),
+        True,
+        "close",
+    ),
+    "order_crossover": (
+        order_crossover,
+        reference.order_crossover,
+        lambda d: (d["population"][0], d["population"][1]),
+        False,
+        "exact",
+    ),
+    "pmx_crossover": (
+        pmx_crossover,
+        reference.pmx_crossover,
+        lambda d: (d["population"][0], d["population"][1]),
+        False,
+        "exact",
+    ),
+    "mutate_swap": (
+        mutate,
+        reference.mutate,
+        lambda d: (d["population"][0], 1.0, "swap"),
+        False,
+        "exact",
+    ),
+    "mutate_inversion": (
+        mutate,
+        reference.mutate,
+        lambda d: (d["population"][0], 1.0, "inversion"),
+        False,
+        "exact",
+    ),
+    "select_roulette": (
+        select,
+        reference.select,
+        lambda d: (d["fitness"], "roulette"),
+        True,
+        "exact",
+    ),
+    "select_sus": (
+        select,
+        reference.select,
+        lambda d: (d["fitness"], "sus"),
+        True,
+        "exact",
+    ),
+    "compute_population_diversity": (
+        compute_population_diversity,
+        reference.compute_population_diversity,
+        lambda d: (d["population"],),
+        True,
+        "exact",
+    ),
+}
+
+
+def case_id(name, n, pop_size, pop_dependent):
+    if pop_dependent:
+        return f"{name}[n={n},pop={pop_size}]"
+    return f"{name}[n={n}]"
+
+
+def iter_cases(names, sizes, pop_sizes):
+    """
+    (case_id, name, n, pop_size) over the benchmark matrix; operators
+    that do not see the population are run once per n.
+    """
+    for name in names:
+        pop_dependent = CASES[name][3]
+        for n in sizes:
+            for pop_size in (pop_sizes if pop_dependent else pop_sizes[:1]):
+                yield case_id(name, n, pop_size, pop_dependent), name, n, pop_size
+
+
+# --------------------------------------------------
+# Verification / timing
+# --------------------------------------------------
+
+def _same(a, b, compare):
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(
+            _same(x, y, compare) for x, y in zip(a, b)
+        )
+    if compare == "close":
+        return np.allclose(a, b, rtol=1e-9, atol=0.0)
+    return np.array_equal(np.asarray(a), np.asarray(b))
+
+
+def verify(name, inputs, seeds=(0, 1, 2)):
+    """
+    True when the operator matches the reference under every seed.
+    """
+    operator, ref, make_args, _, compare = CASES[name]
+    args = make_args(inputs)
+
+    for seed in seeds:
+        np.random.seed(seed)
+        out = operator(*args)
+        np.random.seed(seed)
+        expected = ref(*args)
+        if not _same(out, expected, compare):
+            return False
+    return True
+
+
+def time_call(fn, args, repeat=REPEAT, min_time=0.2):
+    """
+    Seconds per call: the calls per sample grow until a sample lasts
+    min_time; `repeat` samples are taken.
+
+    Returns
+    -------
+    seconds : float
+        Median seconds per call
+    spread : float
+        Relative spread of the samples (interquartile range / median)
+    """
+    np.random.seed(0)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(*args)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(*args)
+        samples.append((time.perf_counter() - start) / number)
+
+    q25, median, q75 = np.percentile(samples, [25, 50, 75])
+    return float(median), float((q75 - q25) / median)
+
+
+def _calibration_kernel():
+    # fixed mix of interpreter and numpy work, like the operators
+    rng = np.random.default_rng(0)
+    a = rng.permutation(20000)
+    total = 0
+    for x in a[:5000].tolist():
+        total += x % 7
+    return total + int(np.sort(a)[-1]) + int(np.argsort(rng.random(20000))[0])
+
+
+def calibrate(repeat=REPEAT):
+    """
+    Median seconds of a fixed reference workload. The ratio to the
+    baseline's value rescales its timings to the current machine load /
+    clock before comparing.
+    """
+    return time_call(_calibration_kernel, (), repeat=repeat)[0]
+
+
+def run_benchmarks(names, sizes, pop_sizes, repeat=REPEAT, check=True):
+    """
+    Returns
+    -------
+    dict
+        {case_id: {"seconds": float, "spread": float,
+                   "verified": bool | None}}
+    """
+    results = {}
+    for cid, name, n, pop_size in iter_cases(names, sizes, pop_sizes):
+        inputs = make_inputs(n, pop_size)
+        operator, _, make_args, _, _ = CASES[name]
+
+        verified = verify(name, inputs) if check else None
+        seconds, spread = time_call(operator, make_args(inputs), repeat=repeat)
+        results[cid] = {
+            "seconds": seconds, "spread": spread, "verified": verified,
+        }
+
+        status = {True: "ok", False: "MISMATCH", None: "-"}[verified]
+        print(
+            f"{cid:<48} {seconds * 1e3:>12.4f} ms ±{spread:>5.1%}   "
+            f"ref={status}"
+        )
+    return results
+
+
+# --------------------------------------------------
+# Baseline
+# --------------------------------------------------
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+    }
+
+
+def _baseline_case(entry):
+    # (seconds, spread); early baselines stored bare seconds
+    if isinstance(entry, dict):
+        return entry["seconds"], entry.get("spread", 0.0)
+    return entry, 0.0
+
+
+def save_baseline(results, path=BASELINE_PATH, calibration=None):
+    baseline = {
+        "environment": environment(),
+        "calibration": calibration if calibration is not None else calibrate(),
+        "cases": {
+            cid: {"seconds": r["seconds"], "spread": r["spread"]}
+            for cid, r in results.items()
+        },
+    }
+    if os.path.exists(path):
+        # keep cases that were not re-run this time
+        with open(path, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        baseline["cases"] = {**old.get("cases", {}), **baseline["cases"]}
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    print(f"[Saved] {path}")
+
+
+def compare_baseline(results, path=BASELINE_PATH, threshold=THRESHOLD,
+                     min_delta=MIN_DELTA, calibration=None):
+    """
+    Ratio current / baseline per case, after rescaling the baseline by
+    the calibration ratio (same workload, then and now).
+
+    A case regresses only when it is slower than the rescaled baseline
+    by more than max(threshold, NOISE_SIGMAS x measured spread) AND by
+    more than min_delta seconds per call, so microsecond cases and
+    noisy samples do not fail the gate.
+
+    Returns
+    -------
+    regressions : list of str
+        Case ids that regressed
+    comparable : bool
+        False when the baseline comes from another environment or has
+        no calibration: such absolute timings are only reported, not
+        gated on
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    comparable = baseline.get("environment") == environment()
+    if not comparable:
+        print(
+            "[Warn] Baseline was recorded in a different environment "
+            f"({baseline.get('environment')}); ratios are informational"
+        )
+
+    scale = 1.0
+    if baseline.get("calibration"):
+        current = calibration if calibration is not None else calibrate()
+        scale = current / baseline["calibration"]
+        print(f"[Info] Calibration: this run x{scale:.2f} of the baseline's")
+    elif comparable:
+        # no reference workload recorded: drift cannot be told apart
+        comparable = False
+        print(
+            "[Warn] Baseline has no calibration; ratios are informational "
+            "(re-record with --save)"
+        )
+
+    regressions = []
+    for cid, result in results.items():
+        if cid not in baseline["cases"]:
+            continue
+        base, base_spread = _baseline_case(baseline["cases"][cid])
+        expected = base * scale
+
+        ratio = result["seconds"] / expected
+        noise = NOISE_SIGMAS * max(base_spread, result.get("spread", 0.0))
+        tolerance = max(threshold, noise)
+        significant = result["seconds"] - expected > min_delta
+
+        if ratio > 1.0 + tolerance and significant:
+            label = "REGRESSION"
+            regressions.append(cid)
+        elif ratio > 1.0 + tolerance:
+            label = "(below noise floor)"
+        elif ratio < 1.0 / (1.0 + tolerance):
+            label = "faster"
+        else:
+            label = ""
+        print(f"{cid:<48} x{ratio:>7.2f} (tol {tolerance:.0%}) {label}")
+    return regressions, comparable
+
+
+# --------------------------------------------------
+# Main
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark the GA operators against a baseline"
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        default=list(CASES),
+        choices=list(CASES),
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--pop_sizes", nargs="+", type=int, default=POP_SIZES)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument(
+        "--min_delta",
+        type=float,
+        default=MIN_DELTA,
+        help="Ignore slowdowns smaller than this many seconds per call"
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Record the timings as the new baseline"
+    )
+    parser.add_argument(
+        "--no_check",
+        action="store_true",
+        help="Skip the comparison with the reference implementations"
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.cases,
+        args.sizes,
+        args.pop_sizes,
+        repeat=args.repeat,
+        check=not args.no_check,
+    )
+
+    failed = False
+
+    mismatches = [cid for cid, r in results.items() if r["verified"] is False]
+    if mismatches:
+        print(f"[Fail] Output differs from reference: {mismatches}")
+        failed = True
+
+    if args.save:
+        save_baseline(results, args.baseline)
+    elif os.path.exists(args.baseline):
+        regressions, comparable = compare_baseline(
+            results, args.baseline,
+            threshold=args.threshold, min_delta=args.min_delta,
+        )
+        if regressions and comparable:
+            print(
+                f"[Fail] {len(regressions)} case(s) slower than baseline "
+                f"beyond threshold and noise"
+            )
+            failed = True
+        elif regressions:
+            print(
+                f"[Warn] {len(regressions)} case(s) slower than a baseline "
+                "from another environment (not failing; re-record with --save)"
+            )
+    else:
+        print(f"[Info] No baseline at {args.baseline}; run with --save")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
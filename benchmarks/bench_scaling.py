@@ -0,0 +1,397 @@
+# benchmarks/bench_scaling.py
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import signal
+import sys
+import time
+
+import numpy as np
+
+# --------------------------------------------------
+# Fix import path
+# --------------------------------------------------
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+sys.path.insert(0, PROJECT_ROOT)
+
+from experiment.run_experiment import ELITE_SIZE, SEED, STRATEGIES, build_strategy
+from ga.engine import GAEngine
+from utils.instances import INSTANCE_KINDS, hilbert_tour_length, synthetic_instance
+from utils.tsp_loader import load_tsp
+
+BENCH_ROOT = os.path.join(PROJECT_ROOT, "experiment_results", "benchmarks")
+
+# OX crossover is O(n^2) (about 5 s per call at n = 10000), so larger
+# sizes only finish a generation under much larger budgets; pass them
+# explicitly with --sizes / --time_budget
+SIZES = [100, 500, 2000]
+POP_SIZES = [50, 100]
+WORKERS = [1]
+TIME_BUDGET = 10.0
+
+# a run still inside a generation this long after its budget is cut
+# short in the child (partial report); a child that does not return
+# within the budget plus KILL_AFTER seconds (e.g. stuck in C code) is
+# killed by the parent
+GRACE = 1.0
+KILL_AFTER = 60.0
+
+# time-to-target: targets are these multiples of the Hilbert-curve tour
+TARGET_FACTORS = [4.0, 2.0, 1.5, 1.0]
+
+# above this size the n x n matrix is not built (matrix-free distances)
+MATRIX_FREE_ABOVE = 10000
+
+
+# --------------------------------------------------
+# One run (inside a fresh worker process)
+# --------------------------------------------------
+
+def _peak_rss_mb():
+    # VmHWM is this process's own high-water mark; ru_maxrss survives
+    # exec, so a spawned child would report the parent's peak
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def _raise_budget_exceeded(signum, frame):
+    raise _BudgetExceeded()
+
+
+def bench_run(task):
+    """
+    Run one strategy on one instance under a wall-clock budget.
+
+    strategy.evaluate is wrapped to count tour evaluations (including
+    those made inside evolve) and to timestamp the first time the best
+    length reaches each target.
+
+    The engine only checks time_limit between generations; a SIGALRM
+    timer at time_budget + grace interrupts a generation that overruns
+    it, and the run is reported as truncated with what it completed.
+    Each rate matches its numerator: gens_per_sec is per second of
+    completed generations (the interrupted one is not counted), while
+    evals_per_sec is per second of elapsed time, since evaluations made
+    inside the interrupted generation are counted. elapsed holds the
+    real wall-clock time next to the budget.
+    """
+    load_start = time.perf_counter()
+    tsp = load_tsp(task["path"], matrix_free=task["matrix_free"])
+    load_seconds = time.perf_counter() - load_start
+
+    strategy = build_strategy(task["strategy"])
+    engine = GAEngine(
+        tsp=tsp,
+        strategy=strategy,
+        pop_size=task["pop_size"],
+        generations=10 ** 9,
+        elite_size=ELITE_SIZE,
+        seed=task["seed"],
+        verbose=False,
+        time_limit=task["time_budget"],
+    )
+
+    targets = task["targets"]
+    reached = {}
+    counts = {"evaluations": 0}
+    evaluate = strategy.evaluate
+
+    def counted_evaluate(population, distance_matrix):
+        fitness, lengths = evaluate(population, distance_matrix)
+        counts["evaluations"] += len(population)
+        best = float(np.min(lengths))
+        elapsed = time.perf_counter() - start
+        for factor, target in targets.items():
+            if factor not in reached and best <= target:
+                reached[factor] = elapsed
+        return fitness, lengths
+
+    strategy.evaluate = counted_evaluate
+
+    previous = signal.signal(signal.SIGALRM, _raise_budget_exceeded)
+    signal.setitimer(signal.ITIMER_REAL, task["time_budget"] + task["grace"])
+    truncated = False
+
+    start = time.perf_counter()
+    try:
+        engine.run()
+    except _BudgetExceeded:
+        truncated = True
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+    elapsed = time.perf_counter() - start
+
+    # time spent in completed generations (phases are added per generation)
+    completed = sum(engine.phase_seconds.values())
+
+    return {
+        "seed": task["seed"],
+        "generations": engine.generations_run,
+        "evaluations": counts["evaluations"],
+        "time_budget": task["time_budget"],
+        "elapsed": elapsed,
+        "runtime": elapsed,
+        "completed_seconds": completed,
+        "truncated": truncated,
+        "killed": False,
+        "load_seconds": load_seconds,
+        "best_length": float(engine.best_length),
+        "gens_per_sec": engine.generations_run / completed if completed else 0.0,
+        "evals_per_sec": counts["evaluations"] / elapsed if elapsed else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "time_to_target": {
+            factor: reached.get(factor) for factor in targets
+        },
+    }
+
+
+def _killed_run(task):
+    # report of a child killed by the parent: nothing is known but that
+    return {
+        "seed": task["seed"],
+        "generations": 0,
+        "evaluations": 0,
+        "time_budget": task["time_budget"],
+        "elapsed": None,
+        "runtime": None,
+        "completed_seconds": 0.0,
+        "truncated": True,
+        "killed": True,
+        "load_seconds": None,
+        "best_length": float("inf"),
+        "gens_per_sec": 0.0,
+        "evals_per_sec": 0.0,
+        "peak_rss_mb": 0.0,
+        "time_to_target": {factor: None for factor in task["targets"]},
+    }
+
+
+# --------------------------------------------------
+# One cell of the grid
+# --------------------------------------------------
+
+def bench_cell(instance, strategy_name, pop_size, workers, settings):
+    """
+    `workers` concurrent runs (one fresh process each, different
+    seeds) of one (instance, strategy, pop_size) cell.
+    """
+    targets = {
+        str(factor): factor * instance["reference_length"]
+        for factor in settings["target_factors"]
+    }
+    tasks = [
+        {
+            "path": instance["path"],
+            "matrix_free": instance["matrix_free"],
+            "strategy": strategy_name,
+            "pop_size": pop_size,
+            "time_budget": settings["time_budget"],
+            "grace": settings["grace"],
+            "seed": settings["seed"] + i,
+            "targets": targets,
+        }
+        for i in range(workers)
+    ]
+
+    # spawn + one task per child: peak RSS is the run's own, not the parent's
+    ctx = multiprocessing.get_context("spawn")
+    pool = ctx.Pool(workers, maxtasksperchild=1)
+    try:
+        runs = pool.map_async(bench_run, tasks).get(
+            settings["time_budget"] + settings["kill_after"]
+        )
+        pool.close()
+    except multiprocessing.TimeoutError:
+        # children that ignored the in-process deadline
+        runs = [_killed_run(task) for task in tasks]
+    finally:
+        pool.terminate()
+        pool.join()
+
+    time_to_target = {}
+    for factor in targets:
+        hits = [r["time_to_target"][factor] for r in runs]
+        hits = [t for t in hits if t is not None]
+        time_to_target[factor] = {
+            "median": float(np.median(hits)) if hits else None,
+            "hit_rate": len(hits) / len(runs),
+        }
+
+    return {
+        "instance": instance["name"],
+        "n": instance["n"],
+        "kind": instance["kind"],
+        "strategy": strategy_name,
+        "pop_size": pop_size,
+        "workers": workers,
+        "time_budget": settings["time_budget"],
+        "elapsed_max": max(
+            (r["elapsed"] for r in runs if r["elapsed"] is not None),
+            default=None,
+        ),
+        "truncated": int(sum(r["truncated"] for r in runs)),
+        "killed": int(sum(r["killed"] for r in runs)),
+        "generations": int(sum(r["generations"] for r in runs)),
+        "gens_per_sec": float(np.mean([r["gens_per_sec"] for r in runs])),
+        "evals_per_sec": float(np.mean([r["evals_per_sec"] for r in runs])),
+        "total_gens_per_sec": float(sum(r["gens_per_sec"] for r in runs)),
+        "total_evals_per_sec": float(sum(r["evals_per_sec"] for r in runs)),
+        "peak_rss_mb": float(max(r["peak_rss_mb"] for r in runs)),
+        "best_length": float(min(r["best_length"] for r in runs)),
+        "time_to_target": time_to_target,
+        "runs": runs,
+    }
+
+
+# --------------------------------------------------
+# Instances
+# --------------------------------------------------
+
+def prepare_instance(n, kind, seed, directory, matrix_free_above):
+    """
+    Write the synthetic instance, build its matrix cache (dense sizes)
+    once in the parent, and compute the Hilbert reference length.
+    """
+    path = synthetic_instance(n, kind, seed, directory)
+    matrix_free = n > matrix_free_above
+    tsp = load_tsp(path, matrix_free=matrix_free)
+
+    return {
+        "name": tsp.name,
+        "path": path,
+        "n": n,
+        "kind": kind,
+        "seed": seed,
+        "matrix_free": matrix_free,
+        "reference_length": hilbert_tour_length(tsp.coords),
+    }
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# --------------------------------------------------
+# Main
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scaling benchmark of GA strategies on synthetic instances"
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument(
+        "--kinds", nargs="+", default=list(INSTANCE_KINDS),
+        choices=list(INSTANCE_KINDS),
+    )
+    parser.add_argument(
+        "--strategies", nargs="+", default=list(STRATEGIES),
+        choices=list(STRATEGIES),
+    )
+    parser.add_argument("--pop_sizes", nargs="+", type=int, default=POP_SIZES)
+    parser.add_argument("--workers", nargs="+", type=int, default=WORKERS)
+    parser.add_argument(
+        "--time_budget", type=float, default=TIME_BUDGET,
+        help="Seconds per run (checked between generations; a generation "
+             "still running after --grace more seconds is interrupted)"
+    )
+    parser.add_argument("--grace", type=float, default=GRACE)
+    parser.add_argument(
+        "--kill_after", type=float, default=KILL_AFTER,
+        help="Kill children still running this long after the budget"
+    )
+    parser.add_argument(
+        "--target_factors", nargs="+", type=float, default=TARGET_FACTORS
+    )
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument(
+        "--matrix_free_above", type=int, default=MATRIX_FREE_ABOVE
+    )
+    parser.add_argument(
+        "--instance_dir", default=os.path.join(BENCH_ROOT, "instances")
+    )
+    parser.add_argument(
+        "--out", default=os.path.join(BENCH_ROOT, "scaling.json")
+    )
+    args = parser.parse_args(argv)
+
+    settings = {
+        "time_budget": args.time_budget,
+        "grace": args.grace,
+        "kill_after": args.kill_after,
+        "target_factors": args.target_factors,
+        "seed": args.seed,
+    }
+
+    report = {
+        "environment": environment(),
+        "settings": {**settings, "matrix_free_above": args.matrix_free_above},
+        "instances": [],
+        "results": [],
+    }
+
+    for kind in args.kinds:
+        for n in args.sizes:
+            instance = prepare_instance(
+                n, kind, args.seed, args.instance_dir, args.matrix_free_above
+            )
+            report["instances"].append(instance)
+
+            for strategy_name in args.strategies:
+                for pop_size in args.pop_sizes:
+                    for workers in args.workers:
+                        cell = bench_cell(
+                            instance, strategy_name, pop_size, workers, settings
+                        )
+                        report["results"].append(cell)
+
+                        # easiest target in the console line, all in the report
+                        ttt = cell["time_to_target"]
+                        easiest = max(ttt, key=float) if ttt else None
+                        print(
+                            f"{instance['name']:<18} {strategy_name:<15} "
+                            f"pop={pop_size:<4} w={workers:<2} "
+                            f"gen/s={cell['gens_per_sec']:9.2f} "
+                            f"eval/s={cell['evals_per_sec']:11.1f} "
+                            f"rss={cell['peak_rss_mb']:8.1f}MB "
+                            f"truncated={cell['truncated']}/{workers} "
+                            f"ttt[{easiest}x]={ttt[easiest]['median'] if easiest else None}"
+                        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    tmp_path = f"{args.out}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, args.out)
+    print(f"[Saved] {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# benchmarks/reference.py
+#
+# Frozen reference implementations of the GA hot paths.
+# 这些是最初的逐元素实现，只用作正确性基准：任何加速版本在相同随机种子下
+# 必须给出相同结果。不要在这里做优化。
+#
+# 例外：pmx_crossover 是修正后的参考实现，不是最初的版本。最初的实现在
+# 修复阶段也改写交换段，会产生非法路径，映射成环时死循环；这里只修复
+# 交换段以外的基因（与 ga/operators/crossover.py 中的修正一致）。
+
+import numpy as np
+
+
+# --------------------------------------------------
+# Fitness evaluation
+# --------------------------------------------------
+
+def evaluate_population(population, distance_matrix):
+    pop_size = len(population)
+    lengths = np.zeros(pop_size)
+
+    for i, individual in enumerate(population):
+        length = 0.0
+        for j in range(len(individual)):
+            a = individual[j]
+            b = individual[(j + 1) % len(individual)]
+            length += distance_matrix[a][b]
+        lengths[i] = length
+
+    fitness = 1.0 / (lengths + 1e-12)
+    return fitness, lengths
+
+
+# --------------------------------------------------
+# Crossover
+# --------------------------------------------------
+
+def order_crossover(p1, p2):
+    size = len(p1)
+
+    a, b = sorted(np.random.choice(size, 2, replace=False))
+
+    c1 = [-1] * size
+    c2 = [-1] * size
+
+    c1[a:b] = p1[a:b]
+    c2[a:b] = p2[a:b]
+
+    def fill(child, parent):
+        pos = b
+        for gene in parent:
+            if gene not in child:
+                if pos >= size:
+                    pos = 0
+                child[pos] = gene
+                pos += 1
+
+    fill(c1, p2)
+    fill(c2, p1)
+
+    return np.array(c1), np.array(c2)
+
+
+def pmx_crossover(p1, p2):
+    # corrected reference (see header): repair outside the segment only
+    size = len(p1)
+    a, b = sorted(np.random.choice(size, 2, replace=False))
+
+    c1 = p1.copy()
+    c2 = p2.copy()
+
+    mapping1 = {}
+    mapping2 = {}
+
+    for i in range(a, b):
+        c1[i], c2[i] = c2[i], c1[i]
+        mapping1[c1[i]] = c2[i]
+        mapping2[c2[i]] = c1[i]
+
+    # only genes outside the swapped segment are repaired; the mapping
+    # chains are acyclic there, so the loop terminates
+    def repair(child, mapping):
+        for i in list(range(0, a)) + list(range(b, size)):
+            while child[i] in mapping:
+                child[i] = mapping[child[i]]
+
+    repair(c1, mapping1)
+    repair(c2, mapping2)
+
+    return c1, c2
+
+
+# --------------------------------------------------
+# Mutation
+# --------------------------------------------------
+
+def mutate(individual, pm, method="swap"):
+    if np.random.rand() >= pm:
+        return individual.copy()
+
+    ind = individual.copy()
+    if method == "swap":
+        i, j = np.random.choice(len(ind), 2, replace=False)
+        ind[i], ind[j] = ind[j], ind[i]
+    elif method == "inversion":
+        i, j = sorted(np.random.choice(len(ind), 2, replace=False))
+        ind[i:j] = ind[i:j][::-1]
+    else:
+        raise ValueError(f"Unknown mutation method: {method}")
+    return ind
+
+
+# --------------------------------------------------
+# Selection
+# --------------------------------------------------
+
+def select(fitness, method="roulette", num_selected=None):
+    fitness = np.asarray(fitness)
+    if num_selected is None:
+        num_selected = len(fitness)
+
+    fitness = fitness - fitness.min() + 1e-12
+    probs = fitness / fitness.sum()
+    cum_probs = np.cumsum(probs)
+
+    if method == "roulette":
+        r = np.random.rand(num_selected)
+    elif method == "sus":
+        step = 1.0 / num_selected
+        start = np.random.rand() * step
+        r = start + step * np.arange(num_selected)
+    else:
+        raise ValueError(f"Unknown selection method: {method}")
+
+    return np.searchsorted(cum_probs, r)
+
+
+# --------------------------------------------------
+# Diversity
+# --------------------------------------------------
+
+def compute_population_diversity(population):
+    edge_set = set()
+    total_edges = 0
+
+    for ind in population:
+        n = len(ind)
+        for i in range(n):
+            a = ind[i]
+            b = ind[(i + 1) % n]
+            edge = tuple(sorted((a, b)))
+            edge_set.add(edge)
+            total_edges += 1
+
+    if total_edges == 0:
+        return 0.0
+
+    return len(edge_set) / total_edges
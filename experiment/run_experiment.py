@@ -1,22 +1,45 @@
 # experiment/run_experiment.py
 
+import argparse
+import functools
+import glob
+import hashlib
+import inspect
 import json
 import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+# --------------------------------------------------
+# Fix import path
+# --------------------------------------------------
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+sys.path.insert(0, PROJECT_ROOT)
+
 from ga.engine import GAEngine
+from ga.metrics_exporter import serve_metrics
+from ga.run_log import read_run_log
 from ga.strategies.classic import ClassicGAStrategy
 from ga.strategies.classic_sus import ClassicSUSGAStrategy
 from ga.strategies.semi_adaptive import SemiAdaptiveGAStrategy
 from ga.strategies.adaptive import AdaptiveGAStrategy
-from utils.tsp_loader import load_tsp
+from ga.strategies.bandit import BanditGAStrategy
+from utils.result_store import convert_results
+from utils.run_catalog import catalog_path, open_catalog, rebuild_catalog
+from utils.tsp_loader import file_hash, load_tsp
 
 # --------------------------------------------------
-# Global experiment configuration
+# Global experiment configuration (CLI defaults)
 # --------------------------------------------------
 
-TSP_PATH = "../data/ch130.tsp"
-RESULT_ROOT = "../experiment_results/experiments"
+TSP_PATH = os.path.join(PROJECT_ROOT, "data", "ch130.tsp")
+RESULT_ROOT = os.path.join(PROJECT_ROOT, "experiment_results", "experiments")
+# finished runs keyed by fingerprint, shared by every result root
+RUN_CACHE = os.path.join(PROJECT_ROOT, "experiment_results", "run_cache")
 
 POP_SIZE = 100
 MAX_GENERATIONS = 500
@@ -41,81 +64,501 @@ adaptive_config = {
     "max_generations": MAX_GENERATIONS
 }
 
+bandit_config = {
+    "pc": 0.9,
+    "pm": 0.2,
+    "selection_method": "roulette",
+    "bandit_discount": 0.9,
+    "bandit_min_probability": 0.05
+}
+
+# name -> (strategy class, config); 每次 run 都新建 strategy
+STRATEGIES = {
+    "ClassicGA": (ClassicGAStrategy, classic_config),
+    "ClassicGA_SUS": (ClassicSUSGAStrategy, classic_config),
+    "SemiAdaptiveGA": (SemiAdaptiveGAStrategy, {
+        **adaptive_config,
+        "selection_method": "roulette"
+    }),
+    "AdaptiveGA": (AdaptiveGAStrategy, adaptive_config),
+    "BanditGA": (BanditGAStrategy, bandit_config),
+}
+
+
+def build_strategy(strategy_name, overrides=None):
+    """
+    Fresh strategy instance for one run.
+    """
+    strategy_cls, config = STRATEGIES[strategy_name]
+    return strategy_cls({**config, **(overrides or {})})
+
+
+def run_config(strategy_name, settings):
+    """
+    Everything that determines a run besides its seed (catalog config).
+    """
+    strategy_cls, config = STRATEGIES[strategy_name]
+    return {
+        "strategy_class": strategy_cls.__name__,
+        "strategy_config": config,
+        "pop_size": settings["pop_size"],
+        "generations": settings["generations"],
+        "elite_size": settings["elite_size"],
+        # budgets change results; only recorded when set so that
+        # fingerprints of unbudgeted runs stay the same
+        **{
+            key: settings[key]
+            for key in ("time_limit", "max_evaluations")
+            if settings.get(key) is not None
+        },
+    }
+
+
+# --------------------------------------------------
+# Fingerprints
+# --------------------------------------------------
+
+# code every run may depend on (whole ga/ and utils/ packages, so a new
+# module imported by the engine cannot be missed), plus the strategy's
+# own class hierarchy; other strategies' files are left out
+_SHARED_SOURCES = (
+    "ga/*.py",
+    "ga/operators/*.py",
+    "utils/*.py",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(strategy_cls):
+    """
+    SHA-1 over the source of ga/ (engine, operators, schedules, run
+    log), utils/ and the strategy's class hierarchy. Editing one
+    strategy leaves the other strategies' fingerprints (and cached
+    runs) untouched.
+    """
+    files = set()
+    for pattern in _SHARED_SOURCES:
+        files.update(glob.glob(os.path.join(PROJECT_ROOT, pattern)))
+    for cls in strategy_cls.__mro__:
+        if cls.__module__.startswith("ga."):
+            files.add(inspect.getsourcefile(cls))
+
+    h = hashlib.sha1()
+    for path in sorted(os.path.abspath(f) for f in files):
+        h.update(os.path.relpath(path, PROJECT_ROOT).encode("utf-8"))
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def run_fingerprint(strategy_name, run_id, settings):
+    """
+    Deterministic key of one run: instance content, strategy class and
+    config, engine parameters, seed and code version. Two runs with the
+    same fingerprint produce the same result, except under time_limit:
+    the generations completed then depend on the machine and its load.
+    """
+    strategy_cls, _ = STRATEGIES[strategy_name]
+    key = {
+        "instance": settings["instance_hash"],
+        "config": run_config(strategy_name, settings),
+        "seed": settings["seed"] + run_id,
+        "code": code_version(strategy_cls),
+    }
+    text = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def cached_run_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, fingerprint[:2], f"{fingerprint}.json")
+
+
 # --------------------------------------------------
 # Utility
 # --------------------------------------------------
 
 def ensure_dir(path):
     if not os.path.exists(path):
-        os.makedirs(path)
+        os.makedirs(path, exist_ok=True)
+
+
+def write_json_atomic(filepath, data):
+    ensure_dir(os.path.dirname(filepath))
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=float)
+    os.replace(tmp_path, filepath)
 
 
-def save_run_log(strategy_name, run_id, log_data):
-    strategy_dir = os.path.join(RESULT_ROOT, strategy_name)
-    ensure_dir(strategy_dir)
+def run_log_path(result_root, strategy_name, run_id):
+    return os.path.join(result_root, strategy_name, f"run_{run_id:03d}.json")
 
-    filename = f"run_{run_id:03d}.json"
-    filepath = os.path.join(strategy_dir, filename)
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(log_data, f, indent=2)
+def save_run_log(strategy_name, run_id, log_data, result_root=RESULT_ROOT):
+    """
+    Write a run log atomically (temp file + rename): a run killed while
+    saving leaves no partial file, so it is simply re-run on resume.
+    """
+    filepath = run_log_path(result_root, strategy_name, run_id)
+    write_json_atomic(filepath, log_data)
 
     print(f"[Saved] {filepath}")
+    return filepath
+
+
+# --------------------------------------------------
+# Worker
+# --------------------------------------------------
+
+# per-process instance; the distance matrix itself is a read-only memmap
+# of the shared .npy cache, so workers share it through the page cache
+_WORKER_TSP = None
+
+
+def _init_worker(tsp_path):
+    global _WORKER_TSP
+    _WORKER_TSP = load_tsp(tsp_path)
+
+
+def worker_tsp(tsp_path):
+    """
+    The worker's TSPInstance, loaded on first use.
+    """
+    if _WORKER_TSP is None:
+        _init_worker(tsp_path)
+    return _WORKER_TSP
+
+
+def worker_metrics(settings):
+    """
+    This process's metrics exporter, or None when metrics are off.
+    Parallel workers bind successive ports from the base port, or one
+    Unix socket each (suffixed with the pid).
+    """
+    metrics = settings.get("metrics")
+    if not metrics:
+        return None
+
+    unix_socket = metrics.get("socket")
+    if unix_socket and metrics["workers"] > 1:
+        unix_socket = f"{unix_socket}.{os.getpid()}"
+    return serve_metrics(
+        port=metrics.get("port") or 0,
+        host=metrics.get("host", "127.0.0.1"),
+        unix_socket=unix_socket,
+        port_tries=metrics["workers"] + 1,
+    )
+
+
+def run_single(strategy_name, run_id, settings):
+    """
+    Execute one (strategy, run_id) cell of the grid, save its log and
+    add it to the result root's run catalog and the run cache.
+
+    History is streamed to run_XXX.jsonl while the run is in progress
+    (nothing is kept in memory), then rebuilt into the final JSON log;
+    the stream file is removed once the JSON is in place.
+
+    Returns
+    -------
+    (strategy_name, run_id, best_length, runtime, path)
+    """
+    tsp = worker_tsp(settings["tsp_path"])
+    stream_path = run_log_path(
+        settings["result_root"], strategy_name, run_id
+    ) + "l"
+
+    # the instance itself: packed / matrix-free distance providers,
+    # k-NN lists and the translation of renumbered tours come with it
+    engine = GAEngine(
+        tsp=tsp,
+        strategy=build_strategy(strategy_name),
+        pop_size=settings["pop_size"],
+        max_generations=settings["generations"],
+        elite_size=settings["elite_size"],
+        seed=settings["seed"] + run_id,
+        verbose=settings["verbose"],
+        log_path=stream_path,
+        keep_history=False,
+        time_limit=settings.get("time_limit"),
+        max_evaluations=settings.get("max_evaluations"),
+        metrics=worker_metrics(settings),
+        metrics_labels={"run_id": run_id},
+    )
+
+    # Attach metadata (written as the first record of the stream)
+    engine.logs["meta"].update({
+        "strategy": strategy_name,
+        "run_id": run_id,
+        "timestamp": datetime.now().isoformat(),
+        "tsp": tsp.name,
+        "num_cities": tsp.num_cities,
+        "seed": settings["seed"] + run_id,
+        "config": run_config(strategy_name, settings),
+        "fingerprint": run_fingerprint(strategy_name, run_id, settings),
+    })
+
+    engine.run()
+    logs = read_run_log(stream_path)
+
+    path = save_run_log(
+        strategy_name, run_id, logs, settings["result_root"]
+    )
+    os.remove(stream_path)
+
+    if settings.get("cache_dir"):
+        write_json_atomic(
+            cached_run_path(settings["cache_dir"], logs["meta"]["fingerprint"]),
+            logs,
+        )
+
+    with open_catalog(settings["result_root"]) as catalog:
+        catalog.record_run(logs, path=path)
+
+    return strategy_name, run_id, logs["best_length"], logs["runtime"], path
+
+
+def reuse_cached_run(strategy_name, run_id, settings):
+    """
+    Copy a cached run with the same fingerprint into the result root
+    instead of recomputing it. Returns None on a cache miss.
+    """
+    if not settings.get("cache_dir"):
+        return None
+
+    fingerprint = run_fingerprint(strategy_name, run_id, settings)
+    cached = cached_run_path(settings["cache_dir"], fingerprint)
+    if not os.path.exists(cached):
+        return None
+
+    with open(cached, "r", encoding="utf-8") as f:
+        logs = json.load(f)
+    logs["meta"].update({
+        "strategy": strategy_name,
+        "run_id": run_id,
+        "reused_at": datetime.now().isoformat(),
+    })
+
+    path = save_run_log(
+        strategy_name, run_id, logs, settings["result_root"]
+    )
+    with open_catalog(settings["result_root"]) as catalog:
+        catalog.record_run(logs, path=path)
+
+    return strategy_name, run_id, logs["best_length"], logs["runtime"], path
 
 
 # --------------------------------------------------
-# Main experiment loop
+# Grid scheduling
 # --------------------------------------------------
 
-def main():
-    tsp = load_tsp(TSP_PATH)
-    distance_matrix = tsp.distance_matrix
+def pending_runs(strategy_names, n_runs, settings):
+    """
+    (strategy, run_id) pairs not in the catalog under their current
+    fingerprint: missing runs, and runs produced by a different config,
+    instance or code version (these are recomputed and overwritten).
+
+    Runs saved before fingerprints existed (fingerprint NULL) count as
+    done, as they always did, unless settings["force"] is set.
+    """
+    force = settings.get("force", False)
+    tasks = []
+    with open_catalog(settings["result_root"]) as catalog:
+        for strategy_name in strategy_names:
+            done = catalog.fingerprints(strategy_name)
+            for run_id in range(1, n_runs + 1):
+                if run_id in done and done[run_id] is None and not force:
+                    continue
+                expected = run_fingerprint(strategy_name, run_id, settings)
+                if done.get(run_id) != expected:
+                    tasks.append((strategy_name, run_id))
+    return tasks
+
+
+def run_grid(strategy_names, settings, n_runs, workers):
+    """
+    Run the strategy x seed grid on a process pool, skipping finished
+    runs. Interrupting the grid (Ctrl-C / kill) loses at most the runs
+    in flight; calling it again resumes where it stopped.
 
-    # 每次 run 都新建 strategy
-    strategy_factories = [
-        ("ClassicGA", lambda: ClassicGAStrategy(classic_config.copy())),
-        ("ClassicGA_SUS", lambda: ClassicSUSGAStrategy(classic_config.copy())),
-        ("SemiAdaptiveGA", lambda: SemiAdaptiveGAStrategy({
-            **adaptive_config,
-            "selection_method": "roulette"
-        })),
-        ("AdaptiveGA", lambda: AdaptiveGAStrategy(adaptive_config.copy())),
-    ]
+    Runs whose fingerprint is found in settings["cache_dir"] are copied
+    from the cache instead of being recomputed.
+    """
+    ensure_dir(settings["result_root"])
+    settings = {
+        **settings,
+        "instance_hash": file_hash(settings["tsp_path"]),
+    }
 
-    ensure_dir(RESULT_ROOT)
+    # index results written before the catalog existed
+    if not os.path.exists(catalog_path(settings["result_root"])):
+        rebuild_catalog(settings["result_root"])
 
-    for strategy_name, strategy_factory in strategy_factories:
-        print("=" * 60)
-        print(f"Running strategy: {strategy_name}")
-        print("=" * 60)
+    tasks = pending_runs(strategy_names, n_runs, settings)
+    total = len(strategy_names) * n_runs
+    print(f"[Grid] {total - len(tasks)}/{total} runs done, {len(tasks)} pending")
 
-        for run_id in range(1, N_RUNS + 1):
-            print(f"[Run {run_id}/{N_RUNS}]")
+    results = []
+    remaining = []
+    for name, run_id in tasks:
+        reused = reuse_cached_run(name, run_id, settings)
+        if reused is None:
+            remaining.append((name, run_id))
+        else:
+            results.append(reused[:4])
+    if results:
+        print(f"[Grid] {len(results)} runs reused from cache")
+    tasks = remaining
 
-            # 🔑 每次 run 都创建全新实例
-            strategy = strategy_factory()
+    if not tasks:
+        return results
 
-            engine = GAEngine(
-                distance_matrix=distance_matrix,
-                strategy=strategy,
-                pop_size=POP_SIZE,
-                max_generations=MAX_GENERATIONS,
-                elite_size=ELITE_SIZE,
-                seed=SEED + run_id
+    # build (or validate) the memmap cache once, before forking workers
+    load_tsp(settings["tsp_path"])
+
+    if workers <= 1:
+        results.extend(
+            run_single(name, run_id, settings)[:4] for name, run_id in tasks
+        )
+        return results
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(settings["tsp_path"],),
+    )
+    try:
+        futures = [
+            pool.submit(run_single, name, run_id, settings)
+            for name, run_id in tasks
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            name, run_id, best_length, runtime, _ = future.result()
+            results.append((name, run_id, best_length, runtime))
+            print(
+                f"[{done}/{len(tasks)}] {name} run {run_id}: "
+                f"best={best_length:.2f} ({runtime:.1f}s)"
             )
+    except KeyboardInterrupt:
+        print("[Grid] Interrupted, cancelling pending runs")
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+    return results
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+# --------------------------------------------------
+# Main
+# --------------------------------------------------
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the GA strategy x seed experiment grid"
+    )
+    parser.add_argument("--tsp", default=TSP_PATH)
+    parser.add_argument("--out", default=RESULT_ROOT)
+    parser.add_argument("--runs", type=int, default=N_RUNS)
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        default=list(STRATEGIES),
+        choices=list(STRATEGIES),
+    )
+    parser.add_argument("--pop_size", type=int, default=POP_SIZE)
+    parser.add_argument("--generations", type=int, default=MAX_GENERATIONS)
+    parser.add_argument("--elite_size", type=int, default=ELITE_SIZE)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument(
+        "--time_limit",
+        type=float,
+        default=None,
+        help="Wall-clock budget per run in seconds (generations becomes "
+             "an upper bound)"
+    )
+    parser.add_argument(
+        "--max_evaluations",
+        type=int,
+        default=None,
+        help="Tour-evaluation budget per run"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (1 = run in this process)"
+    )
+    parser.add_argument("--quiet", action="store_true")
+    parser.add_argument(
+        "--cache_dir",
+        default=RUN_CACHE,
+        help="Fingerprint-keyed cache of finished runs"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Also recompute runs saved without a fingerprint"
+    )
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Neither reuse nor fill the run cache"
+    )
+    parser.add_argument(
+        "--metrics_port",
+        type=int,
+        default=None,
+        help="Serve live Prometheus metrics on this port (workers use the "
+             "following ports)"
+    )
+    parser.add_argument(
+        "--metrics_socket",
+        default=None,
+        help="Serve live metrics on this Unix socket instead of a port"
+    )
+    parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="Pack each strategy's run logs into runs.npz after the grid"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # treat kill (SIGTERM) like Ctrl-C: stop scheduling, keep finished runs
+    signal.signal(signal.SIGTERM, _raise_interrupt)
 
-            best_individual, logs = engine.run(verbose=True)
+    settings = {
+        "tsp_path": os.path.abspath(args.tsp),
+        "result_root": os.path.abspath(args.out),
+        "pop_size": args.pop_size,
+        "generations": args.generations,
+        "elite_size": args.elite_size,
+        "seed": args.seed,
+        "time_limit": args.time_limit,
+        "max_evaluations": args.max_evaluations,
+        "verbose": not args.quiet and args.workers <= 1,
+        "cache_dir": None if args.no_cache else os.path.abspath(args.cache_dir),
+        "force": args.force,
+        "metrics": None,
+    }
+    if args.metrics_port is not None or args.metrics_socket:
+        settings["metrics"] = {
+            "port": args.metrics_port,
+            "socket": args.metrics_socket,
+            "workers": args.workers,
+        }
 
-            # Attach metadata
-            logs["meta"].update({
-                "strategy": strategy_name,
-                "run_id": run_id,
-                "timestamp": datetime.now().isoformat(),
-                "tsp": tsp.name,
-                "num_cities": tsp.num_cities
-            })
+    run_grid(args.strategies, settings, args.runs, args.workers)
 
-            save_run_log(strategy_name, run_id, logs)
+    if args.pack:
+        convert_results(settings["result_root"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,327 @@
+# experiment/sweep.py
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# --------------------------------------------------
+# Fix import path
+# --------------------------------------------------
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+sys.path.insert(0, PROJECT_ROOT)
+
+from experiment.run_experiment import (
+    SEED,
+    STRATEGIES,
+    TSP_PATH,
+    _init_worker,
+    build_strategy,
+    ensure_dir,
+    worker_tsp,
+)
+from ga.engine import GAEngine
+from utils.tsp_loader import load_tsp
+
+SWEEP_ROOT = os.path.join(PROJECT_ROOT, "experiment_results", "sweeps")
+
+# --------------------------------------------------
+# Search space
+# --------------------------------------------------
+# list                      -> categorical (grid axis)
+# {"uniform": [lo, hi]}     -> float
+# {"loguniform": [lo, hi]}  -> float, log scale
+# {"int": [lo, hi]}         -> integer, inclusive
+#
+# Dotted keys address nested strategy config ("pc.min" -> config["pc"]["min"]);
+# ENGINE_PARAMS go to GAEngine instead of the strategy.
+
+SEARCH_SPACE = {
+    "pc.min": {"uniform": [0.3, 0.7]},
+    "pc.max": {"uniform": [0.8, 1.0]},
+    "pm.min": {"loguniform": [0.005, 0.05]},
+    "pm.max": {"uniform": [0.1, 0.5]},
+    "stagnation_threshold": [10, 20, 30, 50],
+    "pop_size": [50, 100, 200],
+    "elite_size": [1, 2, 5],
+}
+
+ENGINE_PARAMS = ("pop_size", "elite_size")
+
+
+def sample_candidates(space, n_candidates=None, seed=None):
+    """
+    Candidate parameter sets.
+
+    A space made only of lists is expanded to the full grid when
+    n_candidates is None; otherwise n_candidates points are sampled.
+    """
+    keys = list(space)
+
+    if n_candidates is None:
+        if not all(isinstance(space[k], list) for k in keys):
+            raise ValueError("Continuous search spaces need n_candidates")
+        return [
+            dict(zip(keys, values))
+            for values in itertools.product(*(space[k] for k in keys))
+        ]
+
+    rng = np.random.default_rng(seed)
+    candidates = []
+    for _ in range(n_candidates):
+        params = {}
+        for key in keys:
+            spec = space[key]
+            if isinstance(spec, list):
+                params[key] = spec[rng.integers(len(spec))]
+            elif "uniform" in spec:
+                lo, hi = spec["uniform"]
+                params[key] = float(rng.uniform(lo, hi))
+            elif "loguniform" in spec:
+                lo, hi = spec["loguniform"]
+                params[key] = float(np.exp(rng.uniform(np.log(lo), np.log(hi))))
+            elif "int" in spec:
+                lo, hi = spec["int"]
+                params[key] = int(rng.integers(lo, hi + 1))
+            else:
+                raise ValueError(f"Unknown distribution for {key}: {spec}")
+        candidates.append(params)
+    return candidates
+
+
+def split_params(params):
+    """
+    (strategy config overrides, engine kwargs) for one candidate.
+    """
+    overrides = {}
+    engine_kwargs = {}
+
+    for key, value in params.items():
+        if key in ENGINE_PARAMS:
+            engine_kwargs[key] = value
+        elif "." in key:
+            outer, inner = key.split(".", 1)
+            overrides.setdefault(outer, {})[inner] = value
+        else:
+            overrides[key] = value
+
+    return overrides, engine_kwargs
+
+
+def merge_overrides(strategy_name, overrides):
+    """
+    Merge nested overrides into the strategy's base config, keeping
+    min <= max for bounded parameters.
+    """
+    _, base = STRATEGIES[strategy_name]
+    merged = {}
+    for key, value in overrides.items():
+        if isinstance(value, dict):
+            current = base.get(key)
+            if not isinstance(current, dict):
+                current = {"min": current, "max": current}
+            value = {**current, **value}
+            if "min" in value and "max" in value and value["min"] > value["max"]:
+                value["min"], value["max"] = value["max"], value["min"]
+        merged[key] = value
+    return merged
+
+
+# --------------------------------------------------
+# Evaluation (worker side)
+# --------------------------------------------------
+
+def evaluate_candidate(strategy_name, params, generations, seed, tsp_path):
+    """
+    Best tour length of one candidate under one seed and budget.
+    """
+    tsp = worker_tsp(tsp_path)
+    overrides, engine_kwargs = split_params(params)
+    overrides = merge_overrides(strategy_name, overrides)
+    overrides["max_generations"] = generations
+
+    engine = GAEngine(
+        distance_matrix=tsp.distance_matrix,
+        strategy=build_strategy(strategy_name, overrides),
+        pop_size=engine_kwargs.get("pop_size", 100),
+        elite_size=engine_kwargs.get("elite_size", 1),
+        max_generations=generations,
+        seed=seed,
+        verbose=False,
+    )
+    _, logs = engine.run()
+    return float(logs["best_length"])
+
+
+# --------------------------------------------------
+# Successive halving
+# --------------------------------------------------
+
+def successive_halving(
+    strategy_name,
+    candidates,
+    tsp_path,
+    min_generations=50,
+    max_generations=500,
+    eta=3,
+    n_seeds=3,
+    seed=SEED,
+    workers=1,
+):
+    """
+    Successive halving over candidates.
+
+    Every rung evaluates the surviving candidates with the same seeds
+    (common random numbers) at the rung's generation budget, then keeps
+    the best 1/eta of them; the budget grows by eta per rung until
+    max_generations or a single survivor remains.
+
+    Returns
+    -------
+    dict
+        {"rungs": [...], "best": {"params", "score", "generations"}}
+    """
+    seeds = [seed + i for i in range(n_seeds)]
+    survivors = list(range(len(candidates)))
+    budget = min_generations
+    rungs = []
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(tsp_path,),
+        )
+
+    try:
+        while True:
+            jobs = [(i, s) for i in survivors for s in seeds]
+            args = [
+                (strategy_name, candidates[i], budget, s, tsp_path)
+                for i, s in jobs
+            ]
+            if pool is None:
+                lengths = [evaluate_candidate(*a) for a in args]
+            else:
+                lengths = list(pool.map(evaluate_candidate, *zip(*args)))
+
+            scores = {i: [] for i in survivors}
+            for (i, _), length in zip(jobs, lengths):
+                scores[i].append(length)
+            mean_scores = {i: float(np.mean(v)) for i, v in scores.items()}
+
+            ranked = sorted(survivors, key=mean_scores.get)
+            rungs.append({
+                "generations": budget,
+                "candidates": [
+                    {
+                        "index": i,
+                        "params": candidates[i],
+                        "score": mean_scores[i],
+                        "lengths": scores[i],
+                    }
+                    for i in ranked
+                ],
+            })
+            print(
+                f"[Rung {len(rungs)}] gens={budget} "
+                f"candidates={len(ranked)} best={mean_scores[ranked[0]]:.2f}"
+            )
+
+            if len(ranked) <= 1 or budget >= max_generations:
+                break
+
+            survivors = ranked[:max(1, math.ceil(len(ranked) / eta))]
+            budget = min(budget * eta, max_generations)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best = rungs[-1]["candidates"][0]
+    return {
+        "rungs": rungs,
+        "best": {
+            "params": best["params"],
+            "score": best["score"],
+            "generations": rungs[-1]["generations"],
+        },
+    }
+
+
+# --------------------------------------------------
+# Main
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Hyperparameter sweep with successive halving"
+    )
+    parser.add_argument("--tsp", default=TSP_PATH)
+    parser.add_argument(
+        "--strategy", default="AdaptiveGA", choices=list(STRATEGIES)
+    )
+    parser.add_argument(
+        "--space",
+        default=None,
+        help="JSON file with the search space (default: SEARCH_SPACE)"
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=27,
+        help="Sampled candidates (0 = full grid of a list-only space)"
+    )
+    parser.add_argument("--min_generations", type=int, default=50)
+    parser.add_argument("--max_generations", type=int, default=500)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    space = SEARCH_SPACE
+    if args.space:
+        with open(args.space, "r", encoding="utf-8") as f:
+            space = json.load(f)
+
+    candidates = sample_candidates(
+        space, args.candidates or None, seed=args.seed
+    )
+    print(f"[Sweep] {args.strategy}: {len(candidates)} candidates")
+
+    tsp_path = os.path.abspath(args.tsp)
+    load_tsp(tsp_path)  # build the shared matrix cache once
+
+    report = successive_halving(
+        args.strategy,
+        candidates,
+        tsp_path,
+        min_generations=args.min_generations,
+        max_generations=args.max_generations,
+        eta=args.eta,
+        n_seeds=args.seeds,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    report.update({"strategy": args.strategy, "space": space})
+
+    out = args.out or os.path.join(SWEEP_ROOT, f"sweep_{args.strategy}.json")
+    ensure_dir(os.path.dirname(out))
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"[Best] {report['best']['params']} -> {report['best']['score']:.2f}")
+    print(f"[Saved] {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@
 import time
 import numpy as np
 
+from ga.operators.metrics import EdgeCounter
+from ga.run_log import RunLogWriter
+from utils.distance import DistanceProvider
+
 
 class GAEngine:
     """
@@ -14,6 +18,51 @@ class GAEngine:
     - generations / max_generations
     - elite_size
     - run(verbose=...)
+
+    Modes:
+    - "generational": the strategy rebuilds the whole population
+      every generation (default).
+    - "steady_state": only offspring_per_step children are bred and
+      inserted per step, replacing the worst individuals
+      (replacement="worst") or the loser of a random tournament
+      (replacement="tournament"). One logged generation equals
+      population_size // offspring_per_step steps, so the evaluation
+      budget matches the generational mode.
+
+    Streaming logs:
+    - log_path: history rows are streamed to an append-only JSONL file
+      by a background writer (see ga.run_log), so a crash keeps every
+      recorded generation.
+    - keep_history=False: rows are only streamed, not kept in memory.
+
+    Time / evaluation budget:
+    - time_limit (seconds): the run stops after the first generation
+      that ends past the limit; generations is then only an upper bound.
+      generations_run holds the number of generations completed.
+    - max_evaluations: same, on the number of tours evaluated by the
+      loop (initial population included; evaluations holds the count).
+    - budget_used() is the largest fraction consumed of generations,
+      time_limit and max_evaluations; the strategy receives it through
+      set_budget() before every evolve() / steady-state step, so
+      budget-scheduled parameters (ga.schedule) follow the real budget.
+      Scheduled strategies also log budget_used and the scheduled
+      values in the history.
+    - After the loop the last population updates the best tour (skipped
+      once max_evaluations is spent); an improvement found there is
+      logged as a "final_best" event, since no history row holds it.
+
+    City ids:
+    - with a renumbered instance (load_tsp(renumber="hilbert")) the
+      loop works in internal ids: population and best_individual hold
+      internal ids. The tour returned by run() is in source-file ids,
+      as are best_tour and logs["best_individual"]; use
+      tsp.to_original() to translate anything else.
+
+    Live metrics:
+    - metrics: a ga.metrics_exporter.MetricsExporter; the generation
+      count and rate, best / mean length, diversity, pc / pm and the
+      cumulative phase timings (phase_seconds) are published after
+      every generation, labelled with strategy, tsp and metrics_labels.
     """
 
     def __init__(
@@ -28,6 +77,17 @@ class GAEngine:
         elite_size=None,
         seed=None,
         verbose=True,
+        mode="generational",
+        offspring_per_step=2,
+        replacement="worst",
+        tournament_size=3,
+        neighbors=None,
+        log_path=None,
+        keep_history=True,
+        time_limit=None,
+        max_evaluations=None,
+        metrics=None,
+        metrics_labels=None,
     ):
         # --------------------------------------------------
         # Basic checks
@@ -43,12 +103,20 @@ class GAEngine:
         # --------------------------------------------------
         # TSP / distance matrix compatibility
         # --------------------------------------------------
+        # (matrix-free instances pass their DistanceProvider instead)
+        self.tsp = tsp
         if tsp is not None:
-            self.distance_matrix = np.asarray(tsp.distance_matrix)
+            if tsp.distance_matrix is None:
+                self.distance_matrix = tsp.distance
+            else:
+                self.distance_matrix = np.asarray(tsp.distance_matrix)
             self.n_cities = tsp.num_cities
             self.tsp_name = tsp.name
         else:
-            self.distance_matrix = np.asarray(distance_matrix)
+            if isinstance(distance_matrix, DistanceProvider):
+                self.distance_matrix = distance_matrix
+            else:
+                self.distance_matrix = np.asarray(distance_matrix)
             self.n_cities = self.distance_matrix.shape[0]
             self.tsp_name = "Unknown-TSP"
 
@@ -80,14 +148,60 @@ class GAEngine:
         self.strategy = strategy
         self.verbose = verbose
 
+        # --------------------------------------------------
+        # k-NN candidate lists (neighbourhood-guided mutation)
+        # --------------------------------------------------
+        if neighbors is None and tsp is not None:
+            neighbors = tsp.neighbors
+        if neighbors is not None and strategy.neighbors is None:
+            strategy.neighbors = np.asarray(neighbors)
+
+        # --------------------------------------------------
+        # Generational / steady-state mode
+        # --------------------------------------------------
+        if mode not in ("generational", "steady_state"):
+            raise ValueError(f"Unknown GA mode: {mode}")
+        if replacement not in ("worst", "tournament"):
+            raise ValueError(f"Unknown replacement method: {replacement}")
+
+        self.mode = mode
+        self.offspring_per_step = max(
+            1, min(int(offspring_per_step), self.population_size - 1)
+        )
+        self.replacement = replacement
+        self.tournament_size = tournament_size
+
         if seed is not None:
             np.random.seed(seed)
 
+        self.log_path = log_path
+        self.keep_history = keep_history
+        self._writer = None
+        self._n_recorded = 0
+
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0
+        self.generations_run = 0
+        self._start_time = None
+
+        self.metrics = metrics
+        self.metrics_labels = {
+            "strategy": strategy.name,
+            "tsp": self.tsp_name,
+            **(metrics_labels or {}),
+        }
+        # cumulative wall-clock seconds per phase of the loop
+        self.phase_seconds = {}
+        self._last_row = {}
+
         # --------------------------------------------------
         # Initialization
         # --------------------------------------------------
         self.population = self._init_population()
         self.best_individual = None
+        # best_individual in source-file ids, set by run()
+        self.best_tour = None
         self.best_length = np.inf
 
         # --------------------------------------------------
@@ -101,6 +215,9 @@ class GAEngine:
                 "population_size": self.population_size,
                 "generations": self.generations,
                 "elite_size": self.elite_size,
+                "mode": self.mode,
+                "time_limit": self.time_limit,
+                "max_evaluations": self.max_evaluations,
             },
             "history": {
                 "best_length": [],
@@ -111,6 +228,8 @@ class GAEngine:
                 "pm": [],
                 "selection": [],
             },
+            # strategy events (e.g. restarts), stamped with the generation
+            "events": [],
         }
 
     # --------------------------------------------------
@@ -136,19 +255,69 @@ class GAEngine:
         ----------
         verbose : bool or None
             If provided, overrides self.verbose for this run.
+
+        Returns
+        -------
+        best_tour : np.ndarray
+            In source-file city ids (self.best_individual keeps the
+            internal ids of a renumbered instance)
+        logs : dict
         """
         if verbose is not None:
             self.verbose = verbose
 
         start_time = time.time()
-
+        self._start_time = start_time
+
+        if self.log_path is not None:
+            self._writer = RunLogWriter(self.log_path)
+            self._writer.write({"type": "meta", "meta": self.logs["meta"]})
+
+        try:
+            if self.mode == "steady_state":
+                self._run_steady_state()
+            else:
+                self._run_generational()
+
+            # -------- Final logs --------
+            # renumbered instances report tours in source-file city ids
+            best_individual = self.best_individual
+            if self.tsp is not None:
+                best_individual = self.tsp.to_original(best_individual)
+
+            self.best_tour = best_individual
+            self.logs["best_individual"] = best_individual.tolist()
+            self.logs["best_length"] = self.best_length
+            self.logs["runtime"] = time.time() - start_time
+            self.logs["evaluations"] = self.evaluations
+
+            if self._writer is not None:
+                self._writer.write({
+                    "type": "final",
+                    "best_individual": self.logs["best_individual"],
+                    "best_length": float(self.best_length),
+                    "runtime": self.logs["runtime"],
+                    "evaluations": self.evaluations,
+                })
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            if self.metrics is not None:
+                self.metrics.finish(self.metrics_labels)
+
+        return best_individual, self.logs
+
+    def _run_generational(self):
         for gen in range(self.generations):
 
             # -------- Evaluation --------
+            t0 = time.perf_counter()
             fitness, lengths = self.strategy.evaluate(
                 self.population,
                 self.distance_matrix,
             )
+            self.evaluations += len(lengths)
+            t1 = time.perf_counter()
 
             # -------- Best solution update --------
             idx = np.argmin(lengths)
@@ -158,44 +327,282 @@ class GAEngine:
 
             # -------- Record statistics --------
             self._record(fitness, lengths)
+            t2 = time.perf_counter()
 
             # -------- Evolution --------
+            self.strategy.set_budget(self.budget_used())
             self.population = self.strategy.evolve(
                 population=self.population,
                 distance_matrix=self.distance_matrix,
                 elite_size=self.elite_size,
             )
+            t3 = time.perf_counter()
+            self.population = self.strategy.improve(
+                np.array(self.population), self.distance_matrix
+            )
+
+            self._add_phases(evaluate=t1 - t0, record=t2 - t1, evolve=t3 - t2,
+                             local_search=time.perf_counter() - t3)
+            self._log_events(gen)
+            self._report(gen)
+            self.generations_run = gen + 1
+            self._publish()
+            if self._out_of_budget():
+                break
+
+        # -------- Final best update (last offspring / local search) --------
+        # not when it would overshoot the evaluation budget
+        if (self.max_evaluations is None
+                or self.evaluations < self.max_evaluations):
+            _, lengths = self.strategy.evaluate(
+                self.population, self.distance_matrix
+            )
+            self.evaluations += len(lengths)
+            self._final_best(self.population, lengths)
+
+    # --------------------------------------------------
+    # Steady-state loop
+    # --------------------------------------------------
+
+    def _run_steady_state(self):
+        """
+        Steady-state GA: k offspring per step.
+
+        The population is evaluated once; afterwards only offspring are
+        evaluated. order keeps indices sorted by length (best first) and
+        is updated by merging the k new entries, and the edge diversity
+        is maintained incrementally by an EdgeCounter.
+        """
+        k = self.offspring_per_step
+        steps_per_generation = max(1, self.population_size // k)
+
+        self.population = np.array(self.population)
+        fitness, lengths = self.strategy.evaluate(
+            self.population,
+            self.distance_matrix,
+        )
+        fitness = np.asarray(fitness, dtype=float)
+        lengths = np.asarray(lengths, dtype=float)
+        self.evaluations += len(lengths)
+
+        order = np.argsort(lengths, kind="stable")
+        edges = EdgeCounter(self.n_cities, self.population)
 
-            if self.verbose and (gen + 1) % 50 == 0:
-                print(
-                    f"[Gen {gen + 1:4d}] "
-                    f"Best length = {self.best_length:.2f}"
+        for gen in range(self.generations):
+
+            # -------- Best solution update --------
+            best = order[0]
+            if lengths[best] < self.best_length:
+                self.best_length = lengths[best]
+                self.best_individual = self.population[best].copy()
+
+            # -------- Record statistics --------
+            t0 = time.perf_counter()
+            self._record(fitness, lengths, diversity=edges.diversity())
+            phases = {"record": time.perf_counter() - t0, "breed": 0.0,
+                      "local_search": 0.0, "evaluate": 0.0, "replace": 0.0}
+
+            # -------- Evolution --------
+            for step in range(steps_per_generation):
+                t0 = time.perf_counter()
+                self.strategy.set_budget(
+                    self.budget_used(step / steps_per_generation)
                 )
+                self.strategy.adapt(
+                    lengths, edges.diversity(), new_generation=step == 0
+                )
+                if step == 0:
+                    restarted = self.strategy.maybe_restart(
+                        self.population, lengths, self.distance_matrix,
+                        self.elite_size,
+                    )
+                    if restarted is not None:
+                        self.population = np.array(restarted[0])
+                        fitness = np.asarray(restarted[1], dtype=float)
+                        lengths = np.asarray(restarted[2], dtype=float)
+                        self.evaluations += len(lengths)
+                        order = np.argsort(lengths, kind="stable")
+                        edges = EdgeCounter(self.n_cities, self.population)
+
+                offspring = self.strategy.breed(self.population, fitness, k)
+                ts = time.perf_counter()
+                offspring = self.strategy.improve(
+                    np.array(offspring), self.distance_matrix
+                )
+                t1 = time.perf_counter()
+                child_fitness, child_lengths = self.strategy.evaluate(
+                    offspring,
+                    self.distance_matrix,
+                )
+                self.evaluations += len(child_lengths)
+                t2 = time.perf_counter()
+
+                victims = self._select_victims(order, len(offspring))
+
+                for slot, child in zip(victims, offspring):
+                    edges.remove(self.population[slot])
+                    edges.add(child)
+                    self.population[slot] = child
+
+                fitness[victims] = child_fitness
+                lengths[victims] = child_lengths
+
+                # ---- merge new entries into the sorted order ----
+                order = order[~np.isin(order, victims)]
+                victims = victims[np.argsort(lengths[victims], kind="stable")]
+                pos = np.searchsorted(lengths[order], lengths[victims], side="right")
+                order = np.insert(order, pos, victims)
+
+                phases["breed"] += ts - t0
+                phases["local_search"] += t1 - ts
+                phases["evaluate"] += t2 - t1
+                phases["replace"] += time.perf_counter() - t2
+
+            self._add_phases(**phases)
+            self._log_events(gen)
+            self._report(gen)
+            self.generations_run = gen + 1
+            self._publish()
+            if self._out_of_budget():
+                break
+
+        # -------- Final best update --------
+        self._final_best(self.population, lengths)
+
+    def _select_victims(self, order, k):
+        """
+        Population slots replaced by the k offspring.
+        The current best (order[0]) is never replaced.
+        """
+        if self.replacement == "worst":
+            return order[-k:].copy()
+
+        # ---- tournament replacement: loser of each tournament ----
+        rank = np.empty(len(order), dtype=int)
+        rank[order] = np.arange(len(order))
+
+        candidates = order[1:]
+        size = min(self.tournament_size, len(candidates))
+        victims = []
+        for _ in range(k):
+            pool = np.random.choice(candidates, size, replace=False)
+            loser = pool[np.argmax(rank[pool])]
+            victims.append(loser)
+            candidates = candidates[candidates != loser]
+            size = min(size, len(candidates))
+
+        return np.array(victims)
+
+    def budget_used(self, partial_generation=0.0):
+        """
+        Fraction of the budget consumed, in [0, 1]: the largest of the
+        generation, time and evaluation fractions (only limits that are
+        set count). partial_generation adds the completed share of the
+        current generation (steady-state steps).
+        """
+        used = (self.generations_run + partial_generation) / max(1, self.generations)
+        if self.time_limit is not None and self._start_time is not None:
+            used = max(used, (time.time() - self._start_time) / self.time_limit)
+        if self.max_evaluations is not None:
+            used = max(used, self.evaluations / self.max_evaluations)
+        return min(used, 1.0)
+
+    def _out_of_budget(self):
+        if (self.max_evaluations is not None
+                and self.evaluations >= self.max_evaluations):
+            return True
+        return (
+            self.time_limit is not None
+            and time.time() - self._start_time >= self.time_limit
+        )
 
-        # -------- Final logs --------
-        self.logs["best_individual"] = self.best_individual.tolist()
-        self.logs["best_length"] = self.best_length
-        self.logs["runtime"] = time.time() - start_time
+    def _final_best(self, population, lengths):
+        """
+        Best update from the population left after the last recorded
+        generation. An improvement is not in any history row, so it is
+        logged as a "final_best" event (logs["best_length"] always
+        matches min(history) or that event).
+        """
+        idx = int(np.argmin(lengths))
+        if lengths[idx] < self.best_length:
+            self.best_length = lengths[idx]
+            self.best_individual = population[idx].copy()
+            self._log_event(self.generations_run, {
+                "event": "final_best",
+                "best_length": float(lengths[idx]),
+                "evaluations": self.evaluations,
+            })
+
+    def _log_events(self, gen):
+        for event in self.strategy.pop_events():
+            self._log_event(gen, event)
+
+    def _log_event(self, gen, event):
+        event = {"gen": gen, **event}
+        self.logs["events"].append(event)
+        if self._writer is not None:
+            self._writer.write({"type": "event", **event})
+        if self.verbose:
+            print(f"[Gen {gen + 1:4d}] {event.get('event')}: {event}")
+
+    def _add_phases(self, **seconds):
+        for phase, value in seconds.items():
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + value
+
+    def _publish(self):
+        if self.metrics is None:
+            return
+        self.metrics.publish(
+            self.metrics_labels,
+            {
+                "generation": self.generations_run,
+                "elapsed": time.time() - self._start_time,
+                "best_length": float(self.best_length),
+                **self._last_row,
+            },
+            self.phase_seconds,
+        )
 
-        return self.best_individual, self.logs
+    def _report(self, gen):
+        if self.verbose and (gen + 1) % 50 == 0:
+            print(
+                f"[Gen {gen + 1:4d}] "
+                f"Best length = {self.best_length:.2f}"
+            )
 
     # --------------------------------------------------
     # Logging
     # --------------------------------------------------
 
-    def _record(self, fitness, lengths):
-        history = self.logs["history"]
+    def _record(self, fitness, lengths, diversity=None):
+        if diversity is None:
+            diversity = self.strategy.compute_diversity(self.population)
+
+        row = {
+            "best_length": np.min(lengths),
+            "mean_length": np.mean(lengths),
+            "fitness_std": np.std(fitness),
+            "diversity": diversity,
+            "pc": float(self.strategy.pc),
+            "pm": float(self.strategy.pm),
+            "selection": self.strategy.last_selection_method,
+            **self.strategy.history_extras(),
+            **self.strategy.schedule_history(),
+        }
+
+        self._last_row = {
+            "mean_length": float(row["mean_length"]),
+            "diversity": None if diversity is None else float(diversity),
+            "pc": row["pc"],
+            "pm": row["pm"],
+        }
 
-        history["best_length"].append(np.min(lengths))
-        history["mean_length"].append(np.mean(lengths))
-        history["fitness_std"].append(np.std(fitness))
+        if self.keep_history:
+            history = self.logs["history"]
+            for key, value in row.items():
+                history.setdefault(key, []).append(value)
 
-        history["diversity"].append(
-            self.strategy.compute_diversity(self.population)
-        )
+        if self._writer is not None:
+            self._writer.write({"type": "gen", "gen": self._n_recorded, **row})
 
-        history["pc"].append(float(self.strategy.pc))
-        history["pm"].append(float(self.strategy.pm))
-        history["selection"].append(
-            self.strategy.last_selection_method
-        )
+        self._n_recorded += 1
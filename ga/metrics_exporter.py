@@ -0,0 +1,280 @@
+# ga/metrics_exporter.py
+
+import collections
+import os
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# default port of the exporter (same range as other Prometheus exporters)
+DEFAULT_PORT = 9464
+
+# generation rate is measured over this many trailing seconds
+RATE_WINDOW = 5.0
+
+# (metric, type, help, snapshot field)
+METRICS = (
+    ("ga_running", "gauge", "1 while the run is in progress", "running"),
+    ("ga_generations_total", "counter", "Generations completed", "generation"),
+    ("ga_generations_per_second", "gauge",
+     f"Generation rate over the last {RATE_WINDOW:g} seconds", "gens_per_sec"),
+    ("ga_elapsed_seconds", "gauge", "Wall-clock time since the run started",
+     "elapsed"),
+    ("ga_best_length", "gauge", "Best tour length found so far", "best_length"),
+    ("ga_mean_length", "gauge", "Mean tour length of the current population",
+     "mean_length"),
+    ("ga_diversity", "gauge", "Edge diversity of the current population",
+     "diversity"),
+    ("ga_pc", "gauge", "Current crossover probability", "pc"),
+    ("ga_pm", "gauge", "Current mutation probability", "pm"),
+)
+
+PHASE_METRIC = "ga_phase_seconds_total"
+
+
+def _escape(value):
+    return (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format_value(value):
+    value = float(value)
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return f"{value:.17g}"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + body + "}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _HTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _UnixHandler(_Handler):
+    # unix sockets have no (host, port) client address
+    def address_string(self):
+        return "unix"
+
+
+class MetricsExporter:
+    """
+    Live run metrics in the Prometheus text format, served by a
+    background HTTP thread on /metrics (TCP, or a Unix socket).
+
+    The GA loop only calls publish(), which replaces the snapshot of
+    its label set with a new dict; the text is rendered in the server
+    thread when scraped, so the loop never waits on a client. Several
+    engines (e.g. consecutive runs of one worker) can share an exporter
+    as long as their labels differ.
+
+    Parameters
+    ----------
+    port : int
+        TCP port (0 = any free port, see address)
+    host : str
+        Bind address; local only by default
+    unix_socket : str, optional
+        Serve on this Unix socket path instead of TCP
+    port_tries : int
+        Try port, port + 1, ... this many ports (parallel workers
+        sharing a base port)
+    """
+
+    def __init__(self, port=DEFAULT_PORT, host="127.0.0.1", unix_socket=None,
+                 port_tries=1):
+        self._snapshots = {}
+        self._rates = {}
+
+        if unix_socket is not None:
+            if os.path.exists(unix_socket):
+                os.remove(unix_socket)
+            self._server = _UnixHTTPServer(unix_socket, _UnixHandler)
+            self.address = f"unix:{unix_socket}"
+        else:
+            self._server = self._bind(host, port, port_tries)
+            bound_host, bound_port = self._server.server_address[:2]
+            self.address = f"http://{bound_host}:{bound_port}/metrics"
+
+        self._server.exporter = self
+        self._unix_socket = unix_socket
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="MetricsExporter",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @staticmethod
+    def _bind(host, port, port_tries):
+        error = None
+        for offset in range(max(1, port_tries)):
+            try:
+                return _HTTPServer((host, port + offset if port else 0), _Handler)
+            except OSError as exc:
+                error = exc
+        raise error
+
+    # --------------------------------------------------
+    # Loop side
+    # --------------------------------------------------
+
+    def publish(self, labels, values, phases=None):
+        """
+        Replace the snapshot of one run.
+
+        labels : dict
+            Identify the run (e.g. strategy, tsp, run_id)
+        values : dict
+            Fields of METRICS; generation and elapsed are required for
+            the generation rate
+        phases : dict, optional
+            {phase: cumulative seconds}
+        """
+        key = tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+        # trailing window of (time, generation) for the rate
+        now = time.perf_counter()
+        window = self._rates.setdefault(key, collections.deque())
+        window.append((now, values.get("generation", 0)))
+        while len(window) > 2 and now - window[0][0] > RATE_WINDOW:
+            window.popleft()
+        (t0, g0), (t1, g1) = window[0], window[-1]
+        gens_per_sec = (g1 - g0) / (t1 - t0) if t1 > t0 else 0.0
+
+        self._snapshots[key] = {
+            "running": 1,
+            **values,
+            "gens_per_sec": gens_per_sec,
+            "phases": dict(phases or {}),
+        }
+
+    def finish(self, labels):
+        """
+        Mark a run as finished; its last values stay visible.
+        """
+        key = tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            self._snapshots[key] = {**snapshot, "running": 0, "gens_per_sec": 0.0}
+        self._rates.pop(key, None)
+
+    # --------------------------------------------------
+    # Server side
+    # --------------------------------------------------
+
+    def render(self):
+        """
+        Current snapshots in the Prometheus text exposition format.
+        """
+        snapshots = list(self._snapshots.items())
+        lines = []
+
+        for name, kind, help_text, field in METRICS:
+            samples = [
+                (labels, snapshot[field])
+                for labels, snapshot in snapshots
+                if snapshot.get(field) is not None
+            ]
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        phase_samples = [
+            (labels + (("phase", phase),), seconds)
+            for labels, snapshot in snapshots
+            for phase, seconds in snapshot["phases"].items()
+        ]
+        if phase_samples:
+            lines.append(
+                f"# HELP {PHASE_METRIC} Cumulative wall-clock time per GA phase"
+            )
+            lines.append(f"# TYPE {PHASE_METRIC} counter")
+            for labels, seconds in phase_samples:
+                lines.append(
+                    f"{PHASE_METRIC}{_format_labels(labels)} {_format_value(seconds)}"
+                )
+
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._unix_socket is not None and os.path.exists(self._unix_socket):
+            os.remove(self._unix_socket)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# --------------------------------------------------
+# Process-wide exporter
+# --------------------------------------------------
+
+_EXPORTER = None
+
+
+def serve_metrics(port=DEFAULT_PORT, host="127.0.0.1", unix_socket=None,
+                  port_tries=1):
+    """
+    The exporter of this process, started on first call (later calls
+    return the same one). Prints the address it serves on.
+    """
+    global _EXPORTER
+    if _EXPORTER is None:
+        _EXPORTER = MetricsExporter(
+            port=port, host=host, unix_socket=unix_socket, port_tries=port_tries
+        )
+        print(f"[Metrics] {_EXPORTER.address} (pid {os.getpid()})")
+    return _EXPORTER
+
+
+def scrape_unix(path):
+    """
+    GET /metrics over a Unix socket (curl --unix-socket equivalent).
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).split(b"\r\n\r\n", 1)[-1].decode("utf-8")
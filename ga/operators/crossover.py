@@ -59,8 +59,10 @@ def pmx_crossover(p1, p2):
         mapping1[c1[i]] = c2[i]
         mapping2[c2[i]] = c1[i]
 
+    # only genes outside the swapped segment are repaired; the mapping
+    # chains are acyclic there, so the loop terminates
     def repair(child, mapping):
-        for i in range(size):
+        for i in list(range(0, a)) + list(range(b, size)):
             while child[i] in mapping:
                 child[i] = mapping[child[i]]
 
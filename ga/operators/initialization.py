@@ -0,0 +1,94 @@
+# ga/operators/initialization.py
+
+import numpy as np
+
+from utils.distance import as_distance_provider
+
+
+# --------------------------------------------------
+# Random tours
+# --------------------------------------------------
+
+def random_tours(n_tours, n_cities):
+    """
+    n_tours uniform random permutations.
+    """
+    return np.array([np.random.permutation(n_cities) for _ in range(n_tours)])
+
+
+# --------------------------------------------------
+# Nearest-neighbour tours
+# --------------------------------------------------
+
+def nearest_neighbor_tour(start, distance_matrix, neighbors=None):
+    """
+    Greedy nearest-neighbour tour from city `start`.
+
+    With k-NN candidate lists the next city is the nearest unvisited
+    candidate, and a full distance row is only scanned when every
+    candidate has been visited; without them every step scans a row.
+
+    distance_matrix may be a dense matrix or any DistanceProvider.
+    """
+    dist = as_distance_provider(distance_matrix)
+    n = dist.shape[0]
+
+    visited = np.zeros(n, dtype=bool)
+    tour = np.empty(n, dtype=np.int64)
+    current = int(start)
+
+    for i in range(n):
+        tour[i] = current
+        visited[current] = True
+        if i == n - 1:
+            break
+
+        nxt = -1
+        if neighbors is not None:
+            # candidate lists are sorted by distance
+            for c in neighbors[current]:
+                if not visited[c]:
+                    nxt = int(c)
+                    break
+
+        if nxt < 0:
+            row = np.asarray(dist.row(current), dtype=np.float64).copy()
+            row[visited] = np.inf
+            nxt = int(np.argmin(row))
+
+        current = nxt
+
+    return tour
+
+
+def nearest_neighbor_tours(n_tours, distance_matrix, neighbors=None):
+    """
+    Nearest-neighbour tours from distinct random start cities, each
+    followed by one random inversion so that tours from nearby starts
+    do not collapse onto the same edges.
+    """
+    n = as_distance_provider(distance_matrix).shape[0]
+    starts = np.random.choice(n, size=n_tours, replace=n_tours > n)
+
+    tours = []
+    for start in starts:
+        tour = nearest_neighbor_tour(start, distance_matrix, neighbors)
+        i, j = sorted(np.random.choice(n, 2, replace=False))
+        tour[i:j] = tour[i:j][::-1]
+        tours.append(tour)
+    return np.array(tours)
+
+
+def init_tours(n_tours, n_cities, method="random", distance_matrix=None,
+               neighbors=None):
+    """
+    Dispatcher: 'random' or 'nearest_neighbor'.
+    """
+    if method == "random":
+        return random_tours(n_tours, n_cities)
+    elif method == "nearest_neighbor":
+        if distance_matrix is None:
+            raise ValueError("nearest_neighbor init requires distances")
+        return nearest_neighbor_tours(n_tours, distance_matrix, neighbors)
+    else:
+        raise ValueError(f"Unknown init method: {method}")
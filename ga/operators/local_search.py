@@ -0,0 +1,93 @@
+# ga/operators/local_search.py
+
+import numpy as np
+
+from utils.distance import as_distance_provider
+
+
+# --------------------------------------------------
+# 2-opt
+# --------------------------------------------------
+
+def two_opt(tour, distance_matrix, neighbors=None, max_moves=None):
+    """
+    2-opt local search.
+
+    Each tour edge (a, b) is tried against new edges (a, c); the best
+    move for that edge is applied at once (the segment between is
+    reversed) and the scan goes on, pass after pass, until a pass finds
+    no improving move or max_moves moves are made. The deltas of all
+    candidates c are evaluated in one batch.
+
+    Parameters
+    ----------
+    tour : np.ndarray
+        TSP permutation (not modified)
+    distance_matrix : np.ndarray or DistanceProvider
+    neighbors : np.ndarray or None
+        (n_cities, k) candidate lists; c is restricted to the k nearest
+        cities of a (O(k) per edge instead of O(n))
+    max_moves : int or None
+        Limit on improving moves (None = until 2-optimal)
+
+    Returns
+    -------
+    tour : np.ndarray
+        Improved copy
+    gain : float
+        Length removed
+    """
+    dist = as_distance_provider(distance_matrix)
+    tour = np.array(tour, dtype=np.int64, copy=True)
+    n = len(tour)
+    if n < 4 or max_moves == 0:
+        return tour, 0.0
+
+    pos = np.empty(n, dtype=np.int64)
+    pos[tour] = np.arange(n)
+
+    all_cities = np.arange(n)
+    moves = 0
+    gain = 0.0
+    improved = True
+
+    while improved:
+        improved = False
+        for i in range(n):
+            a = tour[i]
+            b = tour[(i + 1) % n]
+
+            c = all_cities if neighbors is None else np.asarray(neighbors[a])
+            j = pos[c]
+            # c must not be a, b or the predecessor of a (shared edges)
+            keep = (c != a) & (c != b) & (j != (i - 1) % n)
+            c, j = c[keep], j[keep]
+            if len(c) == 0:
+                continue
+
+            # j > i : (a, b), (c, d) -> (a, c), (b, d)
+            # j < i : (c, d), (a, b) -> (c, a), (d, b)   (d follows c)
+            d = tour[(j + 1) % n]
+            delta = (
+                dist.edges(np.full(len(c), a), c)
+                + dist.edges(np.full(len(c), b), d)
+                - dist.edges(np.full(len(c), a), np.full(len(c), b))
+                - dist.edges(c, d)
+            )
+
+            best = int(np.argmin(delta))
+            if delta[best] >= -1e-9:
+                continue
+
+            jb = int(j[best])
+            lo, hi = (i + 1, jb + 1) if jb > i else (jb + 1, i + 1)
+            tour[lo:hi] = tour[lo:hi][::-1]
+            pos[tour[lo:hi]] = np.arange(lo, hi)
+
+            gain -= float(delta[best])
+            moves += 1
+            improved = True
+            if max_moves is not None and moves >= max_moves:
+                return tour, gain
+
+    return tour, gain
@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from utils.distance import as_distance_provider
+
 
 # --------------------------------------------------
 # Fitness evaluation
@@ -11,6 +13,9 @@ def evaluate_population(population, distance_matrix):
     """
     Compute path length and fitness for each individual.
 
+    distance_matrix may be a dense matrix or any
+    utils.distance.DistanceProvider (e.g. matrix-free coordinates).
+
     Returns
     -------
     fitness : np.ndarray
@@ -18,16 +23,8 @@ def evaluate_population(population, distance_matrix):
     lengths : np.ndarray
         Tour lengths
     """
-    pop_size = len(population)
-    lengths = np.zeros(pop_size)
-
-    for i, individual in enumerate(population):
-        length = 0.0
-        for j in range(len(individual)):
-            a = individual[j]
-            b = individual[(j + 1) % len(individual)]
-            length += distance_matrix[a][b]
-        lengths[i] = length
+    dist = as_distance_provider(distance_matrix)
+    lengths = dist.tour_lengths(population)
 
     fitness = 1.0 / (lengths + 1e-12)
     return fitness, lengths
@@ -66,6 +63,193 @@ def compute_population_diversity(population):
     return len(edge_set) / total_edges
 
 
+# --------------------------------------------------
+# Sampled diversity (adaptive control)
+# --------------------------------------------------
+
+def estimate_population_diversity(population, n_samples=256, rng=None):
+    """
+    Unbiased estimate of compute_population_diversity() from a sample
+    of edge occurrences.
+
+    With c(e) the number of individuals containing edge e,
+    #unique edges = sum over all edge occurrences of 1 / c(e), so the
+    mean of 1 / c over uniformly sampled occurrences estimates the
+    diversity. c is counted for all sampled edges at once from the
+    inverse permutations (a and b are adjacent in a tour iff their
+    positions differ by 1 or n - 1): O(P * n) to build them plus
+    O(P * n_samples), with no sort or hash of all P * n edges.
+
+    Parameters
+    ----------
+    population : array-like, shape (P, n)
+    n_samples : int
+        Sampled edge occurrences (at least 2, for the standard error)
+    rng : np.random.Generator, optional
+
+    Returns
+    -------
+    diversity : float
+    stderr : float
+        Standard error of the estimate (std(1 / c) / sqrt(n_samples));
+        0.0 when the diversity is computed exactly (tiny populations)
+    """
+    if n_samples < 2:
+        raise ValueError(f"n_samples must be at least 2, got {n_samples}")
+
+    population = np.asarray(population)
+    pop_size, n = population.shape
+    if n < 3 or n_samples >= pop_size * n:
+        return compute_population_diversity(population), 0.0
+
+    rng = np.random.default_rng() if rng is None else rng
+
+    # positions of every city in every tour
+    pos = np.empty((pop_size, n), dtype=np.int32)
+    pos[np.arange(pop_size)[:, None], population] = np.arange(n, dtype=np.int32)
+
+    k = rng.integers(pop_size, size=n_samples)
+    j = rng.integers(n, size=n_samples)
+    a = population[k, j]
+    b = population[k, (j + 1) % n]
+
+    gap = np.abs(pos[:, a] - pos[:, b])
+    counts = np.count_nonzero((gap == 1) | (gap == n - 1), axis=0)
+
+    inverse = 1.0 / counts
+    stderr = inverse.std(ddof=1) / np.sqrt(n_samples)
+    return float(inverse.mean()), float(stderr)
+
+
+class DiversityMeter:
+    """
+    Diversity for adaptive control, exact or sampled (by config).
+
+    method="exact"   : compute_population_diversity()
+    method="sampled" : estimate_population_diversity() with n_samples
+                       edge occurrences; last_error holds the standard
+                       error of the last estimate
+
+    The sampler has its own generator (seeded from np.random on first
+    use), so runs stay reproducible under the engine seed.
+    """
+
+    METHODS = ("exact", "sampled")
+
+    def __init__(self, method="exact", n_samples=256):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown diversity method: {method}")
+        self.method = method
+        self.n_samples = int(n_samples)
+        if method == "sampled" and self.n_samples < 2:
+            raise ValueError(
+                f"diversity_samples must be at least 2, got {n_samples}"
+            )
+        self.last_error = 0.0
+        self._rng = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            method=config.get("diversity_method", "exact"),
+            n_samples=config.get("diversity_samples", 256),
+        )
+
+    def __call__(self, population):
+        if self.method == "exact":
+            return compute_population_diversity(population)
+
+        if self._rng is None:
+            self._rng = np.random.default_rng(np.random.randint(2 ** 31))
+        diversity, self.last_error = estimate_population_diversity(
+            population, self.n_samples, self._rng
+        )
+        return diversity
+
+    def history(self):
+        """
+        Extra history fields (only the sampler reports an error).
+        """
+        if self.method == "exact":
+            return {}
+        return {"diversity_error": self.last_error}
+
+
+# --------------------------------------------------
+# Incremental diversity (steady-state mode)
+# --------------------------------------------------
+
+class EdgeCounter:
+    """
+    Incrementally maintained edge-based diversity.
+
+    Keeps a multiplicity count per undirected edge so that inserting or
+    removing one individual costs O(n) instead of a full population scan.
+    diversity() matches compute_population_diversity() on the same
+    population.
+    """
+
+    # dense counts up to 2**24 edge ids (64 MB of int32), dict beyond
+    DENSE_LIMIT = 1 << 24
+
+    def __init__(self, n_cities, population=None):
+        self.n_cities = n_cities
+        self.n_unique = 0
+        self.total_edges = 0
+
+        if n_cities * n_cities <= self.DENSE_LIMIT:
+            self.counts = np.zeros(n_cities * n_cities, dtype=np.int32)
+        else:
+            self.counts = None
+            self._sparse = {}
+
+        if population is not None:
+            for ind in population:
+                self.add(ind)
+
+    def edge_ids(self, individual):
+        ind = np.asarray(individual, dtype=np.int64)
+        nxt = np.roll(ind, -1)
+        a = np.minimum(ind, nxt)
+        b = np.maximum(ind, nxt)
+        return np.unique(a * self.n_cities + b), len(ind)
+
+    def add(self, individual):
+        ids, n_edges = self.edge_ids(individual)
+        self.total_edges += n_edges
+
+        if self.counts is not None:
+            self.n_unique += int(np.count_nonzero(self.counts[ids] == 0))
+            self.counts[ids] += 1
+        else:
+            for e in ids.tolist():
+                c = self._sparse.get(e, 0)
+                if c == 0:
+                    self.n_unique += 1
+                self._sparse[e] = c + 1
+
+    def remove(self, individual):
+        ids, n_edges = self.edge_ids(individual)
+        self.total_edges -= n_edges
+
+        if self.counts is not None:
+            self.counts[ids] -= 1
+            self.n_unique -= int(np.count_nonzero(self.counts[ids] == 0))
+        else:
+            for e in ids.tolist():
+                c = self._sparse[e] - 1
+                if c == 0:
+                    self.n_unique -= 1
+                    del self._sparse[e]
+                else:
+                    self._sparse[e] = c
+
+    def diversity(self):
+        if self.total_edges == 0:
+            return 0.0
+        return self.n_unique / self.total_edges
+
+
 # --------------------------------------------------
 # Best individual
 # --------------------------------------------------
@@ -31,11 +31,53 @@ def inversion_mutation(individual):
     return ind
 
 
+# --------------------------------------------------
+# Neighbourhood-guided mutations
+# --------------------------------------------------
+
+def _random_candidate_edge(ind, neighbors):
+    """
+    Random position i and a k-NN candidate d of city ind[i].
+    Returns (i, j) with ind[j] == d.
+    """
+    i = np.random.randint(len(ind))
+    c = ind[i]
+    d = neighbors[c, np.random.randint(neighbors.shape[1])]
+    j = int(np.flatnonzero(ind == d)[0])
+    return i, j
+
+
+def neighbor_swap_mutation(individual, neighbors):
+    """
+    Swap a near neighbour d of city c into the slot after c,
+    creating the candidate edge (c, d).
+    """
+    ind = individual.copy()
+    i, j = _random_candidate_edge(ind, neighbors)
+    k = (i + 1) % len(ind)
+    ind[k], ind[j] = ind[j], ind[k]
+    return ind
+
+
+def neighbor_inversion_mutation(individual, neighbors):
+    """
+    2-opt style inversion that makes city c and one of its near
+    neighbours d adjacent.
+    """
+    ind = individual.copy()
+    i, j = _random_candidate_edge(ind, neighbors)
+    if i < j:
+        ind[i + 1:j + 1] = ind[i + 1:j + 1][::-1]
+    else:
+        ind[j:i] = ind[j:i][::-1]
+    return ind
+
+
 # --------------------------------------------------
 # Dispatcher
 # --------------------------------------------------
 
-def mutate(individual, pm, method="swap"):
+def mutate(individual, pm, method="swap", neighbors=None):
     """
     Mutation dispatcher.
 
@@ -46,7 +88,9 @@ def mutate(individual, pm, method="swap"):
     pm : float
         Mutation probability
     method : str
-        'swap' or 'inversion'
+        'swap', 'inversion', 'nn_swap' or 'nn_inversion'
+    neighbors : np.ndarray or None
+        (n_cities, k) candidate lists, required by the nn_* methods
     """
     if np.random.rand() >= pm:
         return individual.copy()
@@ -55,5 +99,13 @@ def mutate(individual, pm, method="swap"):
         return swap_mutation(individual)
     elif method == "inversion":
         return inversion_mutation(individual)
+    elif method in ("nn_swap", "nn_inversion"):
+        if neighbors is None:
+            raise ValueError(
+                f"Mutation method '{method}' requires neighbor lists"
+            )
+        if method == "nn_swap":
+            return neighbor_swap_mutation(individual, neighbors)
+        return neighbor_inversion_mutation(individual, neighbors)
     else:
         raise ValueError(f"Unknown mutation method: {method}")
@@ -7,12 +7,19 @@ import numpy as np
 # Roulette Wheel Selection
 # --------------------------------------------------
 
-def roulette_wheel_selection(fitness, num_selected):
+def _selection_weights(fitness, pressure=1.0):
     fitness = np.asarray(fitness)
 
     # 防止负值 / 全零
     fitness = fitness - fitness.min() + 1e-12
-    probs = fitness / fitness.sum()
+    if pressure != 1.0:
+        # > 1 favours the best more, < 1 flattens towards uniform
+        fitness = (fitness / fitness.max()) ** pressure + 1e-12
+    return fitness / fitness.sum()
+
+
+def roulette_wheel_selection(fitness, num_selected, pressure=1.0):
+    probs = _selection_weights(fitness, pressure)
 
     cum_probs = np.cumsum(probs)
     r = np.random.rand(num_selected)
@@ -25,11 +32,8 @@ def roulette_wheel_selection(fitness, num_selected):
 # Stochastic Universal Sampling (SUS)
 # --------------------------------------------------
 
-def stochastic_universal_sampling(fitness, num_selected):
-    fitness = np.asarray(fitness)
-
-    fitness = fitness - fitness.min() + 1e-12
-    probs = fitness / fitness.sum()
+def stochastic_universal_sampling(fitness, num_selected, pressure=1.0):
+    probs = _selection_weights(fitness, pressure)
 
     cum_probs = np.cumsum(probs)
 
@@ -45,7 +49,7 @@ def stochastic_universal_sampling(fitness, num_selected):
 # Selection Dispatcher
 # --------------------------------------------------
 
-def select(fitness, method="roulette", num_selected=None):
+def select(fitness, method="roulette", num_selected=None, pressure=1.0):
     """
     Selection interface (RETURN INDICES ONLY)
 
@@ -55,14 +59,17 @@ def select(fitness, method="roulette", num_selected=None):
     method : str
         'roulette' or 'sus'
     num_selected : int
+    pressure : float
+        Exponent on the (windowed) fitness; 1.0 = plain proportional
+        selection
     """
     pop_size = len(fitness)
     if num_selected is None:
         num_selected = pop_size
 
     if method == "roulette":
-        return roulette_wheel_selection(fitness, num_selected)
+        return roulette_wheel_selection(fitness, num_selected, pressure)
     elif method == "sus":
-        return stochastic_universal_sampling(fitness, num_selected)
+        return stochastic_universal_sampling(fitness, num_selected, pressure)
     else:
         raise ValueError(f"Unknown selection method: {method}")
@@ -0,0 +1,197 @@
+# ga/run_log.py
+
+import json
+import os
+import queue
+import signal
+import threading
+
+import numpy as np
+
+_STOP = object()
+
+
+def _to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class RunLogWriter:
+    """
+    Append-only JSONL run log written by a background thread.
+
+    The GA loop only enqueues records; a daemon thread serializes and
+    writes them in batches, flushing after every batch so a crash loses
+    at most the records still queued. The queue is bounded (max_queue):
+    the loop blocks only if the disk falls that many records behind.
+
+    Record types:
+        {"type": "meta", "meta": {...}}
+        {"type": "gen", "gen": g, <history fields>}
+        {"type": "event", "gen": g, "event": ..., <fields>}
+        {"type": "final", "best_individual": [...], "best_length": ...,
+         "runtime": ...}
+    """
+
+    def __init__(self, path, max_queue=4096, handle_signals=True):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._worker, name="RunLogWriter", daemon=True
+        )
+        self._thread.start()
+
+        self._previous_handlers = {}
+        self._deferred_signal = None
+        if handle_signals:
+            self._install_signal_handlers()
+
+    # --------------------------------------------------
+    def write(self, record):
+        if not self._closed:
+            self._queue.put(record)
+
+    # --------------------------------------------------
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not _STOP and len(batch) < 256:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            lines = [
+                json.dumps(record, default=_to_builtin) + "\n"
+                for record in batch if record is not _STOP
+            ]
+            if lines:
+                self._file.writelines(lines)
+                self._file.flush()
+
+            if batch[-1] is _STOP:
+                return
+
+    # --------------------------------------------------
+    def close(self):
+        """
+        Drain the queue, fsync and close the file. Idempotent.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        self._queue.put(_STOP)
+        self._thread.join()
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._restore_signal_handlers()
+
+        if self._deferred_signal is not None:
+            # default disposition: terminate by the signal, now flushed
+            signal.signal(self._deferred_signal, signal.SIG_DFL)
+            os.kill(os.getpid(), self._deferred_signal)
+
+    # --------------------------------------------------
+    # SIGINT / SIGTERM: defer to the old handler, flush on the way out
+    # --------------------------------------------------
+
+    def _install_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self._previous_handlers[signum] = signal.signal(
+                signum, self._on_signal
+            )
+
+    def _restore_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers = {}
+
+    def _on_signal(self, signum, frame):
+        """
+        Never touches the queue or the file: the main thread may be
+        interrupted inside write() holding the queue's lock. The
+        previous disposition decides what happens; flushing is left to
+        close(), reached through the owner's finally when the signal
+        unwinds the run.
+        """
+        previous = self._previous_handlers.get(signum)
+
+        if previous == signal.SIG_IGN or previous is None:
+            # the run goes on, and so does the log
+            return
+        if callable(previous):
+            # e.g. default_int_handler -> KeyboardInterrupt
+            previous(signum, frame)
+            return
+
+        # SIG_DFL: unwind with SystemExit; close() re-raises the signal
+        # once the queue is written out
+        self._deferred_signal = signum
+        raise SystemExit(128 + signum)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_run_log(path):
+    """
+    Rebuild the engine log format from a JSONL run log.
+
+    A truncated last line (crash while writing) is ignored. Logs of runs
+    that never finished get "incomplete": True and best_length taken
+    from the recorded history.
+    """
+    logs = {"meta": {}, "history": {}, "events": []}
+    final = None
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+
+            kind = record.pop("type", None)
+            if kind == "meta":
+                logs["meta"] = record["meta"]
+            elif kind == "gen":
+                record.pop("gen", None)
+                for key, value in record.items():
+                    logs["history"].setdefault(key, []).append(value)
+            elif kind == "event":
+                logs["events"].append(record)
+            elif kind == "final":
+                final = record
+
+    if final is not None:
+        logs.update(final)
+    else:
+        best = logs["history"].get("best_length", [])
+        logs["best_individual"] = None
+        logs["best_length"] = min(best) if best else None
+        logs["runtime"] = None
+        logs["incomplete"] = True
+
+    return logs
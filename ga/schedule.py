@@ -0,0 +1,97 @@
+# ga/schedule.py
+
+import math
+
+SHAPES = ("linear", "cosine", "exponential", "step")
+
+
+class BudgetSchedule:
+    """
+    Strategy parameters as functions of the budget used.
+
+    The engine reports the fraction f in [0, 1] of its budget consumed
+    (the largest of generations, time_limit and max_evaluations used,
+    see GAEngine.budget_used()); the schedule sets each listed strategy
+    attribute to its value at f. The same schedule therefore spans a
+    1-second and a 10-minute run: only how fast f grows differs.
+
+    Config (strategy config key "schedule"):
+
+        {
+            "pm":                {"start": 0.2, "end": 0.01, "shape": "cosine"},
+            "selection_pressure": {"start": 0.5, "end": 3.0},
+            "local_search_rate":  {"start": 0.0, "end": 0.2, "shape": "step",
+                                   "at": 0.7},
+        }
+
+    Attributes must exist on the strategy. For AdaptiveGA /
+    SemiAdaptiveGA, which recompute pc / pm every generation, schedule
+    the bounds (pc_min, pc_max, pm_min, pm_max) instead.
+
+    Shapes, from start at f = 0 to end at f = 1:
+        linear      : start + f * (end - start)
+        cosine      : slow at both ends (cosine annealing)
+        exponential : geometric (start and end > 0)
+        step        : start until f >= at (default 0.5), then end
+    Integer start and end give integer values.
+    """
+
+    def __init__(self, params):
+        self.params = {}
+        for name, spec in params.items():
+            if not isinstance(spec, dict):
+                # constant
+                spec = {"start": spec, "end": spec}
+            spec = {"shape": "linear", "at": 0.5, **spec}
+
+            if spec["shape"] not in SHAPES:
+                raise ValueError(f"Unknown schedule shape: {spec['shape']}")
+            if spec["shape"] == "exponential" and min(spec["start"], spec["end"]) <= 0:
+                raise ValueError(
+                    f"Exponential schedule of '{name}' needs positive start / end"
+                )
+            self.params[name] = spec
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Schedule from config["schedule"], or None.
+        """
+        spec = config.get("schedule")
+        return cls(spec) if spec else None
+
+    # --------------------------------------------------
+    def value(self, name, fraction):
+        spec = self.params[name]
+        start, end, shape = spec["start"], spec["end"], spec["shape"]
+        f = min(max(float(fraction), 0.0), 1.0)
+
+        if shape == "linear":
+            value = start + f * (end - start)
+        elif shape == "cosine":
+            value = end + 0.5 * (start - end) * (1.0 + math.cos(math.pi * f))
+        elif shape == "exponential":
+            value = start * (end / start) ** f
+        else:
+            value = end if f >= spec["at"] else start
+
+        if isinstance(start, int) and isinstance(end, int):
+            return int(round(value))
+        return float(value)
+
+    def values(self, fraction):
+        return {name: self.value(name, fraction) for name in self.params}
+
+    # --------------------------------------------------
+    def apply(self, strategy, fraction):
+        """
+        Set the scheduled attributes of strategy for budget fraction.
+        """
+        values = self.values(fraction)
+        for name, value in values.items():
+            if not hasattr(strategy, name):
+                raise ValueError(
+                    f"{strategy.name} has no parameter '{name}' to schedule"
+                )
+            setattr(strategy, name, value)
+        return values
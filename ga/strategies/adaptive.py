@@ -6,18 +6,46 @@ from ga.strategies.base import GAStrategy
 from ga.operators.selection import select
 from ga.operators.crossover import crossover
 from ga.operators.mutation import mutate
-from ga.operators.metrics import (
-    evaluate_population,
-    compute_population_diversity,
-)
+from ga.operators.initialization import init_tours
+from ga.operators.metrics import DiversityMeter, evaluate_population
+
+# restart actions once the stagnation counter reaches its threshold
+RESTART_ACTIONS = ("none", "reinit", "burst", "elite_restart")
+
+RESTART_DEFAULTS = {
+    "action": "none",
+    # reinit: share of the population (worst first) replaced
+    "fraction": 0.5,
+    # reinit / elite_restart: "random" or "nearest_neighbor"
+    "init": "random",
+    # burst: forced mutations applied to every non-elite individual
+    "burst_strength": 5,
+    "burst_method": "inversion",
+    # elite_restart: individuals kept
+    "elites": 1,
+    # maximum number of restarts per run (None = unlimited)
+    "max_restarts": None,
+}
 
 
 class AdaptiveGAStrategy(GAStrategy):
     """
     Fully Adaptive GA (Stagnation-driven):
     - Pc / Pm adapted by diversity + stagnation
-    - No generation-ratio annealing
+    - No generation-ratio annealing (budget-driven bounds are
+      available through the optional "schedule" config, see
+      ga.schedule.BudgetSchedule)
     - Hybrid selection (RWS + SUS)
+    - Optional restart once stagnation saturates (config "restart"):
+        reinit        : replace the worst fraction by random or
+                        nearest-neighbour tours
+        burst         : burst_strength forced mutations on every
+                        non-elite individual (engine elite_size)
+        elite_restart : keep the best `elites`, reinitialise the rest
+      Each restart resets the stagnation counter and is reported as an
+      event (see pop_events()). Generational mode restarts inside
+      evolve(); steady-state mode through maybe_restart(), once per
+      generation.
     """
 
     name = "AdaptiveGA"
@@ -60,6 +88,20 @@ class AdaptiveGAStrategy(GAStrategy):
         self.stagnation_counter = 0
         self.best_length = np.inf
 
+        # exact or sampled edge diversity (diversity_method / _samples)
+        self.diversity_meter = DiversityMeter.from_config(config)
+
+        # --------------------------------------------------
+        # restarts
+        # --------------------------------------------------
+        self.restart = {**RESTART_DEFAULTS, **config.get("restart", {})}
+        if self.restart["action"] not in RESTART_ACTIONS:
+            raise ValueError(
+                f"Unknown restart action: {self.restart['action']}"
+            )
+        self.n_restarts = 0
+        self._events = []
+
         # --------------------------------------------------
         # current parameters
         # --------------------------------------------------
@@ -67,13 +109,108 @@ class AdaptiveGAStrategy(GAStrategy):
         self.pm = self.pm_min
         self.last_diversity = None
 
+        self.configure_schedule(config)
+
     # --------------------------------------------------
     def evaluate(self, population, distance_matrix):
         return evaluate_population(population, distance_matrix)
 
     # --------------------------------------------------
     def compute_diversity(self, population):
-        return compute_population_diversity(population)
+        return self.diversity_meter(population)
+
+    # --------------------------------------------------
+    def should_restart(self):
+        limit = self.restart["max_restarts"]
+        return (
+            self.restart["action"] != "none"
+            and self.stagnation_counter >= self.stagnation_threshold
+            and (limit is None or self.n_restarts < limit)
+        )
+
+    # --------------------------------------------------
+    def apply_restart(self, population, lengths, distance_matrix,
+                      elite_size=1):
+        """
+        Apply the configured restart action. burst keeps the best
+        max(1, elite_size) individuals untouched.
+
+        Returns
+        -------
+        population, fitness, lengths
+            The new population, re-evaluated
+        """
+        cfg = self.restart
+        action = cfg["action"]
+        population = np.array(population)
+        pop_size, n = population.shape
+        order = np.argsort(lengths)
+
+        if action == "burst":
+            n_keep = min(max(1, elite_size or 0), pop_size)
+            keep = order[:n_keep]
+            replaced = order[n_keep:]
+            for i in replaced:
+                ind = population[i]
+                for _ in range(cfg["burst_strength"]):
+                    ind = mutate(
+                        ind, 1.0, method=cfg["burst_method"],
+                        neighbors=self.neighbors,
+                    )
+                population[i] = ind
+        else:
+            if action == "reinit":
+                n_new = int(round(cfg["fraction"] * pop_size))
+                n_new = min(max(n_new, 1), pop_size - 1)
+            else:
+                n_new = pop_size - max(1, min(cfg["elites"], pop_size))
+            keep = order[:pop_size - n_new]
+            replaced = order[pop_size - n_new:]
+            population[replaced] = init_tours(
+                len(replaced), n, method=cfg["init"],
+                distance_matrix=distance_matrix, neighbors=self.neighbors,
+            )
+
+        diversity_before = self.last_diversity
+        fitness, lengths = self.evaluate(population, distance_matrix)
+
+        self.n_restarts += 1
+        self._events.append({
+            "event": "restart",
+            "action": action,
+            "init": cfg["init"] if action != "burst" else None,
+            "replaced": int(len(replaced)),
+            "kept": int(len(keep)),
+            "stagnation": int(self.stagnation_counter),
+            "best_length": float(self.best_length),
+            "diversity_before": diversity_before,
+            "restart": self.n_restarts,
+        })
+
+        self.stagnation_counter = 0
+        return population, fitness, lengths
+
+    # --------------------------------------------------
+    def maybe_restart(self, population, lengths, distance_matrix, elite_size):
+        """
+        Steady-state hook (see GAStrategy.maybe_restart).
+        """
+        if not self.should_restart():
+            return None
+        population, fitness, lengths = self.apply_restart(
+            population, lengths, distance_matrix, elite_size
+        )
+        self.last_diversity = self.compute_diversity(population)
+        return population, fitness, lengths
+
+    # --------------------------------------------------
+    def pop_events(self):
+        events, self._events = self._events, []
+        return events
+
+    # --------------------------------------------------
+    def history_extras(self):
+        return self.diversity_meter.history()
 
     # --------------------------------------------------
     def update_stagnation(self, best_length):
@@ -117,6 +254,21 @@ class AdaptiveGAStrategy(GAStrategy):
             self.sus_ratio_max - self.sus_ratio_min
         )
 
+    # --------------------------------------------------
+    def adapt(self, lengths, diversity, new_generation=True):
+        """
+        Steady-state hook: same rule as evolve(). pc / pm follow the
+        diversity every step, but stagnation is counted once per
+        generation, so stagnation_threshold keeps its unit.
+        """
+        if new_generation:
+            self.update_stagnation(np.min(lengths))
+        self.update_parameters(diversity)
+
+    # --------------------------------------------------
+    def select_parents(self, fitness, num_selected):
+        return self.mixed_selection(fitness, num_selected)
+
     # --------------------------------------------------
     def mixed_selection(self, fitness, pop_size):
         """
@@ -133,6 +285,7 @@ class AdaptiveGAStrategy(GAStrategy):
                     fitness,
                     num_selected=n_roulette,
                     method="roulette",
+                    pressure=self.selection_pressure,
                 )
             )
 
@@ -142,6 +295,7 @@ class AdaptiveGAStrategy(GAStrategy):
                     fitness,
                     num_selected=n_sus,
                     method="sus",
+                    pressure=self.selection_pressure,
                 )
             )
 
@@ -161,6 +315,12 @@ class AdaptiveGAStrategy(GAStrategy):
         best_length = np.min(lengths)
         self.update_stagnation(best_length)
 
+        if self.should_restart():
+            population, fitness, lengths = self.apply_restart(
+                population, lengths, distance_matrix, elite_size
+            )
+            diversity = self.compute_diversity(population)
+
         self.update_parameters(diversity)
 
         parents = self.mixed_selection(fitness, pop_size)
@@ -183,8 +343,14 @@ class AdaptiveGAStrategy(GAStrategy):
             else:
                 c1, c2 = p1.copy(), p2.copy()
 
-            c1 = mutate(c1, self.pm, method=self.mutation_method)
-            c2 = mutate(c2, self.pm, method=self.mutation_method)
+            c1 = mutate(
+                c1, self.pm, method=self.mutation_method,
+                neighbors=self.neighbors,
+            )
+            c2 = mutate(
+                c2, self.pm, method=self.mutation_method,
+                neighbors=self.neighbors,
+            )
 
             new_population.append(c1)
             if len(new_population) < pop_size:
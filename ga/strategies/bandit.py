@@ -0,0 +1,378 @@
+# ga/strategies/bandit.py
+
+import time
+
+import numpy as np
+
+from ga.strategies.base import GAStrategy
+from ga.operators.selection import select
+from ga.operators.crossover import crossover
+from ga.operators.mutation import mutate
+from ga.operators.metrics import (
+    evaluate_population,
+    compute_population_diversity,
+)
+from utils.distance import as_distance_provider
+
+CROSSOVER_METHODS = ("ox", "pmx")
+MUTATION_METHODS = ("swap", "inversion", "nn_swap", "nn_inversion")
+
+# mutations that need k-NN candidate lists
+_NEEDS_NEIGHBORS = ("nn_swap", "nn_inversion")
+
+
+# --------------------------------------------------
+# Bandit
+# --------------------------------------------------
+
+class OperatorBandit:
+    """
+    Probability-matching bandit over a portfolio of operators.
+
+    The reward of an operator is its fitness improvement per CPU-second
+    over one update (a generation): total length gained by its children
+    divided by the total process time spent inside it. Rewards are
+    normalised by the best operator of the update, so they lie in
+    [0, 1] whatever the instance scale, and averaged with discount
+    `discount` (older generations weigh less: operators that stop
+    paying off lose their share).
+
+    Operators are drawn with probability
+        p_min + (1 - K * p_min) * q_a / sum(q)
+    so every operator keeps being tried at rate p_min.
+    """
+
+    def __init__(self, arms, discount=0.9, min_probability=0.05):
+        self.arms = list(arms)
+        self.discount = discount
+        self.min_probability = min(min_probability, 1.0 / len(self.arms))
+
+        k = len(self.arms)
+        # optimistic start: every operator begins as the best one
+        self.quality = np.ones(k)
+        self._weight = np.zeros(k)
+
+        self._reset_round()
+        self.last_usage = dict.fromkeys(self.arms, 0)
+        self.last_reward = dict.fromkeys(self.arms, 0.0)
+
+    def _reset_round(self):
+        k = len(self.arms)
+        self._uses = np.zeros(k, dtype=np.int64)
+        self._gain = np.zeros(k)
+        self._seconds = np.zeros(k)
+
+    def probabilities(self):
+        k = len(self.arms)
+        share = self.quality / self.quality.sum() if self.quality.sum() > 0 \
+            else np.full(k, 1.0 / k)
+        return self.min_probability + (1.0 - k * self.min_probability) * share
+
+    def choose(self):
+        return int(np.random.choice(len(self.arms), p=self.probabilities()))
+
+    def credit(self, arm, gain, seconds):
+        """
+        One application of arm: length gained (>= 0) and CPU seconds.
+        """
+        self._uses[arm] += 1
+        self._gain[arm] += max(gain, 0.0)
+        self._seconds[arm] += seconds
+
+    def update(self):
+        """
+        Close the round: fold this round's rewards into the qualities.
+        """
+        used = self._uses > 0
+        rate = np.zeros(len(self.arms))
+        rate[used] = self._gain[used] / np.maximum(self._seconds[used], 1e-9)
+
+        best = rate.max()
+        reward = rate / best if best > 0 else rate
+
+        # discounted mean of the normalised reward, weighted by uses
+        self._weight *= self.discount
+        self.quality[used] = (
+            self.quality[used] * self._weight[used] + reward[used] * self._uses[used]
+        ) / (self._weight[used] + self._uses[used])
+        self._weight[used] += self._uses[used]
+
+        self.last_usage = dict(zip(self.arms, self._uses.tolist()))
+        self.last_reward = dict(zip(self.arms, rate.tolist()))
+        self._reset_round()
+
+    def history(self):
+        out = {}
+        probs = self.probabilities()
+        for i, arm in enumerate(self.arms):
+            out[f"usage_{arm}"] = self.last_usage[arm]
+            out[f"reward_{arm}"] = self.last_reward[arm]
+            out[f"prob_{arm}"] = float(probs[i])
+        return out
+
+
+# --------------------------------------------------
+# Strategy
+# --------------------------------------------------
+
+class BanditGAStrategy(GAStrategy):
+    """
+    Adaptive operator selection:
+    - fixed Pc / Pm, roulette (or configured) selection
+    - crossover and mutation operators drawn per application from two
+      OperatorBandit portfolios, rewarded by length improvement per
+      CPU-second (crossover: child vs. better parent; mutation: child
+      after vs. before mutation)
+    - per-operator usage, reward (length / CPU-second) and probability
+      recorded in the history every generation
+
+    No tour is evaluated beyond the engine's own evaluations: mutation
+    gains are computed from the edges the mutation changed, and
+    crossover credits wait for the engine to evaluate the children
+    (next evaluate() call; 2-opt gains from improve() are added back
+    so local search is not credited to the operators).
+
+    nn_* mutations are dropped from the portfolio when the engine
+    provides no k-NN candidate lists.
+    """
+
+    name = "BanditGA"
+
+    def __init__(self, config):
+        super().__init__()
+
+        self.pc = float(config.get("pc", 0.9))
+        self.pm = float(config.get("pm", 0.2))
+
+        self.selection_method = config.get("selection_method", "roulette")
+        self.last_selection_method = self.selection_method
+
+        self.crossover_methods = list(
+            config.get("crossover_methods", CROSSOVER_METHODS)
+        )
+        self.mutation_methods = list(
+            config.get("mutation_methods", MUTATION_METHODS)
+        )
+        self.discount = config.get("bandit_discount", 0.9)
+        self.min_probability = config.get("bandit_min_probability", 0.05)
+
+        # built on first use, once the engine has set self.neighbors
+        self.crossover_bandit = None
+        self.mutation_bandit = None
+
+        # crossover credits of the last children, until evaluated
+        self._pending = None
+
+        self.configure_schedule(config)
+
+    # --------------------------------------------------
+    def _bandits(self):
+        if self.crossover_bandit is None:
+            mutations = [
+                m for m in self.mutation_methods
+                if self.neighbors is not None or m not in _NEEDS_NEIGHBORS
+            ]
+            self.crossover_bandit = OperatorBandit(
+                self.crossover_methods, self.discount, self.min_probability
+            )
+            self.mutation_bandit = OperatorBandit(
+                mutations, self.discount, self.min_probability
+            )
+        return self.crossover_bandit, self.mutation_bandit
+
+    # --------------------------------------------------
+    def evaluate(self, population, distance_matrix):
+        self._distance = as_distance_provider(distance_matrix)
+        fitness, lengths = evaluate_population(population, distance_matrix)
+        if self._pending is not None:
+            self._credit_children(lengths)
+        return fitness, lengths
+
+    # --------------------------------------------------
+    def _credit_children(self, lengths):
+        """
+        Crossover credits of the children bred last, from the engine's
+        evaluation: they are the last rows of the evaluated population
+        (offspring after the elites, or the steady-state offspring).
+        """
+        pending, self._pending = self._pending, None
+        cx_bandit, mut_bandit = self._bandits()
+        n = len(pending["cx_arms"])
+
+        lengths = np.asarray(lengths, dtype=float)
+        child_lengths = lengths[len(lengths) - n:]
+        if self.improve_gains is not None:
+            gains = self.improve_gains
+            child_lengths = child_lengths + gains[len(gains) - n:]
+        # length before mutation
+        len_before = child_lengths + pending["mut_delta"]
+
+        for k, arm in enumerate(pending["cx_arms"]):
+            if arm >= 0:
+                cx_bandit.credit(
+                    arm, pending["parent_best"][k] - len_before[k],
+                    pending["cx_seconds"][k],
+                )
+
+        if pending["close_round"]:
+            cx_bandit.update()
+            mut_bandit.update()
+
+    # --------------------------------------------------
+    def _mutation_gain(self, before, after):
+        """
+        Length removed by a mutation, from the edges it changed only.
+        """
+        changed = np.flatnonzero(before != after)
+        if changed.size == 0:
+            return 0.0
+        n = len(before)
+        # edges (i, i + 1) with at least one changed end
+        idx = np.unique(np.concatenate([changed, changed - 1]) % n)
+        nxt = (idx + 1) % n
+        removed = self._distance.edges(before[idx], before[nxt]).sum()
+        added = self._distance.edges(after[idx], after[nxt]).sum()
+        return float(removed - added)
+
+    # --------------------------------------------------
+    def compute_diversity(self, population):
+        return compute_population_diversity(population)
+
+    # --------------------------------------------------
+    def make_offspring(self, population, lengths, parents, n_children,
+                       close_round=True):
+        """
+        Children of consecutive parent pairs, with operators drawn from
+        the bandits. Mutations are credited at once; crossovers once
+        the engine has evaluated the children (see _credit_children).
+
+        close_round=False only accumulates the credits (steady-state
+        steps); the bandits are updated once a round is closed.
+        """
+        cx_bandit, mut_bandit = self._bandits()
+        clock = time.process_time
+
+        after = []
+        cx_arms, cx_seconds, parent_best = [], [], []
+        mut_delta = []
+
+        i = 0
+        while len(after) < n_children:
+            a = parents[i % len(parents)]
+            b = parents[(i + 1) % len(parents)]
+            i += 2
+
+            if np.random.rand() < self.pc:
+                arm = cx_bandit.choose()
+                start = clock()
+                c1, c2 = crossover(
+                    population[a], population[b],
+                    method=cx_bandit.arms[arm],
+                )
+                seconds = (clock() - start) / 2
+            else:
+                arm = -1
+                seconds = 0.0
+                c1, c2 = population[a].copy(), population[b].copy()
+
+            for child in (c1, c2):
+                if len(after) == n_children:
+                    break
+                cx_arms.append(arm)
+                cx_seconds.append(seconds)
+                parent_best.append(min(lengths[a], lengths[b]))
+
+                delta = 0.0
+                if np.random.rand() < self.pm:
+                    m = mut_bandit.choose()
+                    start = clock()
+                    mutated = mutate(
+                        child, 1.0, method=mut_bandit.arms[m],
+                        neighbors=self.neighbors,
+                    )
+                    seconds_m = clock() - start
+                    # (gain lookup is not charged to the operator)
+                    gain = self._mutation_gain(child, mutated)
+                    mut_bandit.credit(m, gain, seconds_m)
+                    delta, child = gain, mutated
+                mut_delta.append(delta)
+                after.append(child)
+
+        self._pending = {
+            "cx_arms": cx_arms,
+            "cx_seconds": cx_seconds,
+            "parent_best": parent_best,
+            "mut_delta": np.array(mut_delta),
+            "close_round": close_round,
+        }
+        return np.array(after)
+
+    # --------------------------------------------------
+    def evolve(self, population, distance_matrix, elite_size):
+        pop_size = len(population)
+
+        fitness, lengths = self.evaluate(population, distance_matrix)
+
+        parent_indices = select(
+            fitness,
+            method=self.selection_method,
+            num_selected=pop_size,
+            pressure=self.selection_pressure,
+        )
+        self.last_selection_method = self.selection_method
+
+        # ---- Elitism ----
+        elite_size = elite_size or 0
+        elite_idx = np.argsort(lengths)[:elite_size]
+        elites = [population[i].copy() for i in elite_idx]
+
+        # ---- Offspring ----
+        offspring = self.make_offspring(
+            population, lengths, parent_indices, pop_size - len(elites)
+        )
+        if not elites:
+            return offspring
+        return np.vstack([np.array(elites), offspring])
+
+    # --------------------------------------------------
+    def breed(self, population, fitness, num_offspring):
+        """
+        Steady-state hook: same bandit operators; parent lengths are
+        recovered from fitness (1 / length).
+
+        A step breeds only a few children, so credits are pooled and
+        the bandits updated once len(population) children have been
+        bred (one logged generation): rewards are normalised over a
+        generation's worth of applications, the discount applies per
+        generation, and history_extras() reports the whole round, as
+        in generational mode.
+        """
+        if not hasattr(self, "_distance"):
+            raise RuntimeError("BanditGA.breed() called before evaluate()")
+
+        self._round_children = getattr(self, "_round_children", 0) + num_offspring
+        close_round = self._round_children >= len(population)
+        if close_round:
+            self._round_children = 0
+
+        lengths = 1.0 / np.asarray(fitness) - 1e-12
+        parents = self.select_parents(
+            fitness, num_offspring + num_offspring % 2
+        )
+        return self.make_offspring(
+            population, lengths, parents, num_offspring, close_round
+        )
+
+    # --------------------------------------------------
+    def history_extras(self):
+        # same keys from the first row on (zero usage before any breeding)
+        cx_bandit, mut_bandit = self._bandits()
+        return {**cx_bandit.history(), **mut_bandit.history()}
+
+    # --------------------------------------------------
+    def record(self):
+        return {
+            "pc": self.pc,
+            "pm": self.pm,
+            "selection": self.selection_method,
+        }
@@ -2,6 +2,14 @@
 
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from ga.operators.selection import select
+from ga.operators.crossover import crossover
+from ga.operators.mutation import mutate
+from ga.operators.local_search import two_opt
+from ga.schedule import BudgetSchedule
+
 
 class GAStrategy(ABC):
     """
@@ -16,9 +24,35 @@ class GAStrategy(ABC):
         self.pc = pc
         self.pm = pm
 
+        # k-NN candidate lists for nn_* mutations (set by GAEngine)
+        self.neighbors = None
+
         # for logging & analysis
         self.last_selection_method = None
 
+        # budget schedule (see configure_schedule / set_budget)
+        self.schedule = None
+        self.budget_used = 0.0
+        self.selection_pressure = 1.0
+        self.local_search_rate = 0.0
+        self.local_search_moves = None
+        # per-row length removed by the last improve() (None: no-op)
+        self.improve_gains = None
+
+    def configure_schedule(self, config):
+        """
+        Read the budget-schedule keys of a strategy config:
+        "schedule" (see ga.schedule.BudgetSchedule) and the static
+        defaults "selection_pressure", "local_search_rate" and
+        "local_search_moves" (2-opt moves per improved offspring).
+        """
+        self.selection_pressure = float(config.get("selection_pressure", 1.0))
+        self.local_search_rate = float(config.get("local_search_rate", 0.0))
+        self.local_search_moves = config.get("local_search_moves")
+        self.schedule = BudgetSchedule.from_config(config)
+        if self.schedule is not None:
+            self.schedule.apply(self, 0.0)
+
     # --------------------------------------------------
     # Required by GAEngine
     # --------------------------------------------------
@@ -47,3 +81,126 @@ class GAStrategy(ABC):
             diversity: float
         """
         pass
+
+    def history_extras(self):
+        """
+        Strategy-specific fields appended to every history row by the
+        engine (e.g. estimator error, operator statistics).
+        """
+        return {}
+
+    def set_budget(self, fraction):
+        """
+        Called by the engine before every evolve() / steady-state step
+        with the fraction of its budget consumed.
+        """
+        self.budget_used = fraction
+        if self.schedule is not None:
+            self.schedule.apply(self, fraction)
+
+    def schedule_history(self):
+        """
+        Budget fraction and current scheduled values (history fields).
+        """
+        if self.schedule is None:
+            return {}
+        return {
+            "budget_used": self.budget_used,
+            **{name: getattr(self, name) for name in self.schedule.params},
+        }
+
+    def improve(self, population, distance_matrix):
+        """
+        2-opt on a random local_search_rate share of population (in
+        place), at most local_search_moves moves each. No-op at rate 0.
+        The gain of every row is kept in improve_gains.
+        """
+        if self.local_search_rate <= 0:
+            self.improve_gains = None
+            return population
+
+        moves = self.local_search_moves
+        chosen = np.flatnonzero(
+            np.random.rand(len(population)) < self.local_search_rate
+        )
+        gains = np.zeros(len(population))
+        for i in chosen:
+            population[i], gains[i] = two_opt(
+                population[i], distance_matrix, self.neighbors,
+                None if moves is None else int(moves),
+            )
+        self.improve_gains = gains
+        return population
+
+    def pop_events(self):
+        """
+        Events since the last call (e.g. restarts); the engine stamps
+        them with the generation and logs them under logs["events"].
+        """
+        return []
+
+    # --------------------------------------------------
+    # Steady-state hooks (used by GAEngine mode="steady_state")
+    # --------------------------------------------------
+
+    def adapt(self, lengths, diversity, new_generation=True):
+        """
+        Update pc / pm before a steady-state step.
+        new_generation is True on the first step of each logged
+        generation (for per-generation counters such as stagnation).
+        Fixed-parameter strategies keep the default no-op.
+        """
+        pass
+
+    def maybe_restart(self, population, lengths, distance_matrix, elite_size):
+        """
+        Called once per generation in steady-state mode, after adapt().
+        Return None to keep the population, or (population, fitness,
+        lengths) to replace it (e.g. a stagnation restart).
+        """
+        return None
+
+    def select_parents(self, fitness, num_selected):
+        """
+        Return parent indices for num_selected parents.
+        """
+        method = getattr(self, "selection_method", "roulette")
+        self.last_selection_method = method
+        return select(
+            fitness, method=method, num_selected=num_selected,
+            pressure=self.selection_pressure,
+        )
+
+    def breed(self, population, fitness, num_offspring):
+        """
+        Produce num_offspring children with the strategy's operators.
+
+        Return:
+            offspring: np.ndarray, shape (num_offspring, n_cities)
+        """
+        crossover_method = getattr(self, "crossover_method", "ox")
+        mutation_method = getattr(self, "mutation_method", "swap")
+
+        parents = self.select_parents(
+            fitness, num_offspring + num_offspring % 2
+        )
+
+        offspring = []
+        for i in range(0, len(parents), 2):
+            p1 = population[parents[i]]
+            p2 = population[parents[i + 1]]
+
+            if np.random.rand() < self.pc:
+                c1, c2 = crossover(p1, p2, method=crossover_method)
+            else:
+                c1, c2 = p1.copy(), p2.copy()
+
+            for child in (c1, c2):
+                offspring.append(
+                    mutate(
+                        child, self.pm, method=mutation_method,
+                        neighbors=self.neighbors,
+                    )
+                )
+
+        return np.array(offspring[:num_offspring])
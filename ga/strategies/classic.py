@@ -40,6 +40,8 @@ class ClassicGAStrategy(GAStrategy):
 
         self.last_selection_method = self.selection_method
 
+        self.configure_schedule(config)
+
     # --------------------------------------------------
     def evaluate(self, population, distance_matrix):
         return evaluate_population(population, distance_matrix)
@@ -59,6 +61,7 @@ class ClassicGAStrategy(GAStrategy):
             fitness,
             method=self.selection_method,
             num_selected=pop_size,
+            pressure=self.selection_pressure,
         )
         self.last_selection_method = self.selection_method
 
@@ -83,8 +86,14 @@ class ClassicGAStrategy(GAStrategy):
             else:
                 c1, c2 = p1.copy(), p2.copy()
 
-            c1 = mutate(c1, self.pm, method=self.mutation_method)
-            c2 = mutate(c2, self.pm, method=self.mutation_method)
+            c1 = mutate(
+                c1, self.pm, method=self.mutation_method,
+                neighbors=self.neighbors,
+            )
+            c2 = mutate(
+                c2, self.pm, method=self.mutation_method,
+                neighbors=self.neighbors,
+            )
 
             new_population.append(c1)
             if len(new_population) < pop_size:
@@ -38,6 +38,8 @@ class ClassicSUSGAStrategy(GAStrategy):
         self.crossover_method = config.get("crossover_method", "ox")
         self.mutation_method = config.get("mutation_method", "swap")
 
+        self.configure_schedule(config)
+
     # --------------------------------------------------
     def evaluate(self, population, distance_matrix):
         """
@@ -66,6 +68,7 @@ class ClassicSUSGAStrategy(GAStrategy):
             fitness,
             num_selected=pop_size,
             method=self.selection_method,
+            pressure=self.selection_pressure,
         )
 
         # ---- Elitism ----
@@ -88,8 +91,14 @@ class ClassicSUSGAStrategy(GAStrategy):
             else:
                 c1, c2 = p1.copy(), p2.copy()
 
-            c1 = mutate(c1, self.pm, method=self.mutation_method)
-            c2 = mutate(c2, self.pm, method=self.mutation_method)
+            c1 = mutate(
+                c1, self.pm, method=self.mutation_method,
+                neighbors=self.neighbors,
+            )
+            c2 = mutate(
+                c2, self.pm, method=self.mutation_method,
+                neighbors=self.neighbors,
+            )
 
             new_population.append(c1)
             if len(new_population) < pop_size:
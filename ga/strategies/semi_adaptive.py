@@ -6,10 +6,7 @@ from ga.strategies.base import GAStrategy
 from ga.operators.selection import select
 from ga.operators.crossover import crossover
 from ga.operators.mutation import mutate
-from ga.operators.metrics import (
-    evaluate_population,
-    compute_population_diversity,
-)
+from ga.operators.metrics import DiversityMeter, evaluate_population
 
 
 class SemiAdaptiveGAStrategy(GAStrategy):
@@ -58,8 +55,13 @@ class SemiAdaptiveGAStrategy(GAStrategy):
         self.crossover_method = config.get("crossover_method", "ox")
         self.mutation_method = config.get("mutation_method", "swap")
 
+        # exact or sampled edge diversity (diversity_method / _samples)
+        self.diversity_meter = DiversityMeter.from_config(config)
+
         self.last_diversity = None
         self.last_selection_method = self.selection_method
+
+        self.configure_schedule(config)
     # --------------------------------------------------
     def evaluate(self, population, distance_matrix):
         return evaluate_population(population, distance_matrix)
@@ -79,12 +81,19 @@ class SemiAdaptiveGAStrategy(GAStrategy):
         self.pc = float(np.clip(self.pc, self.pc_min, self.pc_max))
         self.pm = float(np.clip(self.pm, self.pm_min, self.pm_max))
 
+    # --------------------------------------------------
+    def adapt(self, lengths, diversity, new_generation=True):
+        """
+        Steady-state hook: diversity-driven pc / pm per step
+        """
+        self.update_parameters(diversity)
+
     # --------------------------------------------------
     def evolve(self, population, distance_matrix, elite_size):
         pop_size = len(population)
 
         fitness, lengths = self.evaluate(population, distance_matrix)
-        diversity = compute_population_diversity(population)
+        diversity = self.compute_diversity(population)
 
         # 🔴 真正起作用的地方
         self.update_parameters(diversity)
@@ -93,6 +102,7 @@ class SemiAdaptiveGAStrategy(GAStrategy):
             fitness,
             num_selected=pop_size,
             method=self.selection_method,
+            pressure=self.selection_pressure,
         )
         self.last_selection_method = self.selection_method
 
@@ -116,8 +126,14 @@ class SemiAdaptiveGAStrategy(GAStrategy):
             else:
                 c1, c2 = p1.copy(), p2.copy()
 
-            c1 = mutate(c1, self.pm, method=self.mutation_method)
-            c2 = mutate(c2, self.pm, method=self.mutation_method)
+            c1 = mutate(
+                c1, self.pm, method=self.mutation_method,
+                neighbors=self.neighbors,
+            )
+            c2 = mutate(
+                c2, self.pm, method=self.mutation_method,
+                neighbors=self.neighbors,
+            )
 
             new_population.append(c1)
             if len(new_population) < pop_size:
@@ -138,4 +154,8 @@ class SemiAdaptiveGAStrategy(GAStrategy):
         Compute population diversity.
         This method is required by GAStrategy abstract interface.
         """
-        return compute_population_diversity(population)
+        return self.diversity_meter(population)
+
+    # --------------------------------------------------
+    def history_extras(self):
+        return self.diversity_meter.history()
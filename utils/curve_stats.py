@@ -0,0 +1,263 @@
+# utils/curve_stats.py
+
+import warnings
+
+import numpy as np
+
+# quartiles by default: median line + IQR band
+QUANTILES = (0.25, 0.5, 0.75)
+
+# P² keeps five markers per quantile
+_MARKERS = 5
+
+
+# --------------------------------------------------
+# Streaming per-generation statistics
+# --------------------------------------------------
+
+class CurveAggregator:
+    """
+    Per-generation statistics of many curves, consumed one run at a time.
+
+    Mean and variance are exact (Welford); quantiles are approximated
+    with the P² algorithm (Jain & Chlamtac, 1985), five markers per
+    quantile and generation, updated for all generations at once.
+    Memory is O(generations * quantiles), independent of the number of
+    runs.
+
+    Runs may have different lengths; NaN values (padding, or None in a
+    history series) are skipped, so every generation has its own count.
+
+    Parameters
+    ----------
+    quantiles : sequence of float
+        Probabilities in (0, 1) to track
+    """
+
+    def __init__(self, quantiles=QUANTILES):
+        self.quantiles = tuple(float(p) for p in quantiles)
+        if any(not 0.0 < p < 1.0 for p in self.quantiles):
+            raise ValueError(f"Quantiles must be in (0, 1): {self.quantiles}")
+
+        p = np.array(self.quantiles)[:, None]
+        # desired-position increments of the five markers
+        self._step = np.hstack([
+            np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)
+        ])
+
+        self.n_runs = 0
+        self._length = 0
+        self._allocate(0)
+
+    # ---------- storage ----------
+
+    def _allocate(self, capacity):
+        n_q = len(self.quantiles)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._mean = np.zeros(capacity)
+        self._m2 = np.zeros(capacity)
+        self._height = np.zeros((n_q, capacity, _MARKERS))
+        self._pos = np.zeros((n_q, capacity, _MARKERS))
+        self._want = np.zeros((n_q, capacity, _MARKERS))
+
+    def _grow(self, length):
+        capacity = len(self._count)
+        if length <= capacity:
+            return
+        old = (
+            self._count, self._mean, self._m2,
+            self._height, self._pos, self._want,
+        )
+        self._allocate(max(length, 2 * capacity))
+        self._count[:capacity] = old[0]
+        self._mean[:capacity] = old[1]
+        self._m2[:capacity] = old[2]
+        self._height[:, :capacity] = old[3]
+        self._pos[:, :capacity] = old[4]
+        self._want[:, :capacity] = old[5]
+
+    # ---------- updates ----------
+
+    def update(self, curve):
+        """
+        Add one run's curve (value per generation).
+        """
+        x = np.asarray(curve, dtype=np.float64).ravel()
+        gens = np.flatnonzero(np.isfinite(x))
+        self.n_runs += 1
+        if gens.size == 0:
+            return
+
+        self._grow(gens[-1] + 1)
+        self._length = max(self._length, gens[-1] + 1)
+        x = x[gens]
+
+        # Welford
+        count = self._count[gens] + 1
+        self._count[gens] = count
+        delta = x - self._mean[gens]
+        self._mean[gens] += delta / count
+        self._m2[gens] += delta * (x - self._mean[gens])
+
+        # P²: the first five values of a generation are stored as they
+        # come; on the fifth the markers are initialised
+        warm = count <= _MARKERS
+        if warm.any():
+            self._warm_up(gens[warm], x[warm], count[warm])
+        if (~warm).any():
+            self._p2_update(gens[~warm], x[~warm])
+
+    def update_block(self, curves):
+        """
+        Add a (runs, generations) block, row by row.
+        """
+        for curve in np.atleast_2d(curves):
+            self.update(curve)
+
+    def _warm_up(self, gens, x, count):
+        self._height[:, gens, count - 1] = x
+
+        ready = gens[count == _MARKERS]
+        if ready.size == 0:
+            return
+        self._height[:, ready] = np.sort(self._height[:, ready], axis=-1)
+        self._pos[:, ready] = np.arange(1, _MARKERS + 1)
+        self._want[:, ready] = 1 + 4 * self._step[:, None, :]
+
+    def _p2_update(self, gens, x):
+        q = self._height[:, gens]          # (quantiles, m, 5)
+        n = self._pos[:, gens]
+        want = self._want[:, gens] + self._step[:, None, :]
+        x = np.broadcast_to(x, q.shape[:2])
+
+        # cell k of x (q[k] <= x < q[k+1]); the extremes absorb outliers
+        k = np.sum(x[..., None] >= q[..., 1:4], axis=-1)
+        q[..., 0] = np.minimum(q[..., 0], x)
+        q[..., 4] = np.maximum(q[..., 4], x)
+        n += np.arange(_MARKERS) > k[..., None]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i in (1, 2, 3):
+                d = want[..., i] - n[..., i]
+                up = (d >= 1) & (n[..., i + 1] - n[..., i] > 1)
+                down = (d <= -1) & (n[..., i - 1] - n[..., i] < -1)
+                move = up | down
+                if not move.any():
+                    continue
+                s = np.where(up, 1.0, -1.0)
+
+                # piecewise-parabolic prediction
+                parabolic = q[..., i] + s / (n[..., i + 1] - n[..., i - 1]) * (
+                    (n[..., i] - n[..., i - 1] + s)
+                    * (q[..., i + 1] - q[..., i])
+                    / (n[..., i + 1] - n[..., i])
+                    + (n[..., i + 1] - n[..., i] - s)
+                    * (q[..., i] - q[..., i - 1])
+                    / (n[..., i] - n[..., i - 1])
+                )
+                # linear fallback when it leaves the neighbouring markers
+                q_next = np.where(up, q[..., i + 1], q[..., i - 1])
+                n_next = np.where(up, n[..., i + 1], n[..., i - 1])
+                linear = q[..., i] + s * (q_next - q[..., i]) / (n_next - n[..., i])
+
+                inside = (q[..., i - 1] < parabolic) & (parabolic < q[..., i + 1])
+                q[..., i] = np.where(
+                    move, np.where(inside, parabolic, linear), q[..., i]
+                )
+                n[..., i] += np.where(move, s, 0.0)
+
+        self._height[:, gens] = q
+        self._pos[:, gens] = n
+        self._want[:, gens] = want
+
+    # ---------- results ----------
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def count(self):
+        """
+        Runs that reached each generation.
+        """
+        return self._count[:self._length].copy()
+
+    @property
+    def mean(self):
+        count = self.count
+        return np.where(count > 0, self._mean[:self._length], np.nan)
+
+    @property
+    def variance(self):
+        """
+        Unbiased sample variance (NaN below two runs).
+        """
+        count = self.count
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                count > 1, self._m2[:self._length] / (count - 1), np.nan
+            )
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def quantile(self, p):
+        """
+        Approximate p-quantile per generation (p must be tracked).
+        Exact while a generation has at most five runs.
+        """
+        try:
+            j = self.quantiles.index(float(p))
+        except ValueError:
+            raise ValueError(
+                f"Quantile {p} is not tracked: {self.quantiles}"
+            ) from None
+
+        count = self.count
+        heights = self._height[j, :self._length]
+        out = heights[:, 2].copy()
+
+        warm = count <= _MARKERS
+        if warm.any():
+            values = np.where(
+                np.arange(_MARKERS) < count[warm, None],
+                heights[warm],
+                np.nan,
+            )
+            with warnings.catch_warnings():
+                # generations no run reached: all-NaN rows -> NaN
+                warnings.simplefilter("ignore", RuntimeWarning)
+                out[warm] = np.nanquantile(values, p, axis=1)
+        return out
+
+    def covered(self, min_fraction=0.5):
+        """
+        Generations reached by at least min_fraction of the runs; the
+        tail beyond is estimated from few (long) runs only.
+        """
+        needed = max(1, int(np.ceil(min_fraction * self.n_runs)))
+        return self.count >= needed
+
+    def summary(self):
+        """
+        All statistics as arrays of length len(self).
+        """
+        out = {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+        }
+        for p in self.quantiles:
+            out[f"q{p:g}"] = self.quantile(p)
+        return out
+
+
+def aggregate_curves(curves, quantiles=QUANTILES):
+    """
+    CurveAggregator over an iterable of curves or (runs, gens) blocks.
+    """
+    aggregator = CurveAggregator(quantiles)
+    for block in curves:
+        aggregator.update_block(block)
+    return aggregator
@@ -0,0 +1,352 @@
+# utils/distance.py
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+# -------------------------------------------------
+# Metrics (vectorized, broadcasting over coordinates)
+# -------------------------------------------------
+
+# All functions follow the TSPLIB 95 definitions, except EUC_2D which is
+# kept unrounded to stay comparable with the existing experiment logs.
+
+GEO_RRR = 6378.388
+GEO_PI = 3.141592
+
+
+def euc_2d(xa, ya, xb, yb):
+    """
+    Euclidean distance (not rounded, matching the original loader).
+    """
+    return np.hypot(xa - xb, ya - yb)
+
+
+def ceil_2d(xa, ya, xb, yb):
+    return np.ceil(np.hypot(xa - xb, ya - yb))
+
+
+def man_2d(xa, ya, xb, yb):
+    return np.rint(np.abs(xa - xb) + np.abs(ya - yb))
+
+
+def att(xa, ya, xb, yb):
+    """
+    Pseudo-Euclidean distance (att48 / att532).
+    """
+    dx = xa - xb
+    dy = ya - yb
+    r = np.sqrt((dx * dx + dy * dy) / 10.0)
+    t = np.rint(r)
+    return np.where(t < r, t + 1.0, t)
+
+
+def _geo_radians(v):
+    # DDD.MM (degrees.minutes) -> radians
+    deg = np.trunc(v)
+    return GEO_PI * (deg + 5.0 * (v - deg) / 3.0) / 180.0
+
+
+def geo(xa, ya, xb, yb):
+    """
+    Geographical distance in km; x is latitude, y is longitude.
+    """
+    lat_a, lon_a = _geo_radians(xa), _geo_radians(ya)
+    lat_b, lon_b = _geo_radians(xb), _geo_radians(yb)
+
+    q1 = np.cos(lon_a - lon_b)
+    q2 = np.cos(lat_a - lat_b)
+    q3 = np.cos(lat_a + lat_b)
+    arg = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+
+    d = np.trunc(GEO_RRR * np.arccos(arg) + 1.0)
+    # TSPLIB yields 1 km for a city to itself; tours never use it
+    return np.where((xa == xb) & (ya == yb), 0.0, d)
+
+
+METRICS = {
+    "EUC_2D": euc_2d,
+    "CEIL_2D": ceil_2d,
+    "MAN_2D": man_2d,
+    "ATT": att,
+    "GEO": geo,
+}
+
+
+def get_metric(metric):
+    try:
+        return METRICS[metric]
+    except KeyError:
+        raise NotImplementedError(
+            f"EDGE_WEIGHT_TYPE '{metric}' is not supported"
+        ) from None
+
+
+def pairwise_distances(xy_a, xy_b, metric="EUC_2D"):
+    """
+    Distance block between two coordinate arrays.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (len(xy_a), len(xy_b))
+    """
+    fn = get_metric(metric)
+    return fn(
+        xy_a[:, 0, None], xy_a[:, 1, None],
+        xy_b[None, :, 0], xy_b[None, :, 1],
+    )
+
+
+def build_distance_matrix(xy, metric="EUC_2D", block_size=1024):
+    """
+    Full distance matrix as a C-contiguous float64 ndarray.
+
+    Rows are filled in blocks of block_size so the broadcasting
+    temporaries stay at O(block_size * n) instead of O(n^2).
+    """
+    xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    n = len(xy)
+    dist = np.empty((n, n), dtype=np.float64)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        dist[start:stop] = pairwise_distances(xy[start:stop], xy, metric)
+
+    return dist
+
+
+def packed_size(n):
+    return n * (n - 1) // 2
+
+
+def packed_index(i, j, n):
+    """
+    Position of edge (i, j), i < j, in the row-major packed upper triangle.
+    """
+    return i * (2 * n - i - 1) // 2 + (j - i - 1)
+
+
+def build_packed_distances(xy, metric="EUC_2D", block_size=1024, dtype=np.float64):
+    """
+    Strict upper triangle of the distance matrix, packed row by row.
+
+    Built block-wise from coordinates without materializing the full
+    matrix; needs n(n-1)/2 values instead of n^2.
+    """
+    xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    n = len(xy)
+    packed = np.empty(packed_size(n), dtype=dtype)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = pairwise_distances(xy[start:stop], xy, metric)
+        upper = np.arange(n)[None, :] > np.arange(start, stop)[:, None]
+        lo = packed_index(start, start + 1, n)
+        hi = packed_index(stop, stop + 1, n)
+        packed[lo:hi] = block[upper]
+
+    return packed
+
+
+def pack_symmetric(matrix, dtype=np.float64):
+    """
+    Pack the strict upper triangle of a symmetric matrix.
+    """
+    matrix = np.asarray(matrix)
+    rows, cols = np.triu_indices(matrix.shape[0], 1)
+    return matrix[rows, cols].astype(dtype, copy=False)
+
+
+# -------------------------------------------------
+# Distance providers
+# -------------------------------------------------
+
+class DistanceProvider:
+    """
+    Read-only access to TSP edge weights.
+
+    Subclasses implement edges(); everything else (rows, tour lengths,
+    matrix-style indexing) is derived from it.
+    """
+
+    num_cities = 0
+
+    # edges evaluated per batch in tour_lengths() (each batch holds
+    # batch_edges // n_cities tours)
+    batch_edges = 1 << 20
+
+    @property
+    def shape(self):
+        return (self.num_cities, self.num_cities)
+
+    def __len__(self):
+        return self.num_cities
+
+    def edges(self, a, b):
+        """
+        Vectorized edge lookup: distance between a[k] and b[k].
+        a and b are integer arrays of the same shape.
+        """
+        raise NotImplementedError
+
+    def row(self, i):
+        """
+        Distances from city i to every city.
+        """
+        cities = np.arange(self.num_cities)
+        return self.edges(np.full_like(cities, i), cities)
+
+    def tour_lengths(self, tours):
+        """
+        Closed-tour lengths for a population.
+
+        Parameters
+        ----------
+        tours : array-like, shape (pop_size, n_cities)
+
+        Returns
+        -------
+        np.ndarray, shape (pop_size,)
+        """
+        tours = np.asarray(tours)
+        if tours.ndim == 1:
+            tours = tours[None, :]
+        if tours.shape[1] == 0:
+            return np.zeros(len(tours))
+
+        nxt = np.roll(tours, -1, axis=1)
+        rows = max(1, self.batch_edges // tours.shape[1])
+
+        lengths = np.empty(len(tours))
+        for start in range(0, len(tours), rows):
+            stop = start + rows
+            lengths[start:stop] = self.edges(
+                tours[start:stop], nxt[start:stop]
+            ).sum(axis=1)
+        return lengths
+
+    def tour_length(self, tour):
+        return float(self.tour_lengths(tour)[0])
+
+    def __getitem__(self, key):
+        # dist[a, b] (scalars or arrays) and legacy dist[a][b]
+        if isinstance(key, tuple):
+            a, b = key
+            d = self.edges(np.asarray(a), np.asarray(b))
+            return d[()] if np.ndim(d) == 0 else d
+        return self.row(key)
+
+
+class DenseDistance(DistanceProvider):
+    """
+    Provider over a full n x n matrix (ndarray or np.memmap).
+    """
+
+    def __init__(self, matrix):
+        self.matrix = np.asarray(matrix)
+        self.num_cities = self.matrix.shape[0]
+
+    def edges(self, a, b):
+        return self.matrix[a, b]
+
+    def row(self, i):
+        return self.matrix[i]
+
+
+class PackedDistance(DistanceProvider):
+    """
+    Provider over a packed upper triangle (see build_packed_distances),
+    for symmetric instances: half the memory of DenseDistance.
+    """
+
+    def __init__(self, packed, num_cities):
+        self.packed = packed
+        self.num_cities = num_cities
+
+        if len(packed) != packed_size(num_cities):
+            raise ValueError(
+                f"Packed distances of length {len(packed)} do not match "
+                f"{num_cities} cities"
+            )
+
+    def edges(self, a, b):
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        i = np.minimum(a, b)
+        j = np.maximum(a, b)
+        same = i == j
+
+        idx = packed_index(i, j, self.num_cities)
+        d = self.packed[np.where(same, 0, idx)]
+        return np.where(same, 0.0, d)
+
+    def row(self, i):
+        cities = np.arange(self.num_cities)
+        return self.edges(np.full_like(cities, i), cities)
+
+
+class CoordinateDistance(DistanceProvider):
+    """
+    Matrix-free provider: distances are computed from coordinates on
+    demand, so memory stays O(n) (plus cache_rows * n for the row cache).
+
+    The row cache only serves row() (full-row scans such as
+    nearest-neighbour construction and candidate lists). edges() and
+    tour_lengths() always compute from coordinates: for these metrics
+    that is about as fast as a cached lookup.
+
+    Parameters
+    ----------
+    coords : array-like, shape (n, 2)
+    metric : str
+        Key of METRICS
+    cache_rows : int
+        Size of the LRU cache of full rows returned by row()
+        (0 disables it)
+    """
+
+    def __init__(self, coords, metric="EUC_2D", cache_rows=0):
+        self.xy = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+        self.x = self.xy[:, 0].copy()
+        self.y = self.xy[:, 1].copy()
+        self.num_cities = len(self.xy)
+        self.metric = metric
+        self._fn = get_metric(metric)
+
+        self.cache_rows = cache_rows
+        self._rows = OrderedDict()
+
+    def edges(self, a, b):
+        return self._fn(self.x[a], self.y[a], self.x[b], self.y[b])
+
+    def row(self, i):
+        i = int(i)
+        if self.cache_rows <= 0:
+            return self._compute_row(i)
+
+        cached = self._rows.get(i)
+        if cached is not None:
+            self._rows.move_to_end(i)
+            return cached
+
+        r = self._compute_row(i)
+        r.flags.writeable = False
+        self._rows[i] = r
+        if len(self._rows) > self.cache_rows:
+            self._rows.popitem(last=False)
+        return r
+
+    def _compute_row(self, i):
+        return self._fn(self.x[i], self.y[i], self.x, self.y)
+
+
+def as_distance_provider(distance):
+    """
+    Wrap a matrix (list of lists / ndarray / memmap) as a provider;
+    providers are returned unchanged.
+    """
+    if isinstance(distance, DistanceProvider):
+        return distance
+    return DenseDistance(distance)
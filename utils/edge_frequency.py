@@ -0,0 +1,121 @@
+# utils/edge_frequency.py
+
+import os
+
+import numpy as np
+
+from utils.result_store import load_strategy_runs
+
+# bincount over all n^2 ids up to this many (128 MB of int64);
+# sort-based np.unique beyond, which only allocates per observed edge
+DENSE_LIMIT = 1 << 24
+
+
+# --------------------------------------------------
+# Edge ids
+# --------------------------------------------------
+
+def edge_ids(tours, n_cities=None):
+    """
+    Undirected edge ids of closed tours: id = min(a, b) * n + max(a, b).
+
+    Parameters
+    ----------
+    tours : array-like, shape (runs, n) or (n,)
+    n_cities : int, optional
+        Defaults to the tour length
+
+    Returns
+    -------
+    np.ndarray, int64, same shape as tours
+        ids[r, i] is the edge (tours[r, i], tours[r, i + 1])
+    """
+    tours = np.atleast_2d(np.asarray(tours, dtype=np.int64))
+    n = tours.shape[1] if n_cities is None else n_cities
+
+    nxt = np.roll(tours, -1, axis=1)
+    return np.minimum(tours, nxt) * n + np.maximum(tours, nxt)
+
+
+def split_edge_ids(ids, n_cities):
+    """
+    Edge ids -> (a, b) endpoint arrays with a < b.
+    """
+    return ids // n_cities, ids % n_cities
+
+
+# --------------------------------------------------
+# Frequencies
+# --------------------------------------------------
+
+def edge_frequency(tours, n_cities=None):
+    """
+    How many tours use each edge, as sparse arrays.
+
+    Parameters
+    ----------
+    tours : array-like, shape (runs, n)
+
+    Returns
+    -------
+    a, b : np.ndarray
+        Endpoints of every edge used at least once (a < b), by id
+    count : np.ndarray
+        Number of tours containing the edge
+    """
+    tours = np.atleast_2d(np.asarray(tours, dtype=np.int64))
+    n = tours.shape[1] if n_cities is None else n_cities
+    if tours.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    ids = edge_ids(tours, n).ravel()
+
+    if n * n <= DENSE_LIMIT:
+        counts = np.bincount(ids, minlength=n * n)
+        unique = np.flatnonzero(counts)
+        count = counts[unique]
+    else:
+        unique, count = np.unique(ids, return_counts=True)
+
+    a, b = split_edge_ids(unique, n)
+    return a, b, count
+
+
+def stack_tours(logs):
+    """
+    Best tours of run logs as one (runs, n) int matrix.
+    """
+    return np.array([log["best_individual"] for log in logs], dtype=np.int64)
+
+
+def load_tours(result_dir, max_runs=None):
+    """
+    Stacked best tours of one strategy directory, ordered by run_id.
+
+    Returns
+    -------
+    tours : np.ndarray, shape (runs, n)
+    strategy_name : str
+    """
+    runs = load_strategy_runs(result_dir, with_history=False)
+    runs.sort(key=lambda log: log["meta"].get("run_id", 0))
+    if max_runs:
+        runs = runs[:max_runs]
+
+    strategy_name = os.path.basename(os.path.normpath(result_dir))
+    if runs:
+        strategy_name = runs[0]["meta"].get("strategy", strategy_name)
+    return stack_tours(runs), strategy_name
+
+
+def load_edge_frequency(result_dir, max_runs=None):
+    """
+    Edge frequencies of one strategy directory.
+
+    Returns
+    -------
+    (a, b, count), n_runs, strategy_name
+    """
+    tours, strategy_name = load_tours(result_dir, max_runs)
+    return edge_frequency(tours), len(tours), strategy_name
@@ -0,0 +1,121 @@
+# utils/instances.py
+
+import os
+
+import numpy as np
+
+from utils.distance import CoordinateDistance
+from utils.spatial import hilbert_order
+
+# synthetic instances live in a square of this side
+SCALE = 1_000_000
+
+INSTANCE_KINDS = ("uniform", "clustered")
+
+
+# -------------------------------------------------
+# Synthetic coordinates
+# -------------------------------------------------
+
+def generate_coords(n, kind="uniform", seed=0, scale=SCALE):
+    """
+    Reproducible random city coordinates (integer-valued floats).
+
+    Parameters
+    ----------
+    n : int
+        Number of cities
+    kind : str
+        'uniform'   : uniform in the square
+        'clustered' : ~n/100 Gaussian clusters with uniform centres
+                      (in the spirit of the DIMACS clustered generator)
+    seed : int
+    scale : float
+        Side of the square
+
+    Returns
+    -------
+    np.ndarray, shape (n, 2)
+    """
+    rng = np.random.default_rng(seed)
+
+    if kind == "uniform":
+        xy = rng.uniform(0, scale, size=(n, 2))
+    elif kind == "clustered":
+        n_clusters = max(1, n // 100)
+        centres = rng.uniform(0, scale, size=(n_clusters, 2))
+        sigma = scale / (4.0 * np.sqrt(n_clusters))
+        labels = rng.integers(n_clusters, size=n)
+        xy = centres[labels] + rng.normal(0.0, sigma, size=(n, 2))
+        xy = np.clip(xy, 0, scale)
+    else:
+        raise ValueError(f"Unknown instance kind: {kind}")
+
+    return np.round(xy)
+
+
+# -------------------------------------------------
+# TSPLIB output
+# -------------------------------------------------
+
+def write_tsp(path, name, coords, comment=None):
+    """
+    Write coordinates as a TSPLIB EUC_2D file (atomically).
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    header = [
+        f"NAME : {name}",
+        f"COMMENT : {comment or 'synthetic instance'}",
+        "TYPE : TSP",
+        f"DIMENSION : {len(coords)}",
+        "EDGE_WEIGHT_TYPE : EUC_2D",
+        "NODE_COORD_SECTION",
+    ]
+    ids = np.arange(1, len(coords) + 1)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(header) + "\n")
+        np.savetxt(f, np.column_stack([ids, coords]), fmt="%d %.0f %.0f")
+        f.write("EOF\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+def instance_name(n, kind="uniform", seed=0):
+    return f"{kind}{n}_s{seed}"
+
+
+def synthetic_instance(n, kind="uniform", seed=0, directory="."):
+    """
+    Path of the synthetic instance (n, kind, seed), written on first use.
+    The same arguments always give the same file.
+    """
+    name = instance_name(n, kind, seed)
+    path = os.path.join(directory, f"{name}.tsp")
+    if not os.path.exists(path):
+        write_tsp(
+            path,
+            name,
+            generate_coords(n, kind, seed),
+            comment=f"{kind} random instance, n={n}, seed={seed}",
+        )
+    return path
+
+
+# -------------------------------------------------
+# Reference tour
+# -------------------------------------------------
+
+def hilbert_tour_length(coords, metric="EUC_2D"):
+    """
+    Length of the tour visiting the cities along a Hilbert curve:
+    an O(n log n) reference, typically 25-40% above optimal on uniform
+    instances.
+    """
+    tour = hilbert_order(coords)
+    return float(CoordinateDistance(coords, metric).tour_length(tour))
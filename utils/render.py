@@ -0,0 +1,120 @@
+# utils/render.py
+
+import os
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+
+# -------------------------------------------------
+# Backend
+# -------------------------------------------------
+
+def use_headless():
+    """
+    Switch to the non-interactive Agg backend (batch jobs, no display).
+    """
+    plt.switch_backend("Agg")
+
+
+def is_headless():
+    return matplotlib.get_backend().lower() == "agg"
+
+
+def finish(fig, save_path=None, dpi=300, show=None):
+    """
+    Save the figure, show it only in interactive mode, and release it.
+
+    show=None shows unless the backend is headless.
+    """
+    if save_path:
+        directory = os.path.dirname(save_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fig.savefig(save_path, dpi=dpi, bbox_inches="tight")
+        print(f"[Saved] {save_path}")
+
+    if show is None:
+        show = not is_headless()
+    if show:
+        plt.show()
+
+    plt.close(fig)
+    return save_path
+
+
+# -------------------------------------------------
+# Segments
+# -------------------------------------------------
+
+def route_segments(coords, tour):
+    """
+    (n, 2, 2) segments of a closed tour, one per edge.
+    """
+    xy = np.asarray(coords, dtype=np.float64)
+    tour = np.asarray(tour, dtype=np.int64)
+    return np.stack([xy[tour], xy[np.roll(tour, -1)]], axis=1)
+
+
+def edge_segments(coords, a, b):
+    """
+    (m, 2, 2) segments of edges (a[i], b[i]).
+    """
+    xy = np.asarray(coords, dtype=np.float64)
+    return np.stack([xy[a], xy[b]], axis=1)
+
+
+# -------------------------------------------------
+# Artists (one collection per route / heatmap)
+# -------------------------------------------------
+
+def add_route(ax, coords, tour, color="tab:blue", linewidth=1.0,
+              alpha=1.0, label=None):
+    """
+    Draw a closed tour as a single LineCollection.
+    """
+    lines = LineCollection(
+        route_segments(coords, tour),
+        colors=[to_rgba(color, alpha)],
+        linewidths=linewidth,
+        label=label,
+    )
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return lines
+
+
+def add_edge_heatmap(ax, coords, a, b, count, color="tab:red",
+                     min_width=0.5, max_width=3.5):
+    """
+    Draw weighted edges as a single LineCollection: alpha and width
+    grow with count / count.max().
+    """
+    count = np.asarray(count, dtype=np.float64)
+    ratio = count / count.max() if count.size else count
+
+    colors = np.tile(to_rgba(color), (len(ratio), 1))
+    colors[:, 3] = ratio
+
+    lines = LineCollection(
+        edge_segments(coords, a, b),
+        colors=colors,
+        linewidths=min_width + (max_width - min_width) * ratio,
+    )
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return lines
+
+
+def add_cities(ax, coords, s=10, c="black", markers_above=20000):
+    """
+    City markers; skipped for very large instances where they would
+    only cover the route.
+    """
+    xy = np.asarray(coords)
+    if len(xy) > markers_above:
+        return None
+    return ax.scatter(xy[:, 0], xy[:, 1], s=s, c=c, zorder=3)
@@ -0,0 +1,654 @@
+# utils/result_store.py
+
+import argparse
+import json
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# one compressed columnar file per strategy directory
+STORE_NAME = "runs.npz"
+
+_RUN_FILE = re.compile(r"run_(\d+)\.json$")
+
+
+# -------------------------------------------------
+# Packing: list of run logs <-> column arrays
+# -------------------------------------------------
+
+def _is_numeric(values):
+    return all(
+        v is None or isinstance(v, (int, float, np.integer, np.floating))
+        for v in values
+    )
+
+
+def pack_runs(logs):
+    """
+    Convert run logs (engine format) into a dict of column arrays.
+
+    History series become (runs, max_len) matrices padded with NaN
+    (numeric) or -1 codes (strings, with a label table); best tours are
+    stacked into an int32 matrix; meta stays JSON.
+    """
+    logs = sorted(logs, key=lambda log: log["meta"].get("run_id", 0))
+    n_runs = len(logs)
+
+    columns = {
+        "run_id": np.array(
+            [log["meta"].get("run_id", i + 1) for i, log in enumerate(logs)],
+            dtype=np.int32,
+        ),
+        "best_length": np.array(
+            [log.get("best_length", np.nan) for log in logs], dtype=np.float64
+        ),
+        "runtime": np.array(
+            [log.get("runtime", np.nan) for log in logs], dtype=np.float64
+        ),
+        "meta": np.array(json.dumps([log["meta"] for log in logs])),
+        "events": np.array(json.dumps([log.get("events", []) for log in logs])),
+    }
+
+    tours = [log.get("best_individual") or [] for log in logs]
+    n_cities = max((len(t) for t in tours), default=0)
+    best = np.full((n_runs, n_cities), -1, dtype=np.int32)
+    for i, tour in enumerate(tours):
+        best[i, :len(tour)] = tour
+    columns["best_individual"] = best
+
+    keys = []
+    for log in logs:
+        for key in log.get("history", {}):
+            if key not in keys:
+                keys.append(key)
+
+    numeric_keys = []
+    label_keys = []
+
+    for key in keys:
+        series = [log.get("history", {}).get(key, []) for log in logs]
+        width = max((len(s) for s in series), default=0)
+        columns[f"len/{key}"] = np.array([len(s) for s in series], dtype=np.int32)
+
+        has_values = any(v is not None for s in series for v in s)
+        if has_values and all(_is_numeric(s) for s in series):
+            numeric_keys.append(key)
+            matrix = np.full((n_runs, width), np.nan)
+            for i, s in enumerate(series):
+                matrix[i, :len(s)] = [np.nan if v is None else v for v in s]
+            columns[f"h/{key}"] = matrix
+        else:
+            label_keys.append(key)
+            labels = sorted({str(v) for s in series for v in s})
+            index = {label: code for code, label in enumerate(labels)}
+            codes = np.full((n_runs, width), -1, dtype=np.int32)
+            for i, s in enumerate(series):
+                codes[i, :len(s)] = [index[str(v)] for v in s]
+            columns[f"c/{key}"] = codes
+            columns[f"labels/{key}"] = np.array(labels, dtype=str)
+
+    columns["numeric_keys"] = np.array(numeric_keys, dtype=str)
+    columns["label_keys"] = np.array(label_keys, dtype=str)
+    return columns
+
+
+def unpack_runs(columns, with_history=True):
+    """
+    Rebuild run logs (engine format) from column arrays.
+    """
+    meta = json.loads(str(columns["meta"]))
+    best = columns["best_individual"]
+    # stores written before events were logged have no events column
+    events = (
+        json.loads(str(columns["events"])) if "events" in columns
+        else [[] for _ in meta]
+    )
+
+    logs = []
+    for i, run_meta in enumerate(meta):
+        # legacy logs without meta run_id: the packed run_id column
+        run_meta.setdefault("run_id", int(columns["run_id"][i]))
+        tour = best[i]
+        logs.append({
+            "meta": run_meta,
+            "history": {},
+            "best_individual": tour[tour >= 0].tolist(),
+            "best_length": float(columns["best_length"][i]),
+            "runtime": float(columns["runtime"][i]),
+            "events": events[i],
+        })
+
+    if not with_history:
+        return logs
+
+    for key in columns["numeric_keys"]:
+        matrix = columns[f"h/{key}"]
+        lengths = columns[f"len/{key}"]
+        for i, log in enumerate(logs):
+            log["history"][key] = matrix[i, :lengths[i]].tolist()
+
+    for key in columns["label_keys"]:
+        codes = columns[f"c/{key}"]
+        labels = columns[f"labels/{key}"]
+        lengths = columns[f"len/{key}"]
+        for i, log in enumerate(logs):
+            log["history"][key] = [
+                None if label == "None" else str(label)
+                for label in labels[codes[i, :lengths[i]]]
+            ]
+
+    return logs
+
+
+# -------------------------------------------------
+# Files
+# -------------------------------------------------
+
+def write_store(path, logs):
+    """
+    Atomically write logs as a compressed columnar .npz.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_path, **pack_runs(logs))
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_store(path):
+    """
+    Open a store lazily: columns are decompressed on first access.
+    """
+    return np.load(path, allow_pickle=False)
+
+
+def history_matrix(columns, key):
+    """
+    (runs, max_len) NaN-padded matrix of one numeric history series.
+    """
+    return columns[f"h/{key}"]
+
+
+def json_run_files(strategy_dir):
+    """
+    {run_id: path} of per-run JSON logs in a strategy directory.
+    """
+    files = {}
+    for fname in os.listdir(strategy_dir):
+        match = _RUN_FILE.match(fname)
+        if match:
+            files[int(match.group(1))] = os.path.join(strategy_dir, fname)
+    return files
+
+
+def pending_json_files(strategy_dir, stored):
+    """
+    {run_id: path} of per-run JSON logs to read next to the store: runs
+    not in it, and runs whose JSON was rewritten after the store (a
+    recomputed run overrides its stored row).
+    """
+    files = json_run_files(strategy_dir)
+    store_path = os.path.join(strategy_dir, STORE_NAME)
+    if not stored or not os.path.exists(store_path):
+        return dict(sorted(files.items()))
+
+    store_mtime = os.stat(store_path).st_mtime_ns
+    return {
+        run_id: path for run_id, path in sorted(files.items())
+        if run_id not in stored or os.stat(path).st_mtime_ns > store_mtime
+    }
+
+
+def stored_run_ids(strategy_dir):
+    """
+    run_ids held by the strategy's store (only the run_id column is read).
+    """
+    store_path = os.path.join(strategy_dir, STORE_NAME)
+    if not os.path.exists(store_path):
+        return set()
+    with read_store(store_path) as columns:
+        return set(columns["run_id"].tolist())
+
+
+def load_strategy_runs(strategy_dir, with_history=True):
+    """
+    All run logs of one strategy directory. meta["run_id"] is always
+    set (from the file name or the store column when a log lacks it).
+
+    Runs come from the columnar store when present; per-run JSON files
+    not in the store or newer than it (written or recomputed after the
+    last conversion, see pending_json_files) are read as well and take
+    precedence over stored rows.
+    """
+    logs = []
+    stored = set()
+
+    store_path = os.path.join(strategy_dir, STORE_NAME)
+    if os.path.exists(store_path):
+        with read_store(store_path) as columns:
+            logs = unpack_runs(columns, with_history=with_history)
+        stored = {log["meta"].get("run_id") for log in logs}
+
+    pending = pending_json_files(strategy_dir, stored)
+    logs = [log for log in logs if log["meta"].get("run_id") not in pending]
+
+    for run_id, path in pending.items():
+        with open(path, "r", encoding="utf-8") as f:
+            log = json.load(f)
+        # legacy / hand-written logs without meta run_id: the file name
+        log.setdefault("meta", {}).setdefault("run_id", run_id)
+        if not with_history:
+            log.pop("history", None)
+        logs.append(log)
+
+    return logs
+
+
+def load_run(path, run_id=None):
+    """
+    One run log from a JSON file, a store file or a strategy directory.
+    Without run_id, the best run (lowest best_length) of a store /
+    directory is returned.
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    strategy_dir = os.path.dirname(path) if path.endswith(".npz") else path
+    logs = load_strategy_runs(strategy_dir)
+    if not logs:
+        raise FileNotFoundError(f"No runs found in {path}")
+
+    if run_id is not None:
+        for log in logs:
+            if log["meta"].get("run_id") == run_id:
+                return log
+        raise KeyError(f"run_id {run_id} not found in {path}")
+
+    return min(logs, key=lambda log: log["best_length"])
+
+
+# -------------------------------------------------
+# Projected, parallel loading
+# -------------------------------------------------
+
+# top-level values that can be projected as per-run finals
+FINAL_KEYS = ("best_length", "runtime")
+
+# below this many JSON files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+
+def _project_files(paths, history_keys, final_keys):
+    """
+    Worker: parse run JSON files and keep only the requested fields, so
+    full histories never cross the process boundary.
+    """
+    rows = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            log = json.load(f)
+        history = log.get("history", {})
+        rows.append((
+            log.get("meta", {}).get("run_id"),
+            [log.get(key) for key in final_keys],
+            [history.get(key, []) for key in history_keys],
+        ))
+    return rows
+
+
+def _stack_series(series):
+    """
+    Ragged list of series -> (runs, max_len) matrix: NaN-padded floats,
+    or a None-padded object matrix for non-numeric series.
+    """
+    width = max((len(s) for s in series), default=0)
+    has_values = any(v is not None for s in series for v in s)
+    if all(_is_numeric(s) for s in series) and (has_values or width == 0):
+        matrix = np.full((len(series), width), np.nan)
+        for i, s in enumerate(series):
+            matrix[i, :len(s)] = [np.nan if v is None else v for v in s]
+        return matrix
+
+    matrix = np.full((len(series), width), None, dtype=object)
+    for i, s in enumerate(series):
+        matrix[i, :len(s)] = s
+    return matrix
+
+
+def _vstack_padded(matrices):
+    """
+    Stack (runs_i, width_i) matrices, padding to the widest one.
+    """
+    width = max(m.shape[1] for m in matrices)
+    is_object = any(m.dtype == object for m in matrices)
+    fill = None if is_object else np.nan
+
+    out = np.full(
+        (sum(len(m) for m in matrices), width),
+        fill,
+        dtype=object if is_object else np.float64,
+    )
+    row = 0
+    for m in matrices:
+        out[row:row + len(m), :m.shape[1]] = m
+        row += len(m)
+    return out
+
+
+def _store_block(columns, history_keys, final_keys, skip=()):
+    """
+    Requested fields straight from a columnar store; only the columns
+    asked for are decompressed. Rows whose run_id is in `skip` are
+    dropped.
+    """
+    run_ids = columns["run_id"]
+    keep = ~np.isin(run_ids, list(skip))
+    run_ids = run_ids[keep]
+    finals = {key: columns[key][keep] for key in final_keys}
+
+    numeric = set(columns["numeric_keys"].tolist())
+    labelled = set(columns["label_keys"].tolist())
+    history = {}
+    for key in history_keys:
+        if key in numeric:
+            history[key] = columns[f"h/{key}"][keep]
+        elif key in labelled:
+            codes = columns[f"c/{key}"][keep]
+            labels = np.array(
+                [None if v == "None" else str(v) for v in columns[f"labels/{key}"]]
+                + [None],
+                dtype=object,
+            )
+            history[key] = labels[codes]  # code -1 -> trailing None
+        else:
+            history[key] = np.full((len(run_ids), 0), np.nan)
+
+    return run_ids, finals, history
+
+
+def _json_block(rows, history_keys, final_keys):
+    run_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    finals = {
+        key: np.array(
+            [np.nan if row[1][j] is None else row[1][j] for row in rows],
+            dtype=np.float64,
+        )
+        for j, key in enumerate(final_keys)
+    }
+    history = {
+        key: _stack_series([row[2][j] for row in rows])
+        for j, key in enumerate(history_keys)
+    }
+    return run_ids, finals, history
+
+
+def load_strategy_arrays(
+    strategy_dir, history_keys=(), final_keys=(), pool=None
+):
+    """
+    Projected runs of one strategy directory as NumPy arrays.
+
+    Only the requested fields are read: final_keys are per-run values
+    (see FINAL_KEYS), history_keys per-generation series (e.g.
+    "best_length", "diversity"). JSON files are parsed on `pool`
+    (a concurrent.futures executor) when given and there are enough
+    of them; a columnar store is read column by column.
+
+    Returns
+    -------
+    dict
+        {"run_id": (runs,) int array,
+         <final key>: (runs,) float array,
+         "history": {<key>: (runs, max_len) NaN-padded array}}
+        Runs are ordered by run_id.
+    """
+    history_keys = list(history_keys)
+    final_keys = list(final_keys)
+    unknown = set(final_keys) - set(FINAL_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown final keys: {sorted(unknown)}")
+
+    blocks = []
+
+    store_path = os.path.join(strategy_dir, STORE_NAME)
+    if os.path.exists(store_path):
+        with read_store(store_path) as columns:
+            stored = set(columns["run_id"].tolist())
+            pending = pending_json_files(strategy_dir, stored)
+            blocks.append(
+                _store_block(columns, history_keys, final_keys, skip=pending)
+            )
+    else:
+        pending = pending_json_files(strategy_dir, set())
+
+    paths = list(pending.values())
+
+    if paths:
+        if pool is not None and len(paths) >= PARALLEL_MIN_FILES:
+            n_chunks = 4 * getattr(pool, "_max_workers", 1)
+            size = -(-len(paths) // n_chunks)
+            chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+            rows = [
+                row
+                for chunk in pool.map(
+                    _project_files,
+                    chunks,
+                    [history_keys] * len(chunks),
+                    [final_keys] * len(chunks),
+                )
+                for row in chunk
+            ]
+        else:
+            rows = _project_files(paths, history_keys, final_keys)
+        blocks.append(_json_block(rows, history_keys, final_keys))
+
+    if not blocks:
+        return {
+            "run_id": np.empty(0, dtype=np.int64),
+            **{key: np.empty(0) for key in final_keys},
+            "history": {key: np.empty((0, 0)) for key in history_keys},
+        }
+
+    run_ids = np.concatenate([b[0] for b in blocks]).astype(np.int64)
+    order = np.argsort(run_ids, kind="stable")
+
+    arrays = {"run_id": run_ids[order]}
+    for key in final_keys:
+        arrays[key] = np.concatenate([b[1][key] for b in blocks])[order]
+    arrays["history"] = {
+        key: _vstack_padded([b[2][key] for b in blocks])[order]
+        for key in history_keys
+    }
+    return arrays
+
+
+def load_result_arrays(
+    result_root, history_keys=(), final_keys=(), workers=None, strategies=None
+):
+    """
+    load_strategy_arrays() for every strategy directory under
+    result_root, sharing one process pool.
+
+    Returns
+    -------
+    dict
+        {strategy: arrays}
+    """
+    names = strategies or sorted(
+        name for name in os.listdir(result_root)
+        if os.path.isdir(os.path.join(result_root, name))
+    )
+    workers = workers or os.cpu_count() or 1
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        return {
+            name: load_strategy_arrays(
+                os.path.join(result_root, name),
+                history_keys=history_keys,
+                final_keys=final_keys,
+                pool=pool,
+            )
+            for name in names
+        }
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+# -------------------------------------------------
+# Streaming history blocks
+# -------------------------------------------------
+
+def _iter_store_rows(archive, key, block_size):
+    """
+    (rows, width) blocks of a stored history matrix, decompressed
+    incrementally from the .npz member instead of as a whole.
+    """
+    with archive.open(f"h/{key}.npy") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+        if fortran_order or len(shape) != 2:
+            # not written by pack_runs: fall back to a full read
+            with archive.open(f"h/{key}.npy") as g:
+                matrix = np.lib.format.read_array(g)
+            for start in range(0, len(matrix), block_size):
+                yield np.asarray(matrix[start:start + block_size], dtype=np.float64)
+            return
+
+        n_rows, width = shape
+        row_bytes = width * dtype.itemsize
+        for start in range(0, n_rows, block_size):
+            rows = min(block_size, n_rows - start)
+            buffer = f.read(rows * row_bytes)
+            yield np.frombuffer(buffer, dtype=dtype).reshape(rows, width).astype(
+                np.float64
+            )
+
+
+def iter_history_blocks(strategy_dir, history_keys, block_size=256):
+    """
+    Numeric history series of a strategy directory in blocks of at most
+    block_size runs, so that curve statistics can be computed without
+    holding every run in memory.
+
+    Store rows come first, then the per-run JSON files not in the store
+    or newer than it (their stored rows are skipped, see
+    pending_json_files). Keys that are missing or non-numeric (label series) give (rows, 0)
+    blocks.
+
+    Yields
+    ------
+    dict
+        {key: (rows, width) NaN-padded float array}
+    """
+    history_keys = list(history_keys)
+
+    store_path = os.path.join(strategy_dir, STORE_NAME)
+    pending = None
+    if os.path.exists(store_path):
+        with read_store(store_path) as columns:
+            run_ids = columns["run_id"]
+            numeric = set(columns["numeric_keys"].tolist())
+            pending = pending_json_files(strategy_dir, set(run_ids.tolist()))
+            keep = ~np.isin(run_ids, list(pending))
+
+            with zipfile.ZipFile(store_path) as archive:
+                readers = {
+                    key: _iter_store_rows(archive, key, block_size)
+                    for key in history_keys
+                    if key in numeric
+                }
+                for start in range(0, len(run_ids), block_size):
+                    rows = min(block_size, len(run_ids) - start)
+                    block_keep = keep[start:start + rows]
+                    block = {
+                        key: next(readers[key]) if key in readers
+                        else np.full((rows, 0), np.nan)
+                        for key in history_keys
+                    }
+                    if block_keep.any():
+                        yield {
+                            key: matrix[block_keep]
+                            for key, matrix in block.items()
+                        }
+
+    if pending is None:
+        pending = pending_json_files(strategy_dir, set())
+    paths = list(pending.values())
+    for start in range(0, len(paths), block_size):
+        chunk = _project_files(paths[start:start + block_size], history_keys, [])
+        block = {}
+        for j, key in enumerate(history_keys):
+            matrix = _stack_series([row[2][j] for row in chunk])
+            if matrix.dtype == object:
+                matrix = np.full((len(chunk), 0), np.nan)
+            block[key] = matrix
+        yield block
+
+
+# -------------------------------------------------
+# Conversion
+# -------------------------------------------------
+
+def convert_strategy_dir(strategy_dir, delete_json=False):
+    """
+    Pack every run of a strategy directory into its store. JSON files
+    newer than the existing store replace their stored rows.
+    """
+    logs = load_strategy_runs(strategy_dir)
+    if not logs:
+        return None
+
+    store_path = write_store(os.path.join(strategy_dir, STORE_NAME), logs)
+
+    if delete_json:
+        for path in json_run_files(strategy_dir).values():
+            os.remove(path)
+
+    return store_path
+
+
+def convert_results(result_root, delete_json=False):
+    """
+    Convert all strategy directories under result_root.
+    """
+    converted = []
+    for strategy_name in sorted(os.listdir(result_root)):
+        strategy_dir = os.path.join(result_root, strategy_name)
+        if not os.path.isdir(strategy_dir):
+            continue
+        path = convert_strategy_dir(strategy_dir, delete_json=delete_json)
+        if path:
+            converted.append(path)
+            print(f"[Saved] {path}")
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert per-run JSON logs into columnar .npz stores"
+    )
+    parser.add_argument(
+        "result_root",
+        help="Directory with one sub-directory of run_*.json per strategy"
+    )
+    parser.add_argument(
+        "--delete_json",
+        action="store_true",
+        help="Remove the JSON logs after a successful conversion"
+    )
+    args = parser.parse_args()
+
+    convert_results(args.result_root, delete_json=args.delete_json)
+
+
+if __name__ == "__main__":
+    main()
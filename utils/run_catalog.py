@@ -0,0 +1,440 @@
+# utils/run_catalog.py
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+
+import numpy as np
+
+# one catalog per result root, next to the strategy directories
+CATALOG_NAME = "catalog.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    strategy     TEXT    NOT NULL,
+    run_id       INTEGER NOT NULL,
+    path         TEXT,
+    tsp          TEXT,
+    num_cities   INTEGER,
+    seed         INTEGER,
+    timestamp    TEXT,
+    generations  INTEGER,
+    best_length  REAL,
+    runtime      REAL,
+    config_hash  TEXT,
+    config       TEXT,
+    fingerprint  TEXT,
+    PRIMARY KEY (strategy, run_id)
+);
+
+CREATE INDEX IF NOT EXISTS runs_config ON runs (config_hash);
+
+CREATE TABLE IF NOT EXISTS strategy_stats (
+    strategy          TEXT PRIMARY KEY,
+    n_runs            INTEGER NOT NULL,
+    best_sum          REAL NOT NULL,
+    best_sumsq        REAL NOT NULL,
+    best_min          REAL,
+    best_max          REAL,
+    runtime_sum       REAL NOT NULL,
+    runtime_sumsq     REAL NOT NULL,
+    n_best            INTEGER,
+    n_runtime         INTEGER
+);
+"""
+
+# strategy_stats columns; n_best / n_runtime count the non-NULL values
+# behind each statistic (a run may lack best_length or runtime)
+STATS_COLUMNS = (
+    "strategy", "n_runs", "best_sum", "best_sumsq", "best_min", "best_max",
+    "runtime_sum", "runtime_sumsq", "n_best", "n_runtime",
+)
+
+RUN_COLUMNS = (
+    "strategy", "run_id", "path", "tsp", "num_cities", "seed", "timestamp",
+    "generations", "best_length", "runtime", "config_hash", "config",
+    "fingerprint",
+)
+
+
+def config_hash(config):
+    """
+    Stable short hash of a JSON-serializable config.
+    """
+    text = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def catalog_path(result_root):
+    return os.path.join(result_root, CATALOG_NAME)
+
+
+class RunCatalog:
+    """
+    SQLite index of finished runs.
+
+    One row per (strategy, run_id) with metadata and final metrics, plus
+    per-strategy running sums (count, sum, sum of squares, min, max) that
+    are updated in the same transaction as the run row, so summaries are
+    O(strategies) to read regardless of the number of runs.
+
+    Safe to share between worker processes: the database uses WAL mode
+    and every update takes the write lock up front.
+    """
+
+    def __init__(self, path, timeout=60.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._conn = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        # catalogs created before a column existed get it added (NULL)
+        existing = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(runs)")
+        }
+        for column in RUN_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE runs ADD COLUMN {column}")
+
+        # per-statistic counts: add them and rebuild the sums from runs
+        existing = {
+            row[1]
+            for row in self._conn.execute("PRAGMA table_info(strategy_stats)")
+        }
+        missing = [c for c in ("n_best", "n_runtime") if c not in existing]
+        if missing:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for column in missing:
+                self._conn.execute(
+                    f"ALTER TABLE strategy_stats ADD COLUMN {column} INTEGER"
+                )
+            strategies = [
+                r[0] for r in self._conn.execute(
+                    "SELECT DISTINCT strategy FROM runs"
+                )
+            ]
+            for strategy in strategies:
+                self._refresh_stats(strategy)
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --------------------------------------------------
+    # Updates
+    # --------------------------------------------------
+
+    def record_run(self, logs, path=None, config=None, seed=None):
+        """
+        Insert or replace one run and update its strategy's aggregates.
+
+        Parameters
+        ----------
+        logs : dict
+            Engine log (only meta / best_length / runtime are read)
+        path : str, optional
+            Where the full log lives
+        config : dict, optional
+            Strategy + engine configuration, hashed into config_hash
+            (default: meta["config"])
+        seed : int, optional
+            (default: meta["seed"])
+        """
+        meta = logs.get("meta", {})
+        if config is None:
+            config = meta.get("config")
+        if seed is None:
+            seed = meta.get("seed")
+
+        row = {
+            "strategy": meta.get("strategy"),
+            "run_id": meta.get("run_id"),
+            "path": path,
+            "tsp": meta.get("tsp"),
+            "num_cities": meta.get("num_cities", meta.get("n_cities")),
+            "seed": seed,
+            "timestamp": meta.get("timestamp"),
+            "generations": meta.get("generations"),
+            "best_length": _as_float(logs.get("best_length")),
+            "runtime": _as_float(logs.get("runtime")),
+            "config_hash": config_hash(config) if config is not None else None,
+            "config": (
+                json.dumps(config, sort_keys=True, default=str)
+                if config is not None else None
+            ),
+            "fingerprint": meta.get("fingerprint"),
+        }
+        if row["strategy"] is None or row["run_id"] is None:
+            raise ValueError("logs['meta'] needs 'strategy' and 'run_id'")
+
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            replaced = conn.execute(
+                "SELECT 1 FROM runs WHERE strategy = ? AND run_id = ?",
+                (row["strategy"], row["run_id"]),
+            ).fetchone() is not None
+
+            conn.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(RUN_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(RUN_COLUMNS))})",
+                [row[c] for c in RUN_COLUMNS],
+            )
+
+            if replaced:
+                # min / max cannot be "subtracted": recompute this strategy
+                self._refresh_stats(row["strategy"])
+            else:
+                self._add_to_stats(
+                    row["strategy"], row["best_length"], row["runtime"]
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _add_to_stats(self, strategy, best_length, runtime):
+        # missing values count in n_runs only, not in their statistic
+        best = best_length if best_length is not None else 0.0
+        rt = runtime if runtime is not None else 0.0
+        self._conn.execute(
+            f"""
+            INSERT INTO strategy_stats ({', '.join(STATS_COLUMNS)})
+            VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (strategy) DO UPDATE SET
+                n_runs        = n_runs + 1,
+                n_best        = n_best + excluded.n_best,
+                n_runtime     = n_runtime + excluded.n_runtime,
+                best_sum      = best_sum + excluded.best_sum,
+                best_sumsq    = best_sumsq + excluded.best_sumsq,
+                best_min      = MIN(COALESCE(best_min, excluded.best_min),
+                                    COALESCE(excluded.best_min, best_min)),
+                best_max      = MAX(COALESCE(best_max, excluded.best_max),
+                                    COALESCE(excluded.best_max, best_max)),
+                runtime_sum   = runtime_sum + excluded.runtime_sum,
+                runtime_sumsq = runtime_sumsq + excluded.runtime_sumsq
+            """,
+            (strategy, best, best * best, best_length, best_length,
+             rt, rt * rt,
+             int(best_length is not None), int(runtime is not None)),
+        )
+
+    def _refresh_stats(self, strategy):
+        self._conn.execute(
+            "DELETE FROM strategy_stats WHERE strategy = ?", (strategy,)
+        )
+        self._conn.execute(
+            f"""
+            INSERT INTO strategy_stats ({', '.join(STATS_COLUMNS)})
+            SELECT strategy, COUNT(*),
+                   TOTAL(best_length), TOTAL(best_length * best_length),
+                   MIN(best_length), MAX(best_length),
+                   TOTAL(runtime), TOTAL(runtime * runtime),
+                   COUNT(best_length), COUNT(runtime)
+            FROM runs WHERE strategy = ? GROUP BY strategy
+            """,
+            (strategy,),
+        )
+
+    def remove_strategy(self, strategy):
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._conn.execute("DELETE FROM runs WHERE strategy = ?", (strategy,))
+        self._conn.execute(
+            "DELETE FROM strategy_stats WHERE strategy = ?", (strategy,)
+        )
+        self._conn.execute("COMMIT")
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+
+    def strategies(self):
+        rows = self._conn.execute(
+            "SELECT strategy FROM strategy_stats ORDER BY strategy"
+        )
+        return [r[0] for r in rows]
+
+    def summary(self):
+        """
+        Per-strategy aggregates from the running sums.
+
+        Returns
+        -------
+        dict
+            {strategy: {"n_runs", "best_mean", "best_std", "best_min",
+                        "best_max", "runtime_mean", "runtime_std"}}
+            Statistics are over the runs that have the value (NaN if
+            none); n_runs counts every run.
+        """
+        def moments(total, sumsq, n):
+            if not n:
+                return np.nan, np.nan
+            mean = total / n
+            return mean, float(np.sqrt(max(sumsq / n - mean ** 2, 0.0)))
+
+        result = {}
+        for (strategy, n, b_sum, b_sq, b_min, b_max, r_sum, r_sq,
+             n_best, n_runtime) in self._conn.execute(
+            f"SELECT {', '.join(STATS_COLUMNS)} FROM strategy_stats "
+            "ORDER BY strategy"
+        ):
+            b_mean, b_std = moments(b_sum, b_sq, n_best)
+            r_mean, r_std = moments(r_sum, r_sq, n_runtime)
+            result[strategy] = {
+                "n_runs": n,
+                "best_mean": b_mean,
+                "best_std": b_std,
+                "best_min": np.nan if b_min is None else b_min,
+                "best_max": np.nan if b_max is None else b_max,
+                "runtime_mean": r_mean,
+                "runtime_std": r_std,
+            }
+        return result
+
+    def runs(self, strategy=None, columns=None, config=None, limit=None):
+        """
+        Run rows as dicts, ordered by (strategy, run_id).
+
+        Parameters
+        ----------
+        strategy : str, optional
+        columns : sequence of str, optional
+            Subset of RUN_COLUMNS (default: all)
+        config : str, optional
+            Only runs with this config_hash
+        limit : int, optional
+            At most this many runs per query
+        """
+        columns = list(columns or RUN_COLUMNS)
+        unknown = set(columns) - set(RUN_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown catalog columns: {sorted(unknown)}")
+
+        where, params = [], []
+        if strategy is not None:
+            where.append("strategy = ?")
+            params.append(strategy)
+        if config is not None:
+            where.append("config_hash = ?")
+            params.append(config)
+
+        sql = f"SELECT {', '.join(columns)} FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY strategy, run_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        return [dict(zip(columns, row)) for row in self._conn.execute(sql, params)]
+
+    def fingerprints(self, strategy):
+        """
+        {run_id: fingerprint} of one strategy's catalogued runs.
+        """
+        return dict(self._conn.execute(
+            "SELECT run_id, fingerprint FROM runs WHERE strategy = ?",
+            (strategy,),
+        ))
+
+    def final_metric(self, metric="best_length"):
+        """
+        {strategy: np.ndarray of one final metric, ordered by run_id}.
+        """
+        if metric not in ("best_length", "runtime"):
+            raise ValueError(f"Unknown final metric: {metric}")
+
+        values = {}
+        for strategy, value in self._conn.execute(
+            f"SELECT strategy, {metric} FROM runs ORDER BY strategy, run_id"
+        ):
+            values.setdefault(strategy, []).append(
+                np.nan if value is None else value
+            )
+        return {s: np.asarray(v, dtype=np.float64) for s, v in values.items()}
+
+
+def _as_float(value):
+    return None if value is None else float(value)
+
+
+# -------------------------------------------------
+# Building from existing results
+# -------------------------------------------------
+
+def open_catalog(result_root):
+    return RunCatalog(catalog_path(result_root))
+
+
+def rebuild_catalog(result_root):
+    """
+    (Re)index every run found under result_root (JSON logs and runs.npz
+    stores). Needed once for results written before the catalog existed.
+    """
+    from utils.result_store import STORE_NAME, load_strategy_runs
+
+    with open_catalog(result_root) as catalog:
+        for strategy_name in sorted(os.listdir(result_root)):
+            strategy_dir = os.path.join(result_root, strategy_name)
+            if not os.path.isdir(strategy_dir):
+                continue
+
+            catalog.remove_strategy(strategy_name)
+            store_path = os.path.join(strategy_dir, STORE_NAME)
+
+            # run_id falls back to the file name / store column
+            for log in load_strategy_runs(strategy_dir, with_history=False):
+                log["meta"].setdefault("strategy", strategy_name)
+                run_id = log["meta"]["run_id"]
+                json_path = os.path.join(strategy_dir, f"run_{run_id:03d}.json")
+                path = json_path if os.path.exists(json_path) else store_path
+                catalog.record_run(log, path=path)
+
+        return catalog.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build / inspect the SQLite run catalog"
+    )
+    parser.add_argument("result_root")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Re-index all run logs and stores under result_root"
+    )
+    args = parser.parse_args()
+
+    if args.rebuild:
+        summary = rebuild_catalog(args.result_root)
+    else:
+        with open_catalog(args.result_root) as catalog:
+            summary = catalog.summary()
+
+    for strategy, stats in summary.items():
+        print(
+            f"{strategy:<16} runs={stats['n_runs']:<5} "
+            f"best={stats['best_mean']:.2f}±{stats['best_std']:.2f} "
+            f"[{stats['best_min']:.2f}, {stats['best_max']:.2f}] "
+            f"runtime={stats['runtime_mean']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
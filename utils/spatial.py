@@ -0,0 +1,163 @@
+# utils/spatial.py
+
+import numpy as np
+
+
+# -------------------------------------------------
+# k-nearest-neighbour candidate lists
+# -------------------------------------------------
+
+def knn_candidates(coords, k=10, points_per_cell=4):
+    """
+    k nearest neighbours of every city via a uniform grid.
+
+    Cities are bucketed into square cells holding ~points_per_cell
+    cities on average. For each cell, candidates are gathered from a
+    growing square ring of cells until the k-th neighbour of every city
+    in the cell is provably inside the ring, so the result is exact
+    without an O(n^2) distance sort.
+
+    Neighbours are ranked by Euclidean distance on coords (exact for
+    EUC_2D / CEIL_2D / ATT, a close proxy for the other metrics).
+
+    Parameters
+    ----------
+    coords : array-like, shape (n, 2)
+    k : int
+        Neighbours per city (capped at n - 1)
+
+    Returns
+    -------
+    np.ndarray, shape (n, k), dtype int32
+        Neighbour ids, nearest first
+    """
+    xy = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    n = len(xy)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.zeros((n, 0), dtype=np.int32)
+
+    # ---- grid layout ----
+    lo = xy.min(axis=0)
+    span = np.maximum(xy.max(axis=0) - lo, 1e-12)
+    n_cells = max(1, n // points_per_cell)
+    side = max(np.sqrt(span[0] * span[1] / n_cells), span.max() / n_cells)
+
+    gx = int(span[0] // side) + 1
+    gy = int(span[1] // side) + 1
+    cx = np.minimum(((xy[:, 0] - lo[0]) // side).astype(np.int64), gx - 1)
+    cy = np.minimum(((xy[:, 1] - lo[1]) // side).astype(np.int64), gy - 1)
+    cell = cy * gx + cx
+
+    # points sorted by cell id; a row of cells is one contiguous slice
+    order = np.argsort(cell, kind="stable")
+    bounds = np.searchsorted(cell[order], np.arange(gx * gy + 1))
+
+    neighbors = np.empty((n, k), dtype=np.int32)
+
+    for c in np.unique(cell):
+        members = order[bounds[c]:bounds[c + 1]]
+        ccx, ccy = c % gx, c // gx
+        r = 1
+
+        while True:
+            x0, x1 = max(ccx - r, 0), min(ccx + r, gx - 1)
+            rows = range(max(ccy - r, 0), min(ccy + r, gy - 1) + 1)
+            cand = np.concatenate([
+                order[bounds[row * gx + x0]:bounds[row * gx + x1 + 1]]
+                for row in rows
+            ])
+
+            covers_all = x1 - x0 + 1 == gx and len(rows) == gy
+            if len(cand) > k or covers_all:
+                d = np.hypot(
+                    xy[members, 0, None] - xy[None, cand, 0],
+                    xy[members, 1, None] - xy[None, cand, 1],
+                )
+                d[cand[None, :] == members[:, None]] = np.inf
+
+                part = np.argpartition(d, k - 1, axis=1)[:, :k]
+                kth = np.take_along_axis(d, part, axis=1).max()
+
+                # anything outside the ring is farther than r * side
+                if kth <= r * side or covers_all:
+                    rank = np.take_along_axis(d, part, axis=1).argsort(axis=1)
+                    neighbors[members] = cand[np.take_along_axis(part, rank, axis=1)]
+                    break
+            r += 1
+
+    return neighbors
+
+
+def knn_from_distance(distance, k=10, block_size=256):
+    """
+    k nearest neighbours from a DistanceProvider (instances without
+    coordinates, e.g. EXPLICIT). Costs O(n^2) lookups, done row-block
+    by row-block.
+    """
+    n = distance.num_cities
+    k = min(k, n - 1)
+    neighbors = np.empty((n, k), dtype=np.int32)
+    cities = np.arange(n)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        rows = np.arange(start, stop)
+        d = distance.edges(
+            np.repeat(rows, n).reshape(-1, n),
+            np.broadcast_to(cities, (len(rows), n)),
+        ).astype(np.float64)
+        d[np.arange(len(rows)), rows] = np.inf
+
+        part = np.argpartition(d, k - 1, axis=1)[:, :k]
+        rank = np.take_along_axis(d, part, axis=1).argsort(axis=1)
+        neighbors[start:stop] = np.take_along_axis(part, rank, axis=1)
+
+    return neighbors
+
+
+# -------------------------------------------------
+# Space-filling curve ordering
+# -------------------------------------------------
+
+def hilbert_index(coords, bits=16):
+    """
+    Position of each point along a Hilbert curve over the bounding box.
+
+    Coordinates are quantized to a 2^bits x 2^bits grid; all points are
+    processed together, one bit level per iteration.
+
+    Returns
+    -------
+    np.ndarray, shape (n,), dtype int64
+    """
+    xy = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    side = 1 << bits
+
+    lo = xy.min(axis=0)
+    span = np.maximum(xy.max(axis=0) - lo, 1e-12)
+    grid = ((xy - lo) / span * (side - 1)).astype(np.int64)
+    x, y = grid[:, 0].copy(), grid[:, 1].copy()
+
+    d = np.zeros(len(xy), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+
+        # rotate the quadrant so the sub-curve has canonical orientation
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(~ry, y, x), np.where(~ry, x, y)
+        s >>= 1
+
+    return d
+
+
+def hilbert_order(coords, bits=16):
+    """
+    City permutation along the Hilbert curve: order[new_id] = old_id.
+    """
+    return np.argsort(hilbert_index(coords, bits), kind="stable")
@@ -1,44 +1,158 @@
 # utils/tsp_loader.py
 
+import hashlib
 import os
-import math
+import re
 import urllib.request
 
+import numpy as np
+
+from utils.distance import (
+    METRICS,
+    CoordinateDistance,
+    DenseDistance,
+    PackedDistance,
+    build_distance_matrix,
+    build_packed_distances,
+    pack_symmetric,
+)
+from utils.spatial import hilbert_order, knn_candidates, knn_from_distance
+
 TSPLIB_BASE_URL = "https://raw.githubusercontent.com/mastqe/tsplib/master/"
 
+# bump when the on-disk matrix layout changes
+CACHE_VERSION = 1
+
 
 class TSPInstance:
     """
     Lightweight TSP instance for GA solver
     """
 
-    def __init__(self, name, coords):
+    def __init__(
+        self,
+        name,
+        coords,
+        distance_matrix=None,
+        metric="EUC_2D",
+        matrix_free=False,
+        cache_rows=0,
+        packed=False,
+        original_ids=None,
+    ):
         """
         Parameters
         ----------
         name : str
             Instance name
-        coords : list of (x, y)
-            City coordinates
+        coords : list of (x, y) or None
+            City coordinates (None for EXPLICIT instances without
+            display data)
+        distance_matrix : np.ndarray or None
+            Precomputed matrix (e.g. a memory-mapped cache), or its
+            packed upper triangle when packed=True.
+            Computed from coords when omitted.
+        metric : str
+            TSPLIB EDGE_WEIGHT_TYPE of the distances
+        matrix_free : bool
+            Do not build a matrix; distances are computed from coords
+            on demand (distance_matrix is then None).
+        cache_rows : int
+            LRU row cache size of the matrix-free provider (row()
+            lookups only; tour evaluation is not cached)
+        packed : bool
+            Store only the upper triangle (symmetric instances);
+            distance_matrix is then None and lookups go through
+            self.distance.
+        original_ids : np.ndarray or None
+            If the cities were renumbered, original_ids[new_id] is the
+            city's index in the source file (see to_original()).
         """
         self.name = name
         self.coords = coords
-        self.num_cities = len(coords)
-        self.distance_matrix = self._compute_distance_matrix()
+        self.metric = metric
+
+        # (n, k) int32 k-NN candidate lists, see build_neighbors()
+        self.neighbors = None
+
+        # renumbering: new -> original and original -> new city ids
+        self.original_ids = None
+        self.new_ids = None
+        if original_ids is not None:
+            self.original_ids = np.asarray(original_ids, dtype=np.int64)
+            self.new_ids = np.empty_like(self.original_ids)
+            self.new_ids[self.original_ids] = np.arange(len(original_ids))
+
+        if coords is None and (distance_matrix is None or matrix_free):
+            raise ValueError(
+                "TSPInstance without coords requires a distance_matrix"
+            )
+        if coords is not None:
+            self.num_cities = len(coords)
+        elif packed and np.ndim(distance_matrix) == 1:
+            self.num_cities = int((1 + np.sqrt(1 + 8 * len(distance_matrix))) // 2)
+        else:
+            self.num_cities = len(distance_matrix)
+
+        if matrix_free:
+            self.distance_matrix = None
+            self.distance = CoordinateDistance(
+                coords, metric=metric, cache_rows=cache_rows
+            )
+        elif packed:
+            if distance_matrix is None:
+                distance_matrix = build_packed_distances(coords, metric)
+            elif np.ndim(distance_matrix) == 2:
+                distance_matrix = pack_symmetric(distance_matrix)
+            self.distance_matrix = None
+            self.distance = PackedDistance(distance_matrix, self.num_cities)
+        else:
+            if distance_matrix is None:
+                distance_matrix = self._compute_distance_matrix()
+            self.distance_matrix = distance_matrix
+            self.distance = DenseDistance(distance_matrix)
+
+    def _compute_distance_matrix(self, block_size=1024):
+        """
+        Distance matrix as a C-contiguous float64 ndarray
+        (see utils.distance.build_distance_matrix).
+        """
+        return build_distance_matrix(self.coords, self.metric, block_size)
 
-    def _compute_distance_matrix(self):
-        n = self.num_cities
-        dist = [[0.0] * n for _ in range(n)]
+    def build_neighbors(self, k=10):
+        """
+        Precompute k-nearest-neighbour candidate lists.
+
+        Uses a spatial grid over coords (no distance matrix needed);
+        instances without coordinates fall back to distance rows.
+
+        Returns
+        -------
+        np.ndarray, shape (num_cities, k), dtype int32
+        """
+        if self.coords is not None:
+            self.neighbors = knn_candidates(self.coords, k)
+        else:
+            self.neighbors = knn_from_distance(self.distance, k)
+        return self.neighbors
 
-        for i in range(n):
-            x1, y1 = self.coords[i]
-            for j in range(i + 1, n):
-                x2, y2 = self.coords[j]
-                d = math.hypot(x1 - x2, y1 - y2)
-                dist[i][j] = d
-                dist[j][i] = d
+    def to_original(self, tour):
+        """
+        Translate a tour from internal to source-file city ids.
+        """
+        tour = np.asarray(tour)
+        if self.original_ids is None:
+            return tour
+        return self.original_ids[tour]
 
-        return dist
+    def from_original(self, tour):
+        """
+        Translate a tour from source-file to internal city ids.
+        """
+        tour = np.asarray(tour)
+        if self.new_ids is None:
+            return tour
+        return self.new_ids[tour]
 
     def evaluate(self, tour):
         """
@@ -54,13 +168,7 @@ class TSPInstance:
         float
             Total tour length
         """
-        length = 0.0
-        n = len(tour)
-        for i in range(n):
-            a = tour[i]
-            b = tour[(i + 1) % n]
-            length += self.distance_matrix[a][b]
-        return length
+        return self.distance.tour_length(np.asarray(tour, dtype=np.int64))
 
     def __repr__(self):
         return f"<TSPInstance {self.name}, cities={self.num_cities}>"
@@ -80,63 +188,280 @@ def download_tsp(filename, save_path):
     print(f"[INFO] Saved to {save_path}")
 
 
-def parse_tsp_file(filepath):
+# section keywords whose body is a block of numbers
+NUMERIC_SECTIONS = (
+    "NODE_COORD_SECTION",
+    "DISPLAY_DATA_SECTION",
+    "EDGE_WEIGHT_SECTION",
+    "DEPOT_SECTION",
+    "FIXED_EDGES_SECTION",
+    "TOUR_SECTION",
+)
+
+# next keyword line (any line starting with a letter) ends a section body
+_KEYWORD_LINE = re.compile(r"^[ \t]*[A-Za-z]", re.MULTILINE)
+
+# EDGE_WEIGHT_FORMAT -> (triangle, include diagonal); *_COL formats of a
+# symmetric matrix are the transposed *_ROW layouts
+EXPLICIT_FORMATS = {
+    "UPPER_ROW": ("upper", False),
+    "LOWER_ROW": ("lower", False),
+    "UPPER_DIAG_ROW": ("upper", True),
+    "LOWER_DIAG_ROW": ("lower", True),
+    "UPPER_COL": ("lower", False),
+    "LOWER_COL": ("upper", False),
+    "UPPER_DIAG_COL": ("lower", True),
+    "LOWER_DIAG_COL": ("upper", True),
+}
+
+
+def _parse_numbers(body):
     """
-    Minimal TSPLIB parser (supports EUC_2D only)
+    Parse a whitespace separated block of numbers in one NumPy call.
     """
-    name = None
-    dimension = None
-    edge_weight_type = None
-    coords = []
+    values = np.fromstring(body, dtype=np.float64, sep=" ")
+    if values.size == 0 and body.strip():
+        raise ValueError("Malformed numeric section")
+    return values
 
-    with open(filepath, "r", encoding="utf-8") as f:
-        lines = f.readlines()
 
-    reading_coords = False
+def _node_table(values, dimension, section):
+    """
+    Reshape "id x y" rows, ordered by node id.
+    """
+    if dimension is None:
+        raise ValueError(f"{section} requires DIMENSION")
+    if values.size != dimension * 3:
+        raise ValueError(
+            f"DIMENSION mismatch: expected {dimension}, "
+            f"got {values.size / 3:g} rows in {section} "
+            f"(only 2D coordinates are supported)"
+        )
+    table = values.reshape(dimension, 3)
+    ids = table[:, 0].astype(np.int64)
+    if not np.array_equal(ids, np.arange(1, dimension + 1)):
+        table = table[np.argsort(ids, kind="stable")]
+    return np.ascontiguousarray(table[:, 1:3])
+
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
+def explicit_matrix(values, dimension, edge_weight_format):
+    """
+    Build a full n x n matrix from an EDGE_WEIGHT_SECTION.
+    """
+    n = dimension
+
+    if edge_weight_format == "FULL_MATRIX":
+        if values.size != n * n:
+            raise ValueError(
+                f"FULL_MATRIX expects {n * n} weights, got {values.size}"
+            )
+        return np.ascontiguousarray(values.reshape(n, n))
 
-        if line.startswith("NAME"):
-            name = line.split(":", 1)[1].strip()
+    if edge_weight_format not in EXPLICIT_FORMATS:
+        raise NotImplementedError(
+            f"EDGE_WEIGHT_FORMAT '{edge_weight_format}' is not supported"
+        )
 
-        elif line.startswith("DIMENSION"):
-            dimension = int(line.split(":", 1)[1])
+    triangle, diagonal = EXPLICIT_FORMATS[edge_weight_format]
+    k = 0 if diagonal else 1
+    if triangle == "upper":
+        rows, cols = np.triu_indices(n, k)
+    else:
+        rows, cols = np.tril_indices(n, -k)
 
-        elif line.startswith("EDGE_WEIGHT_TYPE"):
-            edge_weight_type = line.split(":", 1)[1].strip()
+    if values.size != rows.size:
+        raise ValueError(
+            f"{edge_weight_format} expects {rows.size} weights, "
+            f"got {values.size}"
+        )
 
-        elif line.startswith("NODE_COORD_SECTION"):
-            reading_coords = True
+    matrix = np.zeros((n, n), dtype=np.float64)
+    matrix[rows, cols] = values
+    matrix[cols, rows] = values
+    return matrix
 
-        elif line.startswith("EOF"):
-            break
 
-        elif reading_coords:
-            parts = line.split()
-            if len(parts) >= 3:
-                _, x, y = parts[:3]
-                coords.append((float(x), float(y)))
+def parse_tsp_file(filepath):
+    """
+    TSPLIB parser.
+
+    Supports EDGE_WEIGHT_TYPE EUC_2D, CEIL_2D, MAN_2D, ATT, GEO and
+    EXPLICIT (FULL_MATRIX and the *_ROW / *_COL triangular formats).
+    Each numeric section is parsed with a single NumPy call instead of
+    per-line splitting.
+
+    Returns
+    -------
+    name : str
+    coords : np.ndarray (n, 2) or None
+        NODE_COORD_SECTION, or DISPLAY_DATA_SECTION for EXPLICIT
+        instances; None if the file has neither
+    edge_weight_type : str
+    weights : np.ndarray (n, n) or None
+        Full matrix for EXPLICIT instances
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    header = {}
+    sections = {}
+    pos = 0
+
+    while pos < len(text):
+        eol = text.find("\n", pos)
+        if eol == -1:
+            eol = len(text)
+        line = text[pos:eol].strip()
+        pos = eol + 1
+
+        if not line:
+            continue
 
-    if edge_weight_type != "EUC_2D":
+        key = line.split(":", 1)[0].strip()
+
+        if key == "EOF":
+            break
+
+        if key in NUMERIC_SECTIONS:
+            match = _KEYWORD_LINE.search(text, pos)
+            end = match.start() if match else len(text)
+            sections[key] = _parse_numbers(text[pos:end])
+            pos = end
+
+        elif ":" in line:
+            header[key] = line.split(":", 1)[1].strip()
+
+    name = header.get("NAME")
+    dimension = int(header["DIMENSION"]) if "DIMENSION" in header else None
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE")
+
+    coords = None
+    weights = None
+
+    if edge_weight_type == "EXPLICIT":
+        if "EDGE_WEIGHT_SECTION" not in sections:
+            raise ValueError("EXPLICIT instance without EDGE_WEIGHT_SECTION")
+        if dimension is None:
+            raise ValueError("EXPLICIT instance without DIMENSION")
+        weights = explicit_matrix(
+            sections["EDGE_WEIGHT_SECTION"],
+            dimension,
+            header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX"),
+        )
+        for section in ("DISPLAY_DATA_SECTION", "NODE_COORD_SECTION"):
+            if section in sections:
+                coords = _node_table(sections[section], dimension, section)
+                break
+
+    elif edge_weight_type in METRICS:
+        if "NODE_COORD_SECTION" not in sections:
+            raise ValueError("Missing NODE_COORD_SECTION")
+        values = sections["NODE_COORD_SECTION"]
+        if dimension is None:
+            dimension = values.size // 3
+        coords = _node_table(values, dimension, "NODE_COORD_SECTION")
+
+    else:
         raise NotImplementedError(
             f"EDGE_WEIGHT_TYPE '{edge_weight_type}' is not supported"
         )
 
-    if dimension is not None and len(coords) != dimension:
-        raise ValueError(
-            f"DIMENSION mismatch: expected {dimension}, got {len(coords)}"
-        )
+    return name, coords, edge_weight_type, weights
+
+
+# -------------------------------------------------
+# Distance-matrix cache
+# -------------------------------------------------
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    SHA-1 of a file's content (hex).
+    """
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-    return name, coords
+
+def cache_path(path, metric, cache_dir):
+    """
+    Cache file for the distance matrix of path under metric.
+    The key covers file content, metric and cache layout version,
+    so edited instances never hit a stale matrix.
+    """
+    key = hashlib.sha1(
+        f"{file_hash(path)}:{metric}:v{CACHE_VERSION}".encode()
+    ).hexdigest()[:20]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-{metric}-{key}.npy")
 
 
-def load_tsp(path):
+def load_cached_matrix(npy_path):
+    """
+    Reopen a cached matrix as a read-only np.memmap, or None if missing.
+    Processes mapping the same file share one copy in the page cache.
+    """
+    if not os.path.exists(npy_path):
+        return None
+    try:
+        return np.load(npy_path, mmap_mode="r")
+    except (ValueError, OSError):
+        # truncated / corrupt cache file: rebuild it
+        return None
+
+
+def save_cached_matrix(npy_path, matrix):
+    """
+    Atomically write matrix to npy_path (write temp file, then rename),
+    so concurrent loaders never observe a partial file.
+    """
+    os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+    tmp_path = f"{npy_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, matrix)
+    os.replace(tmp_path, npy_path)
+
+
+def load_tsp(
+    path,
+    use_cache=True,
+    cache_dir=None,
+    matrix_free=False,
+    cache_rows=0,
+    packed=False,
+    neighbors=None,
+    renumber=None,
+):
     """
     Load a TSPLIB .tsp file.
     If the file does not exist, it will be downloaded automatically.
+
+    Parameters
+    ----------
+    path : str
+        Path to the .tsp file
+    use_cache : bool
+        Persist the distance matrix as .npy and reopen it memory-mapped
+        on later loads.
+    cache_dir : str or None
+        Cache directory; defaults to ".tsp_cache" next to the file.
+    matrix_free : bool
+        Skip the n x n matrix and compute distances from coordinates
+        on the fly (required for very large instances).
+    cache_rows : int
+        LRU row cache size in matrix-free mode (row() lookups only)
+    packed : bool
+        Store (and cache) only the upper triangle of the symmetric
+        distance matrix.
+    neighbors : int or None
+        If given, build k-NN candidate lists of this size
+        (tsp.neighbors).
+    renumber : str or None
+        "hilbert" renumbers cities along a Hilbert curve so that
+        cities close in space get close ids, which keeps distance
+        lookups of a tour cache-local on large instances.
+        tsp.to_original() maps tours back to file ids.
     """
     directory = os.path.dirname(path)
     if directory:
@@ -147,8 +472,88 @@ def load_tsp(path):
     if not os.path.exists(path):
         download_tsp(filename, path)
 
-    name, coords = parse_tsp_file(path)
-    tsp = TSPInstance(name, coords)
+    name, coords, metric, weights = parse_tsp_file(path)
+
+    original_ids = None
+    if renumber is not None:
+        if renumber != "hilbert":
+            raise ValueError(f"Unknown renumbering: {renumber}")
+        if coords is None:
+            raise ValueError("Hilbert renumbering requires coordinates")
+        original_ids = hilbert_order(coords)
+        coords = coords[original_ids]
+        if weights is not None:
+            weights = weights[np.ix_(original_ids, original_ids)]
+
+    if weights is not None:
+        if matrix_free:
+            raise ValueError("EXPLICIT instances cannot be matrix-free")
+        tsp = TSPInstance(
+            name,
+            coords,
+            distance_matrix=weights,
+            metric=metric,
+            packed=packed and np.array_equal(weights, weights.T),
+            original_ids=original_ids,
+        )
+    elif matrix_free or not use_cache:
+        tsp = TSPInstance(
+            name,
+            coords,
+            metric=metric,
+            matrix_free=matrix_free,
+            cache_rows=cache_rows,
+            packed=packed,
+            original_ids=original_ids,
+        )
+    else:
+        tsp = _load_cached(
+            name, coords, metric, path, cache_dir, packed, renumber
+        )
+        if original_ids is not None:
+            tsp.original_ids = original_ids
+            tsp.new_ids = np.argsort(original_ids)
+
+    if neighbors:
+        tsp.build_neighbors(neighbors)
 
     print(f"[INFO] Loaded {tsp}")
     return tsp
+
+
+def _load_cached(name, coords, metric, path, cache_dir, packed, renumber):
+    """
+    TSPInstance whose distances are served from the .npy cache.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path) or ".", ".tsp_cache")
+    n = len(coords)
+
+    # the layout depends on storage and city order as well as the metric
+    key = metric
+    if renumber is not None:
+        key += f"-{renumber}"
+    if packed:
+        key += "-packed"
+        expected_shape = (n * (n - 1) // 2,)
+    else:
+        expected_shape = (n, n)
+    npy_path = cache_path(path, key, cache_dir)
+
+    matrix = load_cached_matrix(npy_path)
+    if matrix is None or matrix.shape != expected_shape:
+        if packed:
+            data = build_packed_distances(coords, metric)
+        else:
+            data = build_distance_matrix(coords, metric)
+        save_cached_matrix(npy_path, data)
+        del data
+        matrix = load_cached_matrix(npy_path)
+
+    return TSPInstance(
+        name,
+        coords,
+        distance_matrix=matrix,
+        metric=metric,
+        packed=packed,
+    )